@@ -0,0 +1,384 @@
+"""
+OpenAI Batch API 백엔드 (대량 재채점용).
+
+요청을 Batch 입력 파일(JSONL: custom_id, method, url, body)로 묶어 업로드하고,
+배치를 만든 뒤 끝날 때까지 조회해 출력·오류 파일을 custom_id별 결과로 돌려줌.
+배치는 분당 한도(app.ai.rate_limit)와 별개의 한도로 completion window(기본 24h) 안에
+처리되므로 업스트림 제한기를 거치지 않음. 요청당 비용도 실시간 호출보다 쌈.
+
+- evaluate_resume_kpis_batch: 이력서 여러 건의 KPI 평가 (결과 형식은 evaluate_resume_kpis와 같음)
+- embed_texts_batch: 문장 임베딩 (OPENAI_BATCH_EMBEDDING_INPUTS개씩 묶어 요청 1건)
+- custom_id는 요청 내용의 해시라 재시작 시 이전 배치(batch_ids)의 성공 결과를 그대로 매칭하고
+  빠지거나 실패한 요청만 새 배치로 제출
+- 요청 수·파일 크기가 한도(OPENAI_BATCH_MAX_REQUESTS, OPENAI_BATCH_MAX_FILE_BYTES)를 넘으면
+  여러 배치로 나눠 제출하고 동시에 기다림
+
+openai SDK(1.12)에 Batch API가 없어 httpx로 REST API를 직접 호출.
+OPENAI_BATCH_BASE_URL을 scripts/fake_batch_server.py 주소로 바꾸면 로컬에서 시험할 수 있음.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from app.ai import llm_backend, llm_designer, llm_frontend, llm_pm
+from app.ai.embedding_providers import pack_embedding
+from app.ai.llm_common import LLM_MODEL, completion_kwargs, default_kpi_scores, parse_completion
+from app.ai.prompts import CompiledPrompt
+from app.ai.rate_limit import retry_after_seconds
+from app.ai.usage import record_usage
+from app.core.config import settings
+from app.core.metrics import record_degraded
+
+logger = logging.getLogger(__name__)
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+EMBEDDING_ENDPOINT = "/v1/embeddings"
+
+# 직군별 컴파일된 프롬프트 (실시간 평가와 같은 메시지)
+_PROMPTS: Dict[str, CompiledPrompt] = {
+    "backend": llm_backend.PROMPT,
+    "frontend": llm_frontend.PROMPT,
+    "pm": llm_pm.PROMPT,
+    "designer": llm_designer.PROMPT,
+}
+
+# 더 이상 바뀌지 않는 배치 상태
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchError(Exception):
+    """배치 제출·조회 실패, 검증 실패(failed) 또는 대기 상한 초과."""
+
+
+@dataclass
+class BatchItemResult:
+    """배치 요청 1건의 결과 (body: 성공 응답 본문, error: 실패 코드)."""
+    custom_id: str
+    body: Optional[dict] = None
+    error: Optional[str] = None
+
+
+def request_line(custom_id: str, url: str, body: dict) -> bytes:
+    """Batch 입력 파일의 한 줄."""
+    line = {"custom_id": custom_id, "method": "POST", "url": url, "body": body}
+    return json.dumps(line, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def split_lines(lines: List[bytes]) -> List[List[bytes]]:
+    """요청 수·파일 크기 한도에 맞게 입력 줄을 배치 단위로 나눔."""
+    chunks: List[List[bytes]] = []
+    chunk: List[bytes] = []
+    size = 0
+    for line in lines:
+        if chunk and (
+            len(chunk) >= settings.OPENAI_BATCH_MAX_REQUESTS
+            or size + len(line) > settings.OPENAI_BATCH_MAX_FILE_BYTES
+        ):
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(line)
+        size += len(line)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def parse_result_lines(content: bytes) -> Dict[str, BatchItemResult]:
+    """출력·오류 파일(JSONL)을 custom_id별 결과로 변환."""
+    results: Dict[str, BatchItemResult] = {}
+    for raw in content.splitlines():
+        if not raw.strip():
+            continue
+        data = json.loads(raw)
+        custom_id = data.get("custom_id")
+        response = data.get("response") or {}
+        body = response.get("body")
+        status = response.get("status_code")
+        if data.get("error"):
+            error = data["error"].get("code") or "BatchItemError"
+            results[custom_id] = BatchItemResult(custom_id, error=error)
+        elif status != 200:
+            error = ((body or {}).get("error") or {}).get("code") or f"HTTP{status}"
+            results[custom_id] = BatchItemResult(custom_id, error=error)
+        else:
+            results[custom_id] = BatchItemResult(custom_id, body=body)
+    return results
+
+
+class BatchClient:
+    """
+    Files·Batches REST API 클라이언트.
+
+    http를 주지 않으면 OPENAI_BATCH_BASE_URL로 자체 httpx 클라이언트를 만들고 close에서 닫음.
+    제어 요청(업로드·생성·조회)의 429·5xx·연결 오류는 UPSTREAM_MAX_RETRIES까지 재시도.
+    """
+
+    def __init__(self, http: Optional[httpx.AsyncClient] = None):
+        self._owns_http = http is None
+        self.http = http or httpx.AsyncClient(
+            base_url=settings.OPENAI_BATCH_BASE_URL,
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS),
+        )
+        self.headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+
+    async def __aenter__(self) -> "BatchClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._owns_http:
+            await self.http.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        for attempt in range(settings.UPSTREAM_MAX_RETRIES + 1):
+            try:
+                response = await self.http.request(method, path, headers=self.headers, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if (status != 429 and status < 500) or attempt == settings.UPSTREAM_MAX_RETRIES:
+                    raise BatchError(f"{method} {path} 실패 (HTTP {status}): {e.response.text[:500]}") from e
+                delay = retry_after_seconds(e) or 2 ** attempt
+            except httpx.TransportError as e:
+                if attempt == settings.UPSTREAM_MAX_RETRIES:
+                    raise BatchError(f"{method} {path} 실패: {e}") from e
+                delay = 2 ** attempt
+            await asyncio.sleep(delay)
+
+    async def upload_file(self, content: bytes, filename: str = "batch.jsonl") -> str:
+        """Batch 입력 파일 업로드 (purpose=batch). 파일 ID 반환."""
+        response = await self._request(
+            "POST", "/files",
+            data={"purpose": "batch"},
+            files={"file": (filename, content, "application/jsonl")},
+        )
+        return response.json()["id"]
+
+    async def create_batch(self, input_file_id: str, endpoint: str, metadata: Optional[dict] = None) -> dict:
+        body = {
+            "input_file_id": input_file_id,
+            "endpoint": endpoint,
+            "completion_window": settings.OPENAI_BATCH_COMPLETION_WINDOW,
+        }
+        if metadata:
+            body["metadata"] = metadata
+        return (await self._request("POST", "/batches", json=body)).json()
+
+    async def get_batch(self, batch_id: str) -> dict:
+        return (await self._request("GET", f"/batches/{batch_id}")).json()
+
+    async def cancel_batch(self, batch_id: str) -> dict:
+        return (await self._request("POST", f"/batches/{batch_id}/cancel")).json()
+
+    async def download_file(self, file_id: str) -> bytes:
+        return (await self._request("GET", f"/files/{file_id}/content")).content
+
+    async def submit(self, lines: List[bytes], endpoint: str) -> str:
+        """입력 줄을 업로드하고 배치를 만들어 배치 ID 반환."""
+        file_id = await self.upload_file(b"".join(lines))
+        batch = await self.create_batch(file_id, endpoint)
+        logger.info("batch submitted id=%s endpoint=%s requests=%d", batch["id"], endpoint, len(lines))
+        return batch["id"]
+
+    async def wait(self, batch_id: str) -> dict:
+        """
+        배치가 끝날 때까지 OPENAI_BATCH_POLL_INTERVAL_SECONDS마다 조회.
+
+        Raises:
+            BatchError: OPENAI_BATCH_MAX_WAIT_SECONDS 안에 끝나지 않음 (배치는 취소하지 않음)
+        """
+        started = time.monotonic()
+        while True:
+            batch = await self.get_batch(batch_id)
+            if batch["status"] in TERMINAL_STATUSES:
+                return batch
+            if time.monotonic() - started > settings.OPENAI_BATCH_MAX_WAIT_SECONDS:
+                raise BatchError(f"배치 {batch_id}가 {settings.OPENAI_BATCH_MAX_WAIT_SECONDS:.0f}초 안에 끝나지 않았습니다.")
+            counts = batch.get("request_counts") or {}
+            logger.info(
+                "batch poll id=%s status=%s completed=%s failed=%s total=%s",
+                batch_id, batch["status"], counts.get("completed"), counts.get("failed"), counts.get("total"),
+            )
+            await asyncio.sleep(settings.OPENAI_BATCH_POLL_INTERVAL_SECONDS)
+
+    async def collect(self, batch_id: str) -> Dict[str, BatchItemResult]:
+        """
+        배치 완료를 기다려 custom_id별 결과 반환.
+
+        expired·cancelled 배치도 끝난 요청의 결과는 돌려줌 (나머지는 오류 파일에 들어 있음).
+
+        Raises:
+            BatchError: 입력 파일 검증 실패(failed) 등으로 결과가 없음
+        """
+        batch = await self.wait(batch_id)
+        if batch["status"] == "failed":
+            errors = (batch.get("errors") or {}).get("data") or []
+            detail = "; ".join(e.get("message") or e.get("code") or "" for e in errors)
+            raise BatchError(f"배치 {batch_id} 실패: {detail or 'unknown'}")
+        results: Dict[str, BatchItemResult] = {}
+        for key in ("error_file_id", "output_file_id"):
+            if batch.get(key):
+                results.update(parse_result_lines(await self.download_file(batch[key])))
+        return results
+
+    async def run(
+        self,
+        lines: Dict[str, bytes],
+        endpoint: str,
+        batch_ids: Sequence[str] = (),
+        on_submit: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, BatchItemResult]:
+        """
+        custom_id별 입력 줄을 처리해 결과 반환.
+
+        Args:
+            lines: {custom_id: request_line(...)}
+            endpoint: CHAT_ENDPOINT 또는 EMBEDDING_ENDPOINT
+            batch_ids: 이전에 제출한 배치 (재시작·재시도 시). 성공한 결과를 먼저 가져오고
+                       나머지 요청만 새로 제출
+            on_submit: 새 배치를 제출할 때마다 배치 ID로 호출 (재시작용 기록)
+
+        Returns:
+            {custom_id: BatchItemResult} (결과가 없는 요청은 빠짐)
+        """
+        results: Dict[str, BatchItemResult] = {}
+        for batch_id in batch_ids:
+            try:
+                previous = await self.collect(batch_id)
+            except BatchError as e:
+                logger.warning("previous batch skipped id=%s: %s", batch_id, e)
+                continue
+            # 이전에 실패한 요청은 새 배치로 다시 제출
+            results.update({
+                cid: item for cid, item in previous.items() if cid in lines and item.error is None
+            })
+
+        remaining = [line for cid, line in lines.items() if cid not in results]
+        submitted = []
+        for chunk in split_lines(remaining):
+            batch_id = await self.submit(chunk, endpoint)
+            if on_submit is not None:
+                on_submit(batch_id)
+            submitted.append(batch_id)
+        for collected in await asyncio.gather(*(self.collect(batch_id) for batch_id in submitted)):
+            results.update({cid: item for cid, item in collected.items() if cid in lines})
+        return results
+
+
+def kpi_request_id(role: str, resume_text: str) -> str:
+    """KPI 평가 요청의 custom_id (직군·프롬프트 버전·모델·이력서 해시)."""
+    payload = "\x1f".join([role, _PROMPTS[role].version, LLM_MODEL, resume_text])
+    return "kpi-" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def evaluate_resume_kpis_batch(
+    requests: Sequence[Tuple[str, str]],
+    batch_ids: Sequence[str] = (),
+    on_submit: Optional[Callable[[str], None]] = None,
+    client: Optional[BatchClient] = None,
+) -> List[Dict[int, Dict[str, any]]]:
+    """
+    이력서 여러 건을 Batch API로 평가 (10개 KPI를 요청 1건으로).
+
+    Args:
+        requests: (직군, 이력서 텍스트) 목록. 같은 요청은 한 번만 보냄
+        batch_ids, on_submit: BatchClient.run 참고
+        client: 사용할 BatchClient (None이면 설정 기반으로 만들고 닫음)
+
+    Returns:
+        입력 순서대로 {kpi_id: {"score", "basis", "reason"}}
+        (실패한 요청은 실패 코드를 error로 담은 default_kpi_scores)
+
+    Raises:
+        BatchError: 배치를 제출·조회하지 못함
+    """
+    ids = [kpi_request_id(role, text) for role, text in requests]
+    lines = {
+        cid: request_line(cid, CHAT_ENDPOINT, completion_kwargs(_PROMPTS[role].build_messages(text)))
+        for cid, (role, text) in zip(ids, requests)
+    }
+    batch_client = client or BatchClient()
+    try:
+        results = await batch_client.run(lines, CHAT_ENDPOINT, batch_ids, on_submit)
+    finally:
+        if client is None:
+            await batch_client.close()
+
+    parsed: Dict[str, Dict[int, Dict[str, any]]] = {}
+    for cid, (role, _) in zip(ids, requests):
+        if cid in parsed:
+            continue
+        item = results.get(cid)
+        if item is None or item.error is not None:
+            error = "BatchItemMissing" if item is None else item.error
+            record_degraded(role, error)
+            parsed[cid] = default_kpi_scores(error=error)
+        else:
+            record_usage(role, item.body.get("usage"))
+            try:
+                parsed[cid] = parse_completion(item.body["choices"][0]["message"]["content"], role)
+            except Exception as e:
+                logger.warning("batch result parse failed custom_id=%s: %s", cid, e)
+                record_degraded(role, type(e).__name__)
+                parsed[cid] = default_kpi_scores(error=type(e).__name__)
+    return [parsed[cid] for cid in ids]
+
+
+def embedding_request_id(model: str, dimensions: int, texts: Sequence[str]) -> str:
+    """임베딩 요청(문장 묶음)의 custom_id."""
+    payload = "\x1f".join([model, str(dimensions), *texts])
+    return "emb-" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def embed_texts_batch(
+    texts: List[str],
+    model: str,
+    dimensions: int,
+    batch_ids: Sequence[str] = (),
+    on_submit: Optional[Callable[[str], None]] = None,
+    client: Optional[BatchClient] = None,
+) -> Dict[str, bytes]:
+    """
+    문장 리스트를 Batch API로 임베딩 (OPENAI_BATCH_EMBEDDING_INPUTS개씩 요청 1건).
+
+    Returns:
+        {문장: float32 bytes} (실패한 요청의 문장은 빠짐)
+
+    Raises:
+        BatchError: 배치를 제출·조회하지 못함
+    """
+    size = max(1, settings.OPENAI_BATCH_EMBEDDING_INPUTS)
+    groups: Dict[str, List[str]] = {}
+    lines: Dict[str, bytes] = {}
+    for start in range(0, len(texts), size):
+        group = texts[start:start + size]
+        cid = embedding_request_id(model, dimensions, group)
+        groups[cid] = group
+        lines[cid] = request_line(
+            cid, EMBEDDING_ENDPOINT, {"model": model, "input": group, "dimensions": dimensions}
+        )
+    batch_client = client or BatchClient()
+    try:
+        results = await batch_client.run(lines, EMBEDDING_ENDPOINT, batch_ids, on_submit)
+    finally:
+        if client is None:
+            await batch_client.close()
+
+    vectors: Dict[str, bytes] = {}
+    for cid, group in groups.items():
+        item = results.get(cid)
+        if item is None or item.error is not None:
+            logger.warning("batch embedding failed custom_id=%s: %s", cid, item.error if item else "missing")
+            continue
+        for data in sorted(item.body["data"], key=lambda d: d["index"]):
+            vectors[group[data["index"]]] = pack_embedding(data["embedding"])
+    return vectors
@@ -0,0 +1,83 @@
+"""
+OpenAI 클라이언트 레지스트리.
+
+앱 전체가 공유하는 OpenAI/AsyncOpenAI 클라이언트(httpx 커넥션 풀)를 관리.
+FastAPI lifespan에서 init_clients()로 생성하고 close_clients()로 정리하며,
+스크립트처럼 lifespan 밖에서 호출되면 최초 사용 시 지연 생성.
+재시도는 app.ai.rate_limit 제한기가 전담하므로 SDK 자체 재시도는 끔(max_retries=0).
+"""
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.config import settings
+
+_sync_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+
+
+def _limits() -> httpx.Limits:
+    """설정값 기반 커넥션 풀 크기·keep-alive 제한."""
+    return httpx.Limits(
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    """요청 타임아웃 (연결 타임아웃은 별도로 짧게)."""
+    return httpx.Timeout(
+        settings.OPENAI_TIMEOUT_SECONDS,
+        connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+    )
+
+
+def get_openai_client() -> OpenAI:
+    """공유 동기 OpenAI 클라이언트 반환 (없으면 생성)."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,
+            http_client=httpx.Client(
+                limits=_limits(),
+                timeout=_timeout(),
+                http2=settings.OPENAI_HTTP2,
+            ),
+        )
+    return _sync_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """공유 AsyncOpenAI 클라이언트 반환 (없으면 생성)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=_limits(),
+                timeout=_timeout(),
+                http2=settings.OPENAI_HTTP2,
+            ),
+        )
+    return _async_client
+
+
+def init_clients() -> None:
+    """앱 시작 시 공유 클라이언트를 미리 생성."""
+    get_openai_client()
+    get_async_openai_client()
+
+
+async def close_clients() -> None:
+    """앱 종료 시 공유 클라이언트의 커넥션 풀 정리."""
+    global _sync_client, _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
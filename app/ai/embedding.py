@@ -1,36 +1,208 @@
 """
 텍스트 임베딩 유틸.
 
-OpenAI text-embedding-3-small(1536차원)로 문장 리스트를 임베딩.
-"""
-from typing import List
+설정된 임베딩 제공자(EMBEDDING_PROVIDER: OpenAI text-embedding-3-small 또는
+로컬 sentence-transformers 모델)로 문장 리스트를 임베딩.
+요청별로 모델 최대 차원보다 짧은 차원(예: 256, 512)을 지정할 수 있음.
 
-from openai import OpenAI
+근거 문장은 짧고 반복이 많으므로 (모델, 차원, 문장 해시)를 키로
+임베딩을 캐시하고, 캐시에 없는 문장만 제공자에 요청함.
+벡터는 float32 바이트로 저장해 파이썬 float 리스트보다 메모리를 적게 사용.
+비동기 경로에서는 캐시에 없는 같은 문장 묶음을 동시에 요청하면 제공자 호출을 한 번으로 병합.
+대량 사전 계산은 get_embeddings_batch로 Batch API(app.ai.batch)를 거쳐 캐시를 채울 수 있음.
+"""
+import hashlib
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence
 
+from app.ai.batch import BatchError, embed_texts_batch
+from app.ai.embedding_providers import get_embedding_provider
 from app.core.config import settings
+from app.core.metrics import EMBEDDING_LATENCY, timed
+from app.utils.cache import TieredCache, build_backend
+from app.utils.singleflight import SingleFlight
+
+
+def _identity(raw: bytes) -> bytes:
+    return raw
+
+
+# 문장 임베딩 캐시 (값: float32 bytes)
+embedding_cache = TieredCache(
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+    backend=build_backend("embeddings"),
+    encode=_identity,
+    decode=_identity,
+    enabled=settings.EMBEDDING_CACHE_ENABLED,
+)
+
+# 캐시 미스 문장 묶음 단위의 동시 요청 병합
+embedding_flight = SingleFlight()
+
+
+def _prepare(texts: List[str]) -> List[str]:
+    """빈 문자열은 공백 한 칸으로 바꿔 API 오류를 피함."""
+    return [t.strip() if (t or "").strip() else " " for t in texts]
+
+
+def embedding_cache_key(text: str, model: str, dimensions: int) -> str:
+    """(모델, 차원, 문장 해시) 캐시 키."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{dimensions}:{digest}"
+
+
+def _unpack(raw: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(raw)
+    return vector.tolist()
+
+
+def _missing_texts(texts: List[str], cached: Dict[str, bytes], keys: Dict[str, str]) -> List[str]:
+    """캐시에 없는 문장 목록 (중복 제거, 입력 순서 유지)."""
+    return list(dict.fromkeys(t for t in texts if keys[t] not in cached))
+
+
+def max_dimensions() -> int:
+    """현재 임베딩 제공자 모델의 최대 차원."""
+    return get_embedding_provider().max_dimensions
+
+
+def validate_dimensions(dimensions: Optional[int]) -> int:
+    """요청 차원 검증 (None이면 기본 차원)."""
+    provider = get_embedding_provider()
+    if dimensions is None:
+        return provider.default_dimensions
+    if not 1 <= dimensions <= provider.max_dimensions:
+        raise ValueError(f"dimensions must be between 1 and {provider.max_dimensions}")
+    return dimensions
+
+
+def get_embeddings(texts: List[str], dimensions: Optional[int] = None) -> List[List[float]]:
+    """
+    문장 리스트를 임베딩.
+
+    Args:
+        texts: 임베딩할 문자열 리스트 (빈 문자열은 제로 벡터로 처리)
+        dimensions: 벡터 차원 (None이면 EMBEDDING_DIMENSIONS 설정값)
 
-EMBEDDING_MODEL = "text-embedding-3-small"
-EMBEDDING_DIMENSIONS = 1536
+    Returns:
+        각 문장에 대한 벡터 리스트 (입력 순서 유지)
+    """
+    if not texts:
+        return []
 
+    provider = get_embedding_provider()
+    dimensions = validate_dimensions(dimensions)
+    to_embed = _prepare(texts)
+    keys = {t: embedding_cache_key(t, provider.model, dimensions) for t in to_embed}
+    cached = embedding_cache.get_many(list(keys.values()))
+    missing = _missing_texts(to_embed, cached, keys)
+    if missing:
+        with timed(EMBEDDING_LATENCY, provider=provider.name):
+            vectors = provider.embed(missing, dimensions)
+        fetched = dict(zip([keys[t] for t in missing], vectors))
+        embedding_cache.set_many(fetched)
+        cached.update(fetched)
+    return [_unpack(cached[keys[t]]) for t in to_embed]
 
-def get_embeddings(texts: List[str]) -> List[List[float]]:
+
+async def get_embeddings_async(texts: List[str], dimensions: Optional[int] = None) -> List[List[float]]:
     """
-    문장 리스트를 text-embedding-3-small로 임베딩.
+    get_embeddings의 비동기 버전.
 
     Args:
         texts: 임베딩할 문자열 리스트 (빈 문자열은 제로 벡터로 처리)
+        dimensions: 벡터 차원 (None이면 EMBEDDING_DIMENSIONS 설정값)
 
     Returns:
-        각 문장에 대한 1536차원 벡터 리스트 (입력 순서 유지)
+        각 문장에 대한 벡터 리스트 (입력 순서 유지)
+    """
+    return [_unpack(raw) for raw in await get_embeddings_raw_async(texts, dimensions)]
+
+
+async def get_embeddings_raw_async(texts: List[str], dimensions: Optional[int] = None) -> List[bytes]:
+    """
+    get_embeddings_async와 같지만 벡터를 float32 바이트(캐시 저장 형식) 그대로 반환.
+
+    압축 인코딩 응답처럼 float 리스트가 필요 없는 경로에서 변환 비용을 아낌.
     """
     if not texts:
         return []
 
-    to_embed = [t.strip() if (t or "").strip() else " " for t in texts]
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    resp = client.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=to_embed,
-        dimensions=EMBEDDING_DIMENSIONS,
-    )
-    return [d.embedding for d in resp.data]
+    provider = get_embedding_provider()
+    dimensions = validate_dimensions(dimensions)
+    to_embed = _prepare(texts)
+    keys = {t: embedding_cache_key(t, provider.model, dimensions) for t in to_embed}
+    cached = await embedding_cache.aget_many(list(keys.values()))
+    missing = _missing_texts(to_embed, cached, keys)
+    if missing:
+        missing_keys = [keys[t] for t in missing]
+        flight_key = hashlib.sha256("\x1f".join(missing_keys).encode("utf-8")).hexdigest()
+        fetched = await embedding_flight.do(
+            flight_key, lambda: _fetch_embeddings_async(missing, missing_keys, dimensions)
+        )
+        cached.update(fetched)
+    return [cached[keys[t]] for t in to_embed]
+
+
+async def _fetch_embeddings_async(
+    missing: List[str],
+    missing_keys: List[str],
+    dimensions: int,
+) -> Dict[str, bytes]:
+    """캐시 미스 문장을 제공자로 임베딩해 캐시에 저장 (single-flight 안에서 실행)."""
+    provider = get_embedding_provider()
+    with timed(EMBEDDING_LATENCY, provider=provider.name):
+        vectors = await provider.aembed(missing, dimensions)
+    fetched = dict(zip(missing_keys, vectors))
+    await embedding_cache.aset_many(fetched)
+    return fetched
+
+
+async def get_embeddings_batch(
+    texts: List[str],
+    dimensions: Optional[int] = None,
+    batch_ids: Sequence[str] = (),
+    on_submit: Optional[Callable[[str], None]] = None,
+) -> List[List[float]]:
+    """
+    get_embeddings와 같지만 캐시에 없는 문장을 OpenAI Batch API로 임베딩 (대량 재계산용).
+
+    결과는 임베딩 캐시에 저장되므로 이후 get_embeddings*는 캐시에서 바로 반환.
+    Batch API가 없는 로컬 제공자는 get_embeddings_async와 같음.
+
+    Args:
+        texts: 임베딩할 문자열 리스트
+        dimensions: 벡터 차원 (None이면 EMBEDDING_DIMENSIONS 설정값)
+        batch_ids, on_submit: 재시작용 이전 배치 ID·제출 콜백 (app.ai.batch.BatchClient.run 참고)
+
+    Raises:
+        BatchError: 배치를 제출·조회하지 못했거나 일부 문장의 임베딩이 실패
+                    (성공한 문장은 캐시에 저장되므로 다시 호출하면 실패한 문장만 요청)
+    """
+    provider = get_embedding_provider()
+    if provider.name != "openai":
+        return await get_embeddings_async(texts, dimensions)
+    if not texts:
+        return []
+
+    dimensions = validate_dimensions(dimensions)
+    to_embed = _prepare(texts)
+    keys = {t: embedding_cache_key(t, provider.model, dimensions) for t in to_embed}
+    cached = await embedding_cache.aget_many(list(keys.values()))
+    missing = _missing_texts(to_embed, cached, keys)
+    if missing:
+        vectors = await embed_texts_batch(missing, provider.model, dimensions, batch_ids, on_submit)
+        fetched = {keys[t]: raw for t, raw in vectors.items()}
+        await embedding_cache.aset_many(fetched)
+        cached.update(fetched)
+        failed = len(missing) - len(vectors)
+        if failed:
+            raise BatchError(f"{failed}개 문장의 배치 임베딩이 실패했습니다.")
+    return [_unpack(cached[keys[t]]) for t in to_embed]
+
+
+def get_embedding_cache_stats() -> Dict[str, any]:
+    """임베딩 캐시 적중/미스 통계 (문장 단위, 병합된 동시 요청 수 포함)."""
+    return {**embedding_cache.stats.as_dict(), "coalesced": embedding_flight.stats.shared}
@@ -0,0 +1,145 @@
+"""
+임베딩 벡터 압축 인코딩.
+
+abilities 응답의 임베딩을 float 리스트(JSON 숫자 1536개) 대신
+리틀엔디언 float32/float16 바이트 또는 양자화(int8, 부호 비트) 바이트로 보내기 위한 변환.
+
+- JSON 응답: 바이트를 base64 문자열로 인코딩
+- msgpack 응답: 바이트를 bin 타입 그대로 전송
+
+클라이언트 복원 예 (numpy):
+    np.frombuffer(base64.b64decode(s), dtype="<f4")   # float32
+    np.frombuffer(base64.b64decode(s), dtype="<f2")   # float16
+    np.frombuffer(base64.b64decode(s), dtype="i1") * embedding_scale   # int8
+    np.unpackbits(np.frombuffer(base64.b64decode(s), dtype="u1"))      # binary (0/1)
+"""
+import base64
+import struct
+import sys
+from array import array
+from typing import Any, List, Optional, Tuple
+
+import msgpack
+
+# embedding_format 값 → 바이트 형식
+EMBEDDING_FORMATS = {
+    "float": None,        # 기존 JSON float 리스트
+    "base64_f32": "f32",
+    "base64_f16": "f16",
+}
+
+# embedding_quantization 값 → 바이트 형식 (none이면 embedding_format을 따름)
+EMBEDDING_QUANTIZATIONS = {
+    "none": None,
+    "int8": "i8",
+    "binary": "b1",
+}
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """Accept 헤더가 msgpack 응답을 요청하는지 여부."""
+    if not accept:
+        return False
+    media_types = [part.split(";")[0].strip().lower() for part in accept.split(",")]
+    return any(media_type in _MSGPACK_MEDIA_TYPES for media_type in media_types)
+
+
+def pack_msgpack(payload: Any) -> bytes:
+    """응답 dict를 msgpack으로 직렬화 (bytes 값은 bin 타입)."""
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def to_little_endian_f32(raw: bytes) -> bytes:
+    """네이티브 float32 바이트를 리틀엔디언으로 (대부분의 서버는 이미 리틀엔디언)."""
+    if sys.byteorder == "little":
+        return raw
+    vector = array("f")
+    vector.frombytes(raw)
+    vector.byteswap()
+    return vector.tobytes()
+
+
+def f32_to_f16(raw: bytes) -> bytes:
+    """float32 바이트를 리틀엔디언 float16 바이트로 변환 (크기 절반)."""
+    vector = array("f")
+    vector.frombytes(raw)
+    return struct.pack(f"<{len(vector)}e", *vector)
+
+
+def quantize_int8(raw: bytes) -> Tuple[bytes, float]:
+    """
+    벡터별 대칭 int8 양자화 (크기 1/4).
+
+    scale = max|x| / 127, q = round(x / scale) → 복원은 q * scale.
+
+    Returns:
+        (int8 바이트, scale)
+    """
+    vector = array("f")
+    vector.frombytes(raw)
+    peak = max((abs(x) for x in vector), default=0.0)
+    if peak == 0.0:
+        return bytes(len(vector)), 0.0
+    scale = peak / 127
+    return array("b", [round(x / scale) for x in vector]).tobytes(), scale
+
+
+def quantize_binary(raw: bytes) -> bytes:
+    """
+    부호 비트 양자화 (크기 1/32). 양수면 1, 아니면 0을 MSB부터 8개씩 묶음.
+
+    유사도는 해밍 거리(XOR 후 비트 수)로 계산.
+    """
+    vector = array("f")
+    vector.frombytes(raw)
+    packed = bytearray((len(vector) + 7) // 8)
+    for i, x in enumerate(vector):
+        if x > 0:
+            packed[i >> 3] |= 0x80 >> (i & 7)
+    return bytes(packed)
+
+
+def encode_embedding_bytes(raw: bytes, dtype: str) -> Tuple[bytes, Optional[float]]:
+    """
+    float32 바이트(캐시 저장 형식)를 전송용 바이트로 변환.
+
+    Args:
+        raw: 네이티브 float32 바이트
+        dtype: "f32", "f16", "i8"(int8 양자화), "b1"(부호 비트)
+
+    Returns:
+        (전송용 바이트, scale) — scale은 i8일 때만 값이 있음
+    """
+    if dtype == "f16":
+        return f32_to_f16(raw), None
+    if dtype == "i8":
+        return quantize_int8(raw)
+    if dtype == "b1":
+        return quantize_binary(raw), None
+    return to_little_endian_f32(raw), None
+
+
+def encode_embedding_base64(raw: bytes, dtype: str) -> Tuple[str, Optional[float]]:
+    """encode_embedding_bytes 결과를 base64 문자열로 (JSON 응답용)."""
+    data, scale = encode_embedding_bytes(raw, dtype)
+    return base64.b64encode(data).decode("ascii"), scale
+
+
+def decode_embedding(data: bytes | str, dtype: str, scale: Optional[float] = None) -> List[float]:
+    """
+    encode_embedding_* 결과를 float 리스트로 복원 (파이썬 클라이언트·디버깅용).
+
+    i8은 scale을 곱해 복원하고, b1은 비트를 +1/-1로 복원.
+    """
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    if dtype == "i8":
+        return [q * (scale or 0.0) for q in array("b", data)]
+    if dtype == "b1":
+        return [1.0 if byte & (0x80 >> bit) else -1.0 for byte in data for bit in range(8)]
+    code = "e" if dtype == "f16" else "f"
+    count = len(data) // struct.calcsize(code)
+    return list(struct.unpack(f"<{count}{code}", data))
@@ -0,0 +1,179 @@
+"""
+임베딩 제공자(provider) 인터페이스.
+
+get_embeddings*는 캐시·요청 병합만 담당하고 실제 벡터 계산은 이 모듈의
+EmbeddingProvider에 위임. Settings.EMBEDDING_PROVIDER로 선택.
+
+- openai: OpenAI Embeddings API (text-embedding-3-small, 기본값)
+- local: 프로세스 내 sentence-transformers 모델 (CPU, 네트워크 호출 없음)
+  → `pip install sentence-transformers` 필요 (ONNX 백엔드는 `sentence-transformers[onnx]`)
+
+제공자는 벡터를 float32 바이트(임베딩 캐시 저장 형식)로 반환.
+"""
+import asyncio
+import threading
+from array import array
+from typing import List, Optional
+
+from app.ai.clients import get_async_openai_client, get_openai_client
+from app.ai.rate_limit import get_limiter
+from app.ai.tokens import count_tokens
+from app.core.config import settings
+from app.core.deadline import request_timeout, wait_within_deadline
+
+
+def pack_embedding(vector: List[float]) -> bytes:
+    """벡터를 float32 바이트(임베딩 캐시 저장 형식)로 변환."""
+    return array("f", vector).tobytes()
+
+
+class EmbeddingProvider:
+    """
+    임베딩 제공자 인터페이스.
+
+    model은 캐시 키에 들어가므로 제공자·모델이 바뀌면 캐시도 분리됨.
+    """
+
+    name: str = ""
+    model: str = ""
+    max_dimensions: int = 0
+
+    @property
+    def default_dimensions(self) -> int:
+        """요청에서 차원을 지정하지 않을 때의 차원 (설정값, 모델 최대 차원 이내)."""
+        return min(settings.EMBEDDING_DIMENSIONS, self.max_dimensions)
+
+    def embed(self, texts: List[str], dimensions: int) -> List[bytes]:
+        """문장 리스트를 임베딩해 float32 바이트 리스트로 반환 (입력 순서 유지)."""
+        raise NotImplementedError
+
+    async def aembed(self, texts: List[str], dimensions: int) -> List[bytes]:
+        """embed의 비동기 버전."""
+        raise NotImplementedError
+
+    def warmup(self) -> None:
+        """앱 시작 시 미리 준비할 자원 로드 (모델 등)."""
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI Embeddings API 제공자 (공유 클라이언트, "embedding" 업스트림 제한기 사용)."""
+
+    name = "openai"
+    model = "text-embedding-3-small"
+    max_dimensions = 1536
+
+    def embed(self, texts: List[str], dimensions: int) -> List[bytes]:
+        client = get_openai_client()
+        resp = get_limiter("embedding").call_sync(
+            lambda: client.embeddings.create(
+                model=self.model, input=texts, dimensions=dimensions, **request_timeout()
+            ),
+            tokens=sum(count_tokens(t) for t in texts),
+        )
+        return [pack_embedding(d.embedding) for d in resp.data]
+
+    async def aembed(self, texts: List[str], dimensions: int) -> List[bytes]:
+        client = get_async_openai_client()
+        resp = await wait_within_deadline(get_limiter("embedding").call(
+            lambda: client.embeddings.create(
+                model=self.model, input=texts, dimensions=dimensions, **request_timeout()
+            ),
+            tokens=sum(count_tokens(t) for t in texts),
+        ))
+        return [pack_embedding(d.embedding) for d in resp.data]
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    sentence-transformers 로컬 모델 제공자.
+
+    모델은 프로세스당 한 번만 로드하고, 추론은 batch_size 단위 배치로 실행.
+    추론은 CPU를 모두 쓰므로 한 번에 하나씩만 실행해 지연 시간을 예측 가능하게 유지하고,
+    비동기 호출은 스레드에서 실행해 이벤트 루프를 막지 않음.
+    모델 최대 차원보다 작은 차원을 요청하면 앞부분을 잘라 다시 정규화.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        model: str,
+        device: str = "cpu",
+        batch_size: int = 32,
+        backend: str = "torch",
+    ):
+        self.model = model
+        self.device = device
+        self.batch_size = batch_size
+        self.backend = backend
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._infer_lock = threading.Lock()
+
+    def _load(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError as e:
+                        raise RuntimeError(
+                            "EMBEDDING_PROVIDER=local 사용 시 sentence-transformers 설치가 필요합니다."
+                        ) from e
+                    kwargs = {"device": self.device}
+                    if self.backend != "torch":
+                        kwargs["backend"] = self.backend
+                    self._model = SentenceTransformer(self.model, **kwargs)
+        return self._model
+
+    @property
+    def max_dimensions(self) -> int:
+        return self._load().get_sentence_embedding_dimension()
+
+    def warmup(self) -> None:
+        self.embed(["warmup"], self.default_dimensions)
+
+    def embed(self, texts: List[str], dimensions: int) -> List[bytes]:
+        model = self._load()
+        with self._infer_lock:
+            vectors = model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        vectors = vectors.astype("float32")
+        if dimensions < vectors.shape[1]:
+            # 앞 dimensions개만 남기고 L2 재정규화
+            vectors = vectors[:, :dimensions]
+            norms = (vectors ** 2).sum(axis=1, keepdims=True) ** 0.5
+            vectors = vectors / norms.clip(min=1e-12)
+        return [row.tobytes() for row in vectors]
+
+    async def aembed(self, texts: List[str], dimensions: int) -> List[bytes]:
+        return await asyncio.to_thread(self.embed, texts, dimensions)
+
+
+_provider: Optional[EmbeddingProvider] = None
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """설정(EMBEDDING_PROVIDER)에 맞는 공유 제공자 반환 (없으면 생성)."""
+    global _provider
+    if _provider is None:
+        if settings.EMBEDDING_PROVIDER == "local":
+            _provider = LocalEmbeddingProvider(
+                model=settings.EMBEDDING_LOCAL_MODEL,
+                device=settings.EMBEDDING_LOCAL_DEVICE,
+                batch_size=settings.EMBEDDING_LOCAL_BATCH_SIZE,
+                backend=settings.EMBEDDING_LOCAL_BACKEND,
+            )
+        else:
+            _provider = OpenAIEmbeddingProvider()
+    return _provider
+
+
+async def init_embedding_provider() -> None:
+    """앱 시작 시 제공자 준비 (로컬 모델은 이때 로드해 첫 요청 지연을 없앰)."""
+    await asyncio.to_thread(get_embedding_provider().warmup)
@@ -0,0 +1,145 @@
+"""
+LLM 요청 헤징(hedging).
+
+같은 종류 요청의 최근 지연 시간 분포를 기록해 두고, 요청이 p95(LLM_HEDGE_PERCENTILE)를
+넘도록 끝나지 않으면 같은 요청을 한 번 더 보냄. 먼저 성공한 쪽을 쓰고 나머지는 취소.
+가끔 매우 느린 응답이 p99를 결정하는 경우 꼬리 지연을 p95 + 정상 응답 시간 정도로 줄임.
+
+헤지 요청은 다음 경우 보내지 않음:
+- LLM_HEDGE_ENABLED=False 이거나 지연 시간 표본이 LLM_HEDGE_MIN_SAMPLES 미만
+- 남은 마감 시간이 헤지 대기 시간보다 짧음
+- 업스트림 제한기에 여유가 없음 (대기열·429 쿨다운 중이면 부하만 늘림)
+"""
+import asyncio
+import collections
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.deadline import remaining
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgeStats:
+    """요청 종류별 헤징 통계."""
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else 0.0,
+            "win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0,
+        }
+
+
+class LatencyTracker:
+    """최근 window건의 성공 지연 시간으로 백분위수를 계산."""
+
+    def __init__(self, window: int):
+        self.samples: Deque[float] = collections.deque(maxlen=window)
+        self.stats = HedgeStats()
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """pct 백분위 지연 시간 (표본이 없으면 None)."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 요청을 보내기까지 기다릴 시간 (표본이 부족하면 None)."""
+        if len(self.samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, self.percentile(settings.LLM_HEDGE_PERCENTILE))
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_lock = threading.Lock()
+
+
+def get_tracker(key: str) -> LatencyTracker:
+    with _lock:
+        if key not in _trackers:
+            _trackers[key] = LatencyTracker(settings.LLM_HEDGE_WINDOW)
+        return _trackers[key]
+
+
+async def _timed(fn: Callable[[], Awaitable[T]]) -> Tuple[T, float]:
+    start = time.monotonic()
+    result = await fn()
+    return result, time.monotonic() - start
+
+
+async def hedged_call(
+    key: str,
+    fn: Callable[[], Awaitable[T]],
+    can_hedge: Callable[[], bool] = lambda: True,
+) -> T:
+    """
+    fn을 실행하고, hedge_delay가 지나도 끝나지 않으면 fn을 한 번 더 실행해 먼저 성공한 결과 반환.
+
+    Args:
+        key: 지연 시간 분포를 나눌 요청 종류 (예: "chat:10" = KPI 10개 평가)
+        fn: 호출할 때마다 새 요청을 시작하는 함수
+        can_hedge: 헤지 요청을 보내도 되는지 (업스트림 제한기 여유 확인)
+
+    Raises:
+        두 요청이 모두 실패하면 나중에 실패한 요청의 예외
+    """
+    tracker = get_tracker(key)
+    with _lock:
+        tracker.stats.requests += 1
+    delay = tracker.hedge_delay() if settings.LLM_HEDGE_ENABLED else None
+    left = remaining()
+    primary = asyncio.ensure_future(_timed(fn))
+    tasks = {primary}
+    try:
+        if delay is not None and (left is None or left > delay):
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and can_hedge():
+                with _lock:
+                    tracker.stats.hedged += 1
+                tasks.add(asyncio.ensure_future(_timed(fn)))
+        error: Optional[BaseException] = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                    continue
+                result, elapsed = task.result()
+                with _lock:
+                    tracker.record(elapsed)
+                    if task is not primary:
+                        tracker.stats.hedge_wins += 1
+                return result
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def get_hedge_stats() -> Dict[str, dict]:
+    """요청 종류별 헤징 통계 + 현재 p50/p95 지연 시간."""
+    with _lock:
+        return {
+            key: {
+                **tracker.stats.as_dict(),
+                "p50_seconds": tracker.percentile(50),
+                "p95_seconds": tracker.percentile(95),
+                "hedge_delay_seconds": tracker.hedge_delay(),
+            }
+            for key, tracker in _trackers.items()
+        }
@@ -0,0 +1,305 @@
+"""
+LLM KPI 평가 공통 모듈.
+
+백엔드/프론트엔드/PM/디자이너 평가 모듈이 공유하는
+Chat Completions 호출, 응답 파싱, 오류 시 기본값 처리를 담당.
+직군별 모듈은 프롬프트(messages)만 만들고 호출은 이 모듈에 위임.
+
+모든 호출은 업스트림 제한기(app.ai.rate_limit)를 거치며, 제한기가 대기 상한 안에
+호출하지 못하면 기본값 대신 UpstreamBusyError를 그대로 올려 보냄 (API는 503 응답).
+요청 마감(app.core.deadline)이 있으면 남은 시간을 OpenAI 요청 타임아웃으로 쓰고,
+마감이 지나면 DeadlineExceededError (API는 504 응답). 비동기 평가는 헤징(app.ai.hedging) 적용.
+호출 시간·파싱 시간·기본값(degraded) 대체 횟수는 Prometheus 지표(app.core.metrics)로 기록.
+"""
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.ai.clients import get_async_openai_client, get_openai_client
+from app.ai.hedging import hedged_call
+from app.ai.rate_limit import UpstreamBusyError, get_limiter
+from app.ai.stream_parser import KPIStreamParser
+from app.ai.tokens import count_tokens
+from app.ai.usage import record_usage
+from app.core.deadline import (
+    DeadlineExceededError,
+    check_deadline,
+    raise_if_expired,
+    request_timeout,
+    wait_within_deadline,
+)
+from app.core.metrics import LLM_LATENCY, LLM_PARSE_LATENCY, record_degraded, timed
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = "gpt-4o-mini"
+
+# KPI 1개당 예상 출력 토큰 (score·basis·한 줄 reason JSON, TPM 예약용)
+OUTPUT_TOKENS_PER_KPI = 80
+
+
+def default_kpi_scores(
+    error: Optional[str] = None,
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> Dict[int, Dict[str, any]]:
+    """
+    LLM 평가 실패 시 반환하는 기본 점수.
+
+    Args:
+        error: 실패 원인 예외 클래스명 (예: "RateLimitError")
+        kpi_ids: 채울 KPI (None이면 1~10 전체)
+
+    Returns:
+        KPI를 45점, basis="none"으로 채운 결과 (degraded=True 표시)
+    """
+    return {
+        i: {"score": 45, "basis": "none", "reason": None, "degraded": True, "error": error}
+        for i in (kpi_ids if kpi_ids is not None else range(1, 11))
+    }
+
+
+def select_kpi_scores(
+    scores: Dict[int, Dict[str, any]],
+    kpi_ids: Optional[Sequence[int]],
+) -> Dict[int, Dict[str, any]]:
+    """
+    일부 KPI만 요청한 평가 결과에서 해당 KPI만 남김.
+
+    LLM이 요청한 KPI를 빠뜨렸으면 그 KPI는 기본값(degraded)으로 채움.
+    """
+    if kpi_ids is None:
+        return scores
+    missing = [kpi_id for kpi_id in kpi_ids if kpi_id not in scores]
+    selected = {kpi_id: scores[kpi_id] for kpi_id in kpi_ids if kpi_id in scores}
+    selected.update(default_kpi_scores(error="MissingKPI", kpi_ids=missing))
+    return selected
+
+
+def is_degraded(scores: Dict[int, Dict[str, any]]) -> bool:
+    """평가 결과가 오류로 인한 기본값(default_kpi_scores)인지 여부."""
+    return any(
+        isinstance(data, dict) and data.get("degraded")
+        for data in scores.values()
+    )
+
+
+def parse_kpi_scores(content: str) -> Dict[int, Dict[str, any]]:
+    """
+    LLM이 출력한 JSON 문자열을 KPI별 점수로 변환.
+
+    Args:
+        content: {"1": {"score", "basis", "reason"}, ...} 형식의 JSON 문자열
+
+    Returns:
+        {kpi_id: {"score": 40~90, "basis": 근거수준, "reason": 근거 문장 또는 None}}
+    """
+    scores = json.loads(content)
+    return {int(kpi_id): parse_kpi_entry(data) for kpi_id, data in scores.items()}
+
+
+def parse_kpi_entry(data: any) -> Dict[str, any]:
+    """
+    KPI 1개 항목을 {"score", "basis", "reason"}로 정규화.
+
+    Args:
+        data: {"score", "basis", "reason"} 객체 또는 (구 형식) 점수 숫자
+    """
+    # 새 형식: {"score": 점수, "basis": "근거수준", "reason": "한 줄 근거"}
+    if isinstance(data, dict):
+        score = max(40, min(90, int(data.get("score", 45))))
+        basis = data.get("basis", "explicit")
+        if basis not in ("explicit", "inferred", "none"):
+            basis = "explicit"
+        reason = (data.get("reason") or "").strip() or None
+    else:
+        score = max(40, min(90, int(data)))
+        basis = "explicit"
+        reason = None
+
+    return {
+        "score": score,
+        "basis": basis,
+        "reason": reason,
+    }
+
+
+def completion_kwargs(messages: List[Dict[str, str]]) -> Dict[str, any]:
+    """KPI 평가용 Chat Completions 요청 파라미터."""
+    return {
+        "model": LLM_MODEL,
+        "messages": messages,
+        "temperature": 0.0,  # 일관성 최대화
+        "response_format": {"type": "json_object"},
+    }
+
+
+def parse_completion(
+    content: str,
+    role: str,
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> Dict[int, Dict[str, any]]:
+    """응답 본문을 파싱해 요청한 KPI만 남김 (파싱 시간·빠진 KPI 지표 기록)."""
+    with timed(LLM_PARSE_LATENCY, role=role or "unknown"):
+        scores = select_kpi_scores(parse_kpi_scores(content), kpi_ids)
+    if is_degraded(scores):
+        record_degraded(role, "MissingKPI")
+    return scores
+
+
+def _fallback_scores(
+    error: Exception,
+    role: str,
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> Dict[int, Dict[str, any]]:
+    """호출·파싱 실패 시 기본 점수 (경고 로그·degraded 지표 기록)."""
+    logger.warning("LLM 평가 오류 role=%s: %s: %s", role, type(error).__name__, error)
+    record_degraded(role, type(error).__name__)
+    return default_kpi_scores(error=type(error).__name__, kpi_ids=kpi_ids)
+
+
+def estimate_request_tokens(
+    messages: List[Dict[str, str]],
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> int:
+    """TPM 버킷에 예약할 요청 토큰 추정치 (입력 + 예상 출력)."""
+    kpi_count = len(kpi_ids) if kpi_ids is not None else 10
+    return sum(count_tokens(m["content"]) for m in messages) + OUTPUT_TOKENS_PER_KPI * kpi_count
+
+
+def run_kpi_evaluation(
+    messages: List[Dict[str, str]],
+    role: str = "",
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> Dict[int, Dict[str, any]]:
+    """
+    동기 OpenAI 클라이언트로 KPI 평가 실행.
+
+    Args:
+        messages: 직군별 모듈이 만든 system/user 메시지
+        role: 토큰 사용량 집계용 직군명
+        kpi_ids: 일부 KPI만 평가한 경우 해당 KPI 목록 (None이면 전체)
+
+    Returns:
+        parse_kpi_scores 결과 (오류 시 default_kpi_scores)
+
+    Raises:
+        UpstreamBusyError: 요청 한도 때문에 대기 상한 안에 호출하지 못함
+        DeadlineExceededError: 요청 마감이 지남
+    """
+    client = get_openai_client()
+    try:
+        with timed(LLM_LATENCY, role=role or "unknown", mode="sync"):
+            response = get_limiter("chat").call_sync(
+                lambda: client.chat.completions.create(**completion_kwargs(messages), **request_timeout()),
+                tokens=estimate_request_tokens(messages, kpi_ids),
+            )
+        record_usage(role, response.usage)
+        return parse_completion(response.choices[0].message.content, role, kpi_ids)
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise_if_expired(e)
+        # 오류 시 기본값 반환
+        return _fallback_scores(e, role, kpi_ids)
+
+
+async def run_kpi_evaluation_async(
+    messages: List[Dict[str, str]],
+    role: str = "",
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> Dict[int, Dict[str, any]]:
+    """
+    AsyncOpenAI 클라이언트로 KPI 평가 실행 (이벤트 루프를 막지 않음).
+
+    Args:
+        messages: 직군별 모듈이 만든 system/user 메시지
+        role: 토큰 사용량 집계용 직군명
+        kpi_ids: 일부 KPI만 평가한 경우 해당 KPI 목록 (None이면 전체)
+
+    Returns:
+        parse_kpi_scores 결과 (오류 시 default_kpi_scores)
+
+    Raises:
+        UpstreamBusyError: 요청 한도 때문에 대기 상한 안에 호출하지 못함
+        DeadlineExceededError: 요청 마감이 지남
+    """
+    client = get_async_openai_client()
+    limiter = get_limiter("chat")
+    tokens = estimate_request_tokens(messages, kpi_ids)
+
+    async def request():
+        return await limiter.call(
+            lambda: client.chat.completions.create(**completion_kwargs(messages), **request_timeout()),
+            tokens=tokens,
+        )
+
+    try:
+        # 지연 시간 분포는 출력 KPI 수에 따라 다르므로 KPI 수별로 따로 추적
+        hedge_key = f"chat:{len(kpi_ids) if kpi_ids is not None else 10}"
+        with timed(LLM_LATENCY, role=role or "unknown", mode="async"):
+            response = await wait_within_deadline(hedged_call(hedge_key, request, limiter.has_headroom))
+        record_usage(role, response.usage)
+        return parse_completion(response.choices[0].message.content, role, kpi_ids)
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise_if_expired(e)
+        return _fallback_scores(e, role, kpi_ids)
+
+
+async def stream_kpi_evaluation_async(
+    messages: List[Dict[str, str]],
+    role: str = "",
+) -> AsyncIterator[Tuple[int, Dict[str, any]]]:
+    """
+    스트리밍 모드로 KPI 평가를 실행하고, KPI 항목이 완성되는 즉시 반환.
+
+    Args:
+        messages: 직군별 모듈이 만든 system/user 메시지
+        role: 토큰 사용량 집계용 직군명
+
+    Yields:
+        (kpi_id, {"score", "basis", "reason"}) — LLM이 출력한 순서대로.
+        도중에 오류가 나면 아직 나오지 않은 KPI를 기본값(degraded)으로 채워 마무리.
+
+    Raises:
+        UpstreamBusyError: 요청 한도 때문에 대기 상한 안에 스트림을 시작하지 못함
+        DeadlineExceededError: 스트림 도중 요청 마감이 지남
+    """
+    client = get_async_openai_client()
+    emitted = set()
+    try:
+        # 스트림 시간은 마지막 청크까지 (소비자가 읽는 시간 포함)
+        with timed(LLM_LATENCY, role=role or "unknown", mode="stream"):
+            # 스트림을 다 읽을 때까지 동시성 슬롯을 잡아 둠
+            async with get_limiter("chat").stream(
+                lambda: client.chat.completions.create(
+                    **completion_kwargs(messages),
+                    stream=True,
+                    # 마지막 청크로 usage를 받음 (구버전 SDK에는 stream_options 인자가 없어 extra_body 사용)
+                    extra_body={"stream_options": {"include_usage": True}},
+                    **request_timeout(),
+                ),
+                tokens=estimate_request_tokens(messages),
+            ) as stream:
+                parser = KPIStreamParser()
+                async for chunk in stream:
+                    check_deadline()
+                    if getattr(chunk, "usage", None):
+                        record_usage(role, chunk.usage)
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    for kpi_id, data in parser.feed(delta):
+                        kpi_id = int(kpi_id)
+                        emitted.add(kpi_id)
+                        yield kpi_id, parse_kpi_entry(data)
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise_if_expired(e)
+        for kpi_id, data in _fallback_scores(e, role).items():
+            if kpi_id not in emitted:
+                yield kpi_id, data
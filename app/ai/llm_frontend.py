@@ -4,12 +4,14 @@ LLM 기반 프론트엔드 KPI 직접 평가 모듈.
 Few-shot Learning을 활용하여 이력서 텍스트에서 
 프론트엔드 개발자 KPI 10개에 대한 점수를 직접 산출.
 """
-from typing import Dict
-from openai import OpenAI
-import json
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from app.core.config import settings
-from app.ai.prompts import REASON_FORMAT_RULES
+from app.ai.llm_common import (
+    run_kpi_evaluation,
+    run_kpi_evaluation_async,
+    stream_kpi_evaluation_async,
+)
+from app.ai.prompts import REASON_FORMAT_RULES, register_prompt
 
 
 # KPI 정의 및 평가 기준
@@ -306,25 +308,9 @@ FEW_SHOT_EXAMPLES = """
 """
 
 
-def evaluate_resume_kpis(resume_text: str) -> Dict[int, Dict[str, any]]:
-    """
-    이력서 텍스트를 LLM이 직접 평가하여 프론트엔드 KPI별 점수 산출.
-    
-    Few-shot Learning 방식으로 예시를 제공하고,
-    LLM이 동일한 기준으로 새 이력서를 평가.
-    
-    Args:
-        resume_text: 이력서/경력 텍스트
-    
-    Returns:
-        {kpi_id: {"score": 점수, "basis": 근거수준}}
-        - score: 40~90 범위의 정수
-        - basis: "explicit" | "inferred" | "none"
-    """
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    
-    system_prompt = f"""너는 프론트엔드 개발자 역량 평가 전문가다.
-주어진 이력서/경력 텍스트를 읽고, 10개 KPI에 대해 점수를 매긴다.
+# system 프롬프트 (import 시 1회 조립, 요청마다 바이트 단위로 동일)
+SYSTEM_PROMPT = f"""너는 프론트엔드 개발자 역량 평가 전문가다.
+주어진 이력서/경력 텍스트를 읽고, 요청한 KPI에 대해 점수를 매긴다.
 
 {KPI_DEFINITIONS}
 
@@ -373,47 +359,79 @@ def evaluate_resume_kpis(resume_text: str) -> Dict[int, Dict[str, any]]:
 | 9 UX 연계 | 사용자 피드백→분석→개선→결과 | 디자인 시안 기준 구현 |
 """
 
-    user_prompt = f"""다음 이력서를 평가해줘:
-
-{resume_text}
-
-## 평가 전 확인사항:
+# 이력서 앞에 오는 고정 지시문 (요청마다 달라지는 이력서는 항상 맨 끝에 위치)
+USER_PROMPT_PREFIX = """## 평가 전 확인사항:
 1. **상(75~90)**: "문제→판단→해결→결과" 흐름이 명확하고 수치나 구체적 증거가 있을 때만
 2. **중(55~70)**: 기술로 기능을 구현한 경험이 있으면 (예: "API 연동", "반응형 적용")
 3. **하(40~50)**: "학습했다", "경험하지 못했다", "관여하지 않았다" 또는 기술 나열만 있을 때
 4. 글이 그럴듯해도 **판단·개선·결과 흐름 없으면 중(55~65) 상한**
 
-JSON 형식으로 10개 KPI의 점수(score), 근거수준(basis), 한 줄 근거 문장(reason)을 출력해."""
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.0,  # 일관성 최대화
-            response_format={"type": "json_object"}
-        )
-        
-        result = response.choices[0].message.content
-        scores = json.loads(result)
-        
-        parsed_scores = {}
-        for kpi_id, data in scores.items():
-            if isinstance(data, dict):
-                score = max(40, min(90, int(data.get("score", 45))))
-                basis = data.get("basis", "explicit")
-                if basis not in ("explicit", "inferred", "none"):
-                    basis = "explicit"
-                reason = (data.get("reason") or "").strip() or None
-            else:
-                score = max(40, min(90, int(data)))
-                basis = "explicit"
-                reason = None
-            parsed_scores[int(kpi_id)] = {"score": score, "basis": basis, "reason": reason}
-        return parsed_scores
+JSON 형식으로 요청한 KPI의 점수(score), 근거수준(basis), 한 줄 근거 문장(reason)을 출력해.
+
+다음 이력서를 평가해줘:
+
+"""
+
+PROMPT = register_prompt("frontend", SYSTEM_PROMPT, USER_PROMPT_PREFIX)
+
+
+def build_messages(resume_text: str, kpi_ids: Optional[Sequence[int]] = None) -> List[Dict[str, str]]:
+    """
+    프론트엔드 KPI 평가용 system/user 메시지 생성.
+
+    Args:
+        resume_text: 이력서/경력 텍스트
+        kpi_ids: 지정 시 해당 KPI만 평가하도록 지시 (None이면 10개 전체)
+
+    Returns:
+        Chat Completions messages 리스트
+    """
+    return PROMPT.build_messages(resume_text, kpi_ids)
+
+
+def evaluate_resume_kpis(
+    resume_text: str,
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> Dict[int, Dict[str, any]]:
+    """
+    이력서 텍스트를 LLM이 직접 평가하여 프론트엔드 KPI별 점수 산출.
+    
+    Few-shot Learning 방식으로 예시를 제공하고,
+    LLM이 동일한 기준으로 새 이력서를 평가.
     
-    except Exception as e:
-        print(f"LLM 평가 오류: {e}")
-        return {i: {"score": 45, "basis": "none", "reason": None} for i in range(1, 11)}
+    Args:
+        resume_text: 이력서/경력 텍스트
+        kpi_ids: 지정 시 해당 KPI만 평가 (None이면 10개 전체)
+    
+    Returns:
+        {kpi_id: {"score": 점수, "basis": 근거수준}}
+        - score: 40~90 범위의 정수
+        - basis: "explicit" | "inferred" | "none"
+    """
+    return run_kpi_evaluation(build_messages(resume_text, kpi_ids), role=PROMPT.role, kpi_ids=kpi_ids)
+
+
+async def evaluate_resume_kpis_async(
+    resume_text: str,
+    kpi_ids: Optional[Sequence[int]] = None,
+) -> Dict[int, Dict[str, any]]:
+    """
+    evaluate_resume_kpis의 비동기 버전.
+
+    AsyncOpenAI로 호출하므로 LLM 응답을 기다리는 동안 이벤트 루프를 점유하지 않음.
+    반환 형식은 evaluate_resume_kpis와 동일.
+    """
+    return await run_kpi_evaluation_async(
+        build_messages(resume_text, kpi_ids), role=PROMPT.role, kpi_ids=kpi_ids
+    )
+
+
+async def stream_resume_kpis_async(resume_text: str) -> AsyncIterator[Tuple[int, Dict[str, any]]]:
+    """
+    evaluate_resume_kpis의 스트리밍 버전.
+
+    LLM 응답을 스트리밍으로 받으며 KPI 항목이 완성될 때마다
+    (kpi_id, {"score", "basis", "reason"})를 반환.
+    """
+    async for kpi_id, data in stream_kpi_evaluation_async(build_messages(resume_text), role=PROMPT.role):
+        yield kpi_id, data
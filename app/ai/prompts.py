@@ -1,6 +1,12 @@
 """
 Prompt templates and management.
 """
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence
+
+from app.ai.tokens import count_tokens
 
 # 모든 직군 KPI 평가에서 reason(근거 문장) 출력 형식을 통일하기 위한 공통 규칙
 REASON_FORMAT_RULES = """
@@ -34,3 +40,81 @@ def normalize_reason(reason: str | None, max_length: int = 80) -> str | None:
     if len(s) > max_length:
         s = s[: max_length - 1].rsplit(" ", 1)[0] + "."
     return s if s != "." else None
+
+
+def kpi_instruction(kpi_ids: Optional[Sequence[int]] = None) -> str:
+    """
+    이력서 뒤에 덧붙이는 평가 대상 KPI 지시문.
+
+    고정 prefix에는 KPI 개수를 적지 않고, 전체(1~10번)인지 일부인지는 이 지시문으로만 알려줌.
+    """
+    if kpi_ids is None:
+        kpi_ids = range(1, 11)
+        scope = "KPI 1~10번 10개를 모두"
+    else:
+        scope = f"이번에는 KPI {', '.join(str(kpi_id) for kpi_id in kpi_ids)}번만"
+    keys = ", ".join(f'"{kpi_id}"' for kpi_id in kpi_ids)
+    return f"{scope} 평가해. 평가 기준과 출력 형식은 위와 같고, JSON에는 {keys} 키만 출력해."
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """
+    직군별로 한 번만 조립해 두는 KPI 평가 프롬프트.
+
+    system과 user_prefix는 요청마다 바이트 단위로 동일하고,
+    요청마다 달라지는 이력서 텍스트는 항상 user 메시지 맨 끝에 붙음.
+    → OpenAI 자동 prefix 캐싱이 system 전체 + user_prefix까지 적용됨.
+    """
+    role: str
+    system: str
+    user_prefix: str
+    version: str
+
+    def build_messages(
+        self,
+        resume_text: str,
+        kpi_ids: Optional[Sequence[int]] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        고정 prefix 뒤에 이력서를 붙여 Chat Completions messages 생성.
+
+        평가할 KPI(None이면 10개 전체)는 항상 마지막 user 메시지로 덧붙임.
+        앞의 두 메시지는 KPI 묶음과 관계없이 바이트 단위로 같으므로 prefix 캐싱이 그대로 적용됨.
+        """
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user_prefix + resume_text},
+            {"role": "user", "content": kpi_instruction(kpi_ids)},
+        ]
+
+    @cached_property
+    def prefix_tokens(self) -> int:
+        """고정 prefix(system + user_prefix)의 토큰 수 (최초 1회만 계산)."""
+        return count_tokens(self.system) + count_tokens(self.user_prefix)
+
+
+_PROMPT_REGISTRY: Dict[str, CompiledPrompt] = {}
+
+
+def register_prompt(role: str, system: str, user_prefix: str) -> CompiledPrompt:
+    """
+    직군 프롬프트를 컴파일해 레지스트리에 등록 (모듈 import 시 1회 호출).
+
+    Args:
+        role: 직군명 (backend, frontend, pm, designer)
+        system: 고정 system 프롬프트
+        user_prefix: 이력서 앞에 오는 고정 user 지시문
+
+    Returns:
+        등록된 CompiledPrompt (version은 system·user_prefix 해시)
+    """
+    digest = hashlib.sha256(f"{system}\x00{user_prefix}".encode("utf-8")).hexdigest()[:16]
+    prompt = CompiledPrompt(role=role, system=system, user_prefix=user_prefix, version=digest)
+    _PROMPT_REGISTRY[role] = prompt
+    return prompt
+
+
+def get_prompt(role: str) -> CompiledPrompt:
+    """등록된 직군 프롬프트 조회 (알 수 없는 직군은 backend)."""
+    return _PROMPT_REGISTRY.get(role) or _PROMPT_REGISTRY["backend"]
@@ -0,0 +1,473 @@
+"""
+OpenAI 업스트림 호출 제한기.
+
+모든 Chat Completions·Embeddings 호출이 모델 종류별(chat, embedding) 공유 제한기를 거침.
+
+- RPM/TPM 토큰 버킷: 분당 요청 수·토큰 수 한도 안에서만 호출을 내보냄 (0이면 사용 안 함).
+  예약 방식이라 대기자는 순서대로 필요한 만큼만 기다리고, 응답의 실제 토큰 수로 정산.
+- AIMD 동시성 제한: 성공할 때마다 한도를 조금씩(+1/한도) 늘리고, 429를 받으면 절반으로 줄임.
+- Retry-After: 429 응답의 대기 시간 동안은 새 호출을 내보내지 않음 (제한기 전체 공유).
+- 대기 상한: 대기열·재시도를 포함해 UPSTREAM_MAX_WAIT_SECONDS(요청 마감이 더 이르면 마감)를
+  넘기게 되면 포기하고 UpstreamBusyError를 던짐 → API는 기본값(45점) 대신 503 + Retry-After로 응답.
+
+SDK 자체 재시도는 끄고(max_retries=0) 재시도는 모두 여기서 처리.
+동시성 슬롯은 비동기 호출자가 대기열(FIFO)로 기다리고, 동기 호출자(스크립트)는 짧게 폴링함.
+"""
+import asyncio
+import collections
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple, TypeVar
+
+import openai
+
+from app.core.config import settings
+from app.core.deadline import current_deadline
+from app.core.metrics import UPSTREAM_ERRORS
+
+T = TypeVar("T")
+
+# 429 외에 재시도할 일시적 오류
+_TRANSIENT_ERRORS = (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)
+_SYNC_POLL_SECONDS = 0.02
+
+
+class UpstreamBusyError(Exception):
+    """업스트림 한도 때문에 대기 상한 안에 호출하지 못함 (HTTP 503으로 응답)."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = max(1.0, retry_after)
+        super().__init__(f"OpenAI {name} 요청 한도 초과: {self.retry_after:.0f}초 후 다시 시도해 주세요.")
+
+
+@dataclass
+class RateLimitStats:
+    """제한기 누적 통계."""
+    requests: int = 0
+    throttled: int = 0
+    rate_limited: int = 0
+    retries: int = 0
+    rejected: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "rejected": self.rejected,
+        }
+
+
+class TokenBucket:
+    """
+    분당 한도 토큰 버킷 (예약 방식).
+
+    reserve는 잔량을 바로 차감(음수 가능)하고 잔량이 0 이상으로 회복될 때까지의 대기 시간을 반환.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 지금 예약하면 기다려야 하는 시간(초)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def reserve(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """예약했지만 쓰지 않은 양 반환 (추정보다 실제 사용량이 적을 때 등)."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """429 응답의 retry-after-ms / retry-after 헤더 값(초). 없으면 None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _response_tokens(result: any) -> Optional[int]:
+    """응답의 실제 총 토큰 수 (usage가 없으면 None)."""
+    usage = getattr(result, "usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return total if isinstance(total, int) else None
+
+
+class UpstreamLimiter:
+    """모델 종류 1개의 공유 호출 제한기."""
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int = 0,
+        tpm: int = 0,
+        initial_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        max_wait_seconds: float = 30.0,
+        max_retries: int = 4,
+    ):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = collections.deque()
+        # 슬롯을 넘겨받았지만 아직 가져가지 않은 대기자 (대기자가 시간 초과·취소되면 슬롯 반납)
+        self._granted: Set[asyncio.Future] = set()
+        self.stats = RateLimitStats()
+
+    # ----- 동시성 슬롯 -----
+
+    def _try_take_slot(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def _wake_waiters(self) -> None:
+        """빈 슬롯만큼 비동기 대기자를 깨움 (슬롯은 깨우는 쪽이 미리 잡아 넘겨줌, lock 보유 상태에서 호출)."""
+        while self._waiters and self.in_flight < int(self.limit):
+            loop, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_flight += 1
+            self._granted.add(future)
+            loop.call_soon_threadsafe(_hand_over, future)
+
+    def _release_locked(self, success: bool) -> None:
+        self.in_flight -= 1
+        if success:
+            # 가산 증가: 한도만큼 성공하면 한도 +1
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+        self._wake_waiters()
+
+    def _release(self, success: bool) -> None:
+        with self._lock:
+            self._release_locked(success)
+
+    def _abandon_waiter(self, future: asyncio.Future) -> None:
+        """시간 초과·취소된 대기자 정리 (이미 슬롯을 넘겨받았으면 반납)."""
+        with self._lock:
+            if future in self._granted:
+                self._granted.discard(future)
+                self._release_locked(success=False)
+
+    async def _take_slot_async(self, deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._try_take_slot():
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            # 깨우는 쪽이 슬롯을 잡은 직후 시간이 다 됐을 수 있음
+            self._abandon_waiter(future)
+            raise self._busy(deadline) from None
+        except BaseException:
+            # 취소 등: wait_for가 future를 취소하므로 넘겨받았는지는 _granted로 판단
+            self._abandon_waiter(future)
+            raise
+        with self._lock:
+            self._granted.discard(future)
+
+    def _take_slot_sync(self, deadline: float) -> None:
+        while True:
+            with self._lock:
+                if not self._waiters and self._try_take_slot():
+                    return
+            if time.monotonic() >= deadline:
+                raise self._busy(deadline)
+            time.sleep(_SYNC_POLL_SECONDS)
+
+    # ----- 버킷·쿨다운 -----
+
+    def _reserve(self, tokens: int, deadline: float) -> float:
+        """
+        쿨다운·RPM·TPM을 고려한 대기 시간을 계산하고 예약.
+
+        대기 후 시각이 deadline을 넘으면 예약하지 않고 UpstreamBusyError.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            if self.requests is not None:
+                wait = max(wait, self.requests.wait_time(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.wait_time(tokens, now))
+            if now + wait > deadline:
+                self.stats.rejected += 1
+                raise UpstreamBusyError(self.name, wait)
+            if self.requests is not None:
+                self.requests.reserve(1, now)
+            if self.tokens is not None:
+                self.tokens.reserve(tokens, now)
+            if wait > 0:
+                self.stats.throttled += 1
+            return wait
+
+    def _settle(self, estimated: int, result: any) -> None:
+        """추정 토큰과 실제 사용량 차이를 TPM 버킷에 정산."""
+        actual = _response_tokens(result)
+        if self.tokens is None or actual is None:
+            return
+        with self._lock:
+            self.tokens.refund(estimated - actual)
+
+    def _on_rate_limited(self, error: Exception, attempt: int) -> float:
+        """429 처리: 동시성 한도 절반, Retry-After(없으면 지수 백오프) 동안 전체 대기. 대기 시간 반환."""
+        delay = retry_after_seconds(error)
+        if delay is None:
+            delay = min(2 ** attempt, 30) * (0.5 + random.random() / 2)
+        with self._lock:
+            now = time.monotonic()
+            self.stats.rate_limited += 1
+            self.blocked_until = max(self.blocked_until, now + delay)
+            # 같은 순간 몰려온 429로 한도가 연달아 줄지 않도록 1초에 한 번만 감소
+            if now - self._last_decrease >= 1.0:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                self._last_decrease = now
+        return delay
+
+    def _call_deadline(self) -> float:
+        """이번 호출의 대기 상한 시각 (UPSTREAM_MAX_WAIT_SECONDS와 요청 마감 중 이른 쪽)."""
+        deadline = time.monotonic() + self.max_wait_seconds
+        request_deadline = current_deadline()
+        return deadline if request_deadline is None else min(deadline, request_deadline)
+
+    def has_headroom(self) -> bool:
+        """대기 없이 바로 호출할 수 있는 상태인지 (헤지 요청 여부 판단용)."""
+        with self._lock:
+            return (
+                not self._waiters
+                and self.in_flight < int(self.limit)
+                and self.blocked_until <= time.monotonic()
+            )
+
+    def _busy(self, deadline: float) -> UpstreamBusyError:
+        with self._lock:
+            self.stats.rejected += 1
+            retry_after = max(self.blocked_until - time.monotonic(), 1.0)
+        return UpstreamBusyError(self.name, retry_after)
+
+    # ----- 호출 -----
+
+    def _cooldown_after_slot(self, deadline: float) -> float:
+        """
+        슬롯을 받은 뒤 남은 429 쿨다운 (대기열에 있는 동안 다른 호출이 429를 받았을 수 있음).
+
+        쿨다운이 deadline을 넘기면 슬롯을 반납하고 UpstreamBusyError.
+        """
+        wait = max(0.0, self.blocked_until - time.monotonic())
+        if wait > 0 and time.monotonic() + wait > deadline:
+            self._release(success=False)
+            raise self._busy(deadline)
+        return wait
+
+    async def _acquire_async(self, tokens: int, deadline: float) -> None:
+        wait = self._reserve(tokens, deadline)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        await self._take_slot_async(deadline)
+        wait = self._cooldown_after_slot(deadline)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _acquire_sync(self, tokens: int, deadline: float) -> None:
+        wait = self._reserve(tokens, deadline)
+        if wait > 0:
+            time.sleep(wait)
+        self._take_slot_sync(deadline)
+        wait = self._cooldown_after_slot(deadline)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _should_retry(self, error: Exception, attempt: int, deadline: float) -> Optional[float]:
+        """재시도할 오류면 대기 시간, 아니면 None (재시도 불가·상한 초과 시 예외)."""
+        if isinstance(error, openai.RateLimitError):
+            if getattr(error, "code", None) == "insufficient_quota":
+                return None  # 기다려도 풀리지 않음
+            delay = self._on_rate_limited(error, attempt)
+        elif isinstance(error, _TRANSIENT_ERRORS):
+            delay = min(2 ** attempt, 30) * (0.5 + random.random() / 2)
+        else:
+            return None
+        if attempt >= self.max_retries or time.monotonic() + delay > deadline:
+            if isinstance(error, openai.RateLimitError):
+                with self._lock:
+                    self.stats.rejected += 1
+                raise UpstreamBusyError(self.name, delay) from error
+            return None
+        with self._lock:
+            self.stats.retries += 1
+        return delay
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        hold_slot: bool = False,
+    ) -> T:
+        """
+        제한기를 거쳐 비동기 호출 실행 (429·일시적 오류는 대기 상한 안에서 재시도).
+
+        Args:
+            fn: 호출할 때마다 새 요청을 만드는 함수 (재시도 시 다시 호출)
+            tokens: 요청 추정 토큰 수 (입력 + 예상 출력, TPM 예약용)
+            hold_slot: True면 성공 후에도 슬롯을 반납하지 않음 (스트리밍, release_slot으로 반납)
+        """
+        deadline = self._call_deadline()
+        attempt = 0
+        while True:
+            await self._acquire_async(tokens, deadline)
+            with self._lock:
+                self.stats.requests += 1
+            try:
+                result = await fn()
+            except Exception as e:
+                self._release(success=False)
+                UPSTREAM_ERRORS.labels(upstream=self.name, error=type(e).__name__).inc()
+                delay = self._should_retry(e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                if not isinstance(e, openai.RateLimitError):
+                    await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self._release(success=False)
+                raise
+            self._settle(tokens, result)
+            if not hold_slot:
+                self._release(success=True)
+            return result
+
+    def call_sync(self, fn: Callable[[], T], tokens: int = 0) -> T:
+        """call의 동기 버전 (스크립트 등 이벤트 루프 밖 호출용)."""
+        deadline = self._call_deadline()
+        attempt = 0
+        while True:
+            self._acquire_sync(tokens, deadline)
+            with self._lock:
+                self.stats.requests += 1
+            try:
+                result = fn()
+            except Exception as e:
+                self._release(success=False)
+                UPSTREAM_ERRORS.labels(upstream=self.name, error=type(e).__name__).inc()
+                delay = self._should_retry(e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                if not isinstance(e, openai.RateLimitError):
+                    time.sleep(delay)
+                continue
+            self._settle(tokens, result)
+            self._release(success=True)
+            return result
+
+    def release_slot(self, success: bool = True) -> None:
+        """hold_slot=True로 잡아 둔 슬롯 반납."""
+        self._release(success=success)
+
+    @asynccontextmanager
+    async def stream(self, fn: Callable[[], Awaitable[T]], tokens: int = 0) -> AsyncIterator[T]:
+        """스트리밍 응답을 다 읽을 때까지 동시성 슬롯을 잡아 두는 call."""
+        result = await self.call(fn, tokens, hold_slot=True)
+        success = False
+        try:
+            yield result
+            success = True
+        finally:
+            self.release_slot(success=success)
+
+    def snapshot(self) -> dict:
+        """현재 상태 + 누적 통계."""
+        with self._lock:
+            return {
+                **self.stats.as_dict(),
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 3),
+            }
+
+
+def _hand_over(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_limiters: Dict[str, UpstreamLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> UpstreamLimiter:
+    """설정 기반 공유 제한기 ("chat" 또는 "embedding")."""
+    with _limiters_lock:
+        if name not in _limiters:
+            if name == "embedding":
+                rpm, tpm = settings.OPENAI_EMBEDDING_RPM_LIMIT, settings.OPENAI_EMBEDDING_TPM_LIMIT
+            else:
+                rpm, tpm = settings.OPENAI_CHAT_RPM_LIMIT, settings.OPENAI_CHAT_TPM_LIMIT
+            _limiters[name] = UpstreamLimiter(
+                name,
+                rpm=rpm,
+                tpm=tpm,
+                initial_concurrency=settings.UPSTREAM_INITIAL_CONCURRENCY,
+                min_concurrency=settings.UPSTREAM_MIN_CONCURRENCY,
+                max_concurrency=settings.UPSTREAM_MAX_CONCURRENCY,
+                max_wait_seconds=settings.UPSTREAM_MAX_WAIT_SECONDS,
+                max_retries=settings.UPSTREAM_MAX_RETRIES,
+            )
+        return _limiters[name]
+
+
+def get_rate_limit_stats() -> Dict[str, dict]:
+    """제한기별 상태·통계."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
@@ -0,0 +1,98 @@
+"""
+스트리밍 KPI JSON 증분 파서.
+
+LLM이 스트리밍으로 내보내는 {"1": {...}, "2": {...}, ...} 형태의 JSON을
+조각(chunk) 단위로 받아, 최상위 키의 값이 완성되는 즉시 (키, 값)을 돌려줌.
+"""
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class KPIStreamParser:
+    """
+    최상위 JSON 객체의 멤버를 완성되는 순서대로 꺼내는 증분 파서.
+
+    문자열 내부의 괄호·따옴표 이스케이프를 추적하므로 reason 문장에
+    "{", "}", "," 가 들어 있어도 안전함. 값은 객체/숫자/문자열 모두 지원.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._pos = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        새 조각을 추가하고, 이번 조각으로 완성된 (키, 값) 목록을 반환.
+
+        Args:
+            chunk: 스트리밍으로 받은 텍스트 조각
+
+        Returns:
+            완성된 최상위 멤버 [(key, value), ...] (없으면 빈 리스트)
+        """
+        completed: List[Tuple[str, Any]] = []
+        for ch in chunk:
+            self._buffer.append(ch)
+            pos = self._pos
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key is None and self._key_start is not None:
+                        self._key = json.loads("".join(self._buffer[self._key_start:pos + 1]))
+                        self._key_start = None
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None and self._value_start is None:
+                    self._key_start = pos
+                continue
+
+            if ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    member = self._close_scalar(pos)
+                    if member is not None:
+                        completed.append(member)
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    completed.append(self._close_value(pos + 1))
+                continue
+            elif ch == "," and self._depth == 1:
+                member = self._close_scalar(pos)
+                if member is not None:
+                    completed.append(member)
+                continue
+            elif ch == ":" and self._depth == 1 and self._key is not None and self._value_start is None:
+                self._value_start = pos + 1
+
+        return completed
+
+    def _close_value(self, end: int) -> Tuple[str, Any]:
+        raw = "".join(self._buffer[self._value_start:end])
+        member = (self._key, json.loads(raw))
+        self._key = None
+        self._value_start = None
+        return member
+
+    def _close_scalar(self, end: int) -> Optional[Tuple[str, Any]]:
+        """숫자·문자열 등 스칼라 값이 ',' 또는 '}'로 끝났을 때 멤버 완성."""
+        if self._key is None or self._value_start is None:
+            return None
+        raw = "".join(self._buffer[self._value_start:end]).strip()
+        if not raw:
+            return None
+        return self._close_value(end)
@@ -0,0 +1,141 @@
+"""
+로컬 토큰 카운터 및 입력 토큰 예산 적용.
+
+gpt-4o-mini의 토크나이저(o200k_base)로 토큰 수를 셈.
+tiktoken 인코딩 파일이 로컬 캐시(TIKTOKEN_CACHE_DIR)에 있을 때만 사용하고,
+없으면 네트워크로 내려받지 않고 문자 종류 기반 추정치를 사용.
+(Docker 이미지는 빌드 시 인코딩 파일을 미리 받아 둠)
+"""
+import hashlib
+import math
+import os
+import re
+import tempfile
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+ENCODING_NAME = "o200k_base"
+_ENCODING_URL = f"https://openaipublic.blob.core.windows.net/encodings/{ENCODING_NAME}.tiktoken"
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def _encoding_cached() -> bool:
+    """tiktoken이 인코딩 파일을 네트워크 없이 읽을 수 있는지 (tiktoken 캐시 경로 규칙과 동일)."""
+    cache_dir = (
+        os.environ.get("TIKTOKEN_CACHE_DIR")
+        or os.environ.get("DATA_GYM_CACHE_DIR")
+        or os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    )
+    cache_key = hashlib.sha1(_ENCODING_URL.encode()).hexdigest()
+    return os.path.exists(os.path.join(cache_dir, cache_key))
+
+
+@lru_cache(maxsize=1)
+def _load_encoding():
+    """로컬에 캐시된 tiktoken 인코딩 (없거나 tiktoken 미설치 시 None)."""
+    if not _encoding_cached():
+        return None
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:
+        return None
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    tiktoken을 쓸 수 없을 때의 토큰 수 추정.
+
+    o200k_base 기준으로 한글은 대략 글자당 0.8토큰, 그 외(영문·숫자·기호)는
+    약 4글자당 1토큰이므로 이를 합산해 올림. 예산 판단용이라 약간 크게 잡음.
+    """
+    hangul = len(_HANGUL.findall(text))
+    others = len(text) - hangul
+    return math.ceil(hangul * 0.8 + others / 4)
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수 (로컬 토크나이저 또는 추정치)."""
+    if not text:
+        return 0
+    encoding = _load_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _estimate_tokens(text)
+
+
+def is_exact() -> bool:
+    """count_tokens가 실제 토크나이저를 쓰는지 여부 (False면 추정치)."""
+    return _load_encoding() is not None
+
+
+def truncate_to_tokens(
+    text: str,
+    budget: int,
+    counter: Callable[[str], int] = count_tokens,
+) -> str:
+    """
+    문장 경계를 지키며 앞에서부터 budget 토큰 이내로 자름.
+
+    Args:
+        text: 원문
+        budget: 최대 토큰 수
+        counter: 토큰 카운터
+
+    Returns:
+        budget 이내로 자른 텍스트 (원문이 이미 이내면 그대로)
+    """
+    if counter(text) <= budget:
+        return text
+
+    kept: List[str] = []
+    used = 0
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        cost = counter(sentence) + 1
+        if used + cost > budget:
+            if not kept:
+                # 첫 문장부터 예산 초과 → 글자 단위로 자름
+                kept.append(_truncate_chars(sentence, budget, counter))
+            break
+        kept.append(sentence)
+        used += cost
+    return "\n".join(kept)
+
+
+def _truncate_chars(text: str, budget: int, counter: Callable[[str], int]) -> str:
+    """이진 탐색으로 budget 토큰 이내가 되는 가장 긴 접두어."""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if counter(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def fit_to_budget(
+    text: str,
+    budget: int,
+    compact: Optional[Callable[[str], str]] = None,
+) -> str:
+    """
+    입력 토큰 예산 적용: 초과 시 compact로 압축해 보고, 그래도 넘으면 문장 단위로 자름.
+
+    Args:
+        text: 정규화된 이력서 텍스트
+        budget: 최대 토큰 수 (0 이하면 제한 없음)
+        compact: 의미를 크게 바꾸지 않는 압축 함수 (중복 줄·상용구 제거 등)
+    """
+    if budget <= 0 or count_tokens(text) <= budget:
+        return text
+    if compact is not None:
+        text = compact(text)
+        if count_tokens(text) <= budget:
+            return text
+    return truncate_to_tokens(text, budget)
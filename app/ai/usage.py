@@ -0,0 +1,141 @@
+"""
+LLM 토큰 사용량 집계.
+
+Chat Completions 응답의 usage(prompt/completion/cached 토큰)를
+직군별로 누적해, prefix 캐싱이 실제로 적용되는지 확인할 수 있게 함.
+입력 토큰 예산 적용 전후의 이력서 토큰 수와 잘림 횟수도 함께 집계.
+요청별 토큰 수 분포는 Prometheus 히스토그램(app.core.metrics)으로도 기록.
+"""
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.core.metrics import LLM_TOKENS, RESUME_TOKENS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenUsage:
+    """요청 1건의 토큰 사용량."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+
+@dataclass
+class UsageStats:
+    """직군별 누적 토큰 사용량."""
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    resumes: int = 0
+    resume_tokens: int = 0
+    truncated_resumes: int = 0
+
+    @property
+    def cached_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_ratio": round(self.cached_ratio, 4),
+            "resumes": self.resumes,
+            "resume_tokens": self.resume_tokens,
+            "truncated_resumes": self.truncated_resumes,
+        }
+
+
+_stats: Dict[str, UsageStats] = defaultdict(UsageStats)
+_lock = threading.Lock()
+
+
+def _field(obj: any, name: str) -> any:
+    """SDK 모델 객체·dict 어느 쪽이든 필드 조회 (구버전 SDK는 확장 필드를 dict로 보관)."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def extract_usage(usage: any) -> Optional[TokenUsage]:
+    """응답의 usage 객체에서 prompt/completion/cached 토큰 수 추출."""
+    if usage is None:
+        return None
+    details = _field(usage, "prompt_tokens_details")
+    return TokenUsage(
+        prompt_tokens=_field(usage, "prompt_tokens") or 0,
+        completion_tokens=_field(usage, "completion_tokens") or 0,
+        cached_tokens=_field(details, "cached_tokens") or 0,
+    )
+
+
+def record_usage(role: str, usage: any) -> Optional[TokenUsage]:
+    """
+    응답 usage를 직군별 누적 통계에 반영.
+
+    Args:
+        role: 직군명 (집계 단위)
+        usage: Chat Completions 응답의 usage (없으면 무시)
+    """
+    token_usage = extract_usage(usage)
+    if token_usage is None:
+        return None
+    with _lock:
+        stats = _stats[role or "unknown"]
+        stats.requests += 1
+        stats.prompt_tokens += token_usage.prompt_tokens
+        stats.completion_tokens += token_usage.completion_tokens
+        stats.cached_tokens += token_usage.cached_tokens
+    role_label = role or "unknown"
+    LLM_TOKENS.labels(role=role_label, type="prompt").observe(token_usage.prompt_tokens)
+    LLM_TOKENS.labels(role=role_label, type="completion").observe(token_usage.completion_tokens)
+    LLM_TOKENS.labels(role=role_label, type="cached").observe(token_usage.cached_tokens)
+    logger.info(
+        "llm usage role=%s prompt_tokens=%d cached_tokens=%d completion_tokens=%d",
+        role,
+        token_usage.prompt_tokens,
+        token_usage.cached_tokens,
+        token_usage.completion_tokens,
+    )
+    return token_usage
+
+
+def record_resume_tokens(role: str, original_tokens: int, final_tokens: int) -> None:
+    """
+    입력 토큰 예산 적용 결과를 직군별 누적 통계에 반영.
+
+    Args:
+        role: 직군명
+        original_tokens: 정규화 직후 이력서 토큰 수
+        final_tokens: 압축·자르기 후 LLM에 보내는 이력서 토큰 수
+    """
+    truncated = final_tokens < original_tokens
+    with _lock:
+        stats = _stats[role or "unknown"]
+        stats.resumes += 1
+        stats.resume_tokens += final_tokens
+        if truncated:
+            stats.truncated_resumes += 1
+    RESUME_TOKENS.labels(role=role or "unknown").observe(original_tokens)
+    if truncated:
+        logger.warning(
+            "resume over token budget role=%s original_tokens=%d final_tokens=%d",
+            role,
+            original_tokens,
+            final_tokens,
+        )
+
+
+def get_usage_stats() -> Dict[str, dict]:
+    """직군별 누적 토큰 사용량."""
+    with _lock:
+        return {role: stats.as_dict() for role, stats in _stats.items()}
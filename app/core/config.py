@@ -10,7 +10,109 @@ class Settings(BaseSettings):
     
     # API Keys
     OPENAI_API_KEY: str = ""
-    
+
+    # OpenAI HTTP 커넥션 풀 (앱 전체 공유 클라이언트)
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY: float = 60.0
+    OPENAI_HTTP2: bool = True
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    # OpenAI 업스트림 호출 제한 (RPM/TPM 0이면 버킷 사용 안 함, 동시성은 429에 따라 자동 조절)
+    OPENAI_CHAT_RPM_LIMIT: int = 0
+    OPENAI_CHAT_TPM_LIMIT: int = 0
+    OPENAI_EMBEDDING_RPM_LIMIT: int = 0
+    OPENAI_EMBEDDING_TPM_LIMIT: int = 0
+    UPSTREAM_INITIAL_CONCURRENCY: int = 16
+    UPSTREAM_MIN_CONCURRENCY: int = 1
+    UPSTREAM_MAX_CONCURRENCY: int = 64
+    UPSTREAM_MAX_WAIT_SECONDS: float = 30.0
+    UPSTREAM_MAX_RETRIES: int = 4
+
+    # 요청 마감 (0이면 없음, X-Request-Timeout 헤더로 더 짧게 지정 가능)
+    REQUEST_DEADLINE_SECONDS: float = 30.0
+
+    # LLM 요청 헤징: 최근 지연 시간의 p{LLM_HEDGE_PERCENTILE}를 넘기면 같은 요청을 한 번 더 보냄
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    LLM_HEDGE_WINDOW: int = 200
+
+    # OpenAI Batch API (대량 재채점: 분당 한도와 별개로 completion window 안에 비동기 처리)
+    OPENAI_BATCH_BASE_URL: str = "https://api.openai.com/v1"
+    OPENAI_BATCH_COMPLETION_WINDOW: str = "24h"
+    OPENAI_BATCH_MAX_REQUESTS: int = 50000
+    OPENAI_BATCH_MAX_FILE_BYTES: int = 190_000_000
+    OPENAI_BATCH_EMBEDDING_INPUTS: int = 256
+    OPENAI_BATCH_POLL_INTERVAL_SECONDS: float = 30.0
+    OPENAI_BATCH_MAX_WAIT_SECONDS: float = 90000.0
+
+    # Prometheus 지표 (GET /metrics)
+    METRICS_ENABLED: bool = True
+
+    # 임베딩 제공자 ("openai" 또는 "local": sentence-transformers 로컬 모델)
+    EMBEDDING_PROVIDER: str = "openai"
+    EMBEDDING_LOCAL_MODEL: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    EMBEDDING_LOCAL_DEVICE: str = "cpu"
+    EMBEDDING_LOCAL_BATCH_SIZE: int = 32
+    EMBEDDING_LOCAL_BACKEND: str = "torch"
+
+    # 임베딩 기본 프로필 (요청에서 dimensions/quantization으로 재지정 가능)
+    EMBEDDING_DIMENSIONS: int = 1536
+    EMBEDDING_QUANTIZATION: str = "none"
+
+    # 캐시 (CACHE_BACKEND: "memory" 또는 "sqlite")
+    CACHE_BACKEND: str = "memory"
+    CACHE_SQLITE_PATH: str = ".cache/navik_cache.sqlite3"
+    KPI_CACHE_ENABLED: bool = True
+    KPI_CACHE_MAX_ENTRIES: int = 1024
+    KPI_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    EMBEDDING_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+
+    # abilities 유사 검색 저장소 (SQLite 메타데이터 + memmap 벡터 + IVF 인덱스)
+    ABILITY_STORE_DIR: str = ".cache/abilities"
+    ABILITY_INDEX_NPROBE: int = 32
+    ABILITY_INDEX_REBUILD_THRESHOLD: int = 20000
+
+    # 배치 분석
+    BATCH_MAX_ITEMS: int = 1000
+    BATCH_MAX_CONCURRENCY: int = 8
+    BATCH_MAX_RETRIES: int = 3
+    BATCH_RETRY_BASE_DELAY_SECONDS: float = 2.0
+
+    # 비동기 분석 작업 대기열 (JOB_WORKERS=0이면 이 프로세스는 작업을 받기만 하고 실행하지 않음)
+    JOB_STORE_PATH: str = ".cache/jobs.sqlite3"
+    JOB_WORKERS: int = 4
+    JOB_MAX_PENDING: int = 10000
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_DELAY_SECONDS: float = 5.0
+    JOB_DEADLINE_SECONDS: float = 120.0
+    JOB_RESULT_TTL_SECONDS: int = 24 * 3600
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    JOB_WEBHOOK_MAX_ATTEMPTS: int = 3
+
+    # KPI 평가 방식: "single"(10개 KPI를 한 번에) 또는 "grouped"(KPI_GROUP_SIZE개씩 나눠 동시 호출)
+    KPI_EVALUATION_STRATEGY: str = "single"
+    KPI_GROUP_SIZE: int = 3
+
+    # 증분 재분석 (analysis_id별 이전 분석 스냅샷과 비교해 바뀐 KPI만 재평가)
+    INCREMENTAL_SNAPSHOT_MAX_ENTRIES: int = 10000
+    INCREMENTAL_SNAPSHOT_TTL_SECONDS: int = 30 * 24 * 3600
+    INCREMENTAL_EVIDENCE_OVERLAP: float = 0.5
+    INCREMENTAL_MAX_CHANGED_RATIO: float = 0.5
+
+    # 설문 폴백 일괄 계산 (요청당 최대 응답 수)
+    FALLBACK_BATCH_MAX_ITEMS: int = 10000
+
+    # LLM 입력 토큰 예산 (고정 프롬프트 + 이력서, 직군별 재정의: "pm=10000,designer=11000")
+    LLM_INPUT_TOKEN_BUDGET: int = 12000
+    LLM_INPUT_TOKEN_BUDGET_BY_ROLE: str = ""
+
     # Application Settings
     DEBUG: bool = False
     SECRET_KEY: str = ""
@@ -22,6 +124,14 @@ class Settings(BaseSettings):
     def allowed_origins_list(self) -> List[str]:
         """Convert ALLOWED_ORIGINS string to list."""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+
+    def input_token_budget(self, role: str) -> int:
+        """직군별 LLM 입력 토큰 예산 (LLM_INPUT_TOKEN_BUDGET_BY_ROLE 우선)."""
+        for item in self.LLM_INPUT_TOKEN_BUDGET_BY_ROLE.split(","):
+            name, _, value = item.partition("=")
+            if name.strip() == role and value.strip():
+                return int(value)
+        return self.LLM_INPUT_TOKEN_BUDGET
     
     class Config:
         env_file = ".env"
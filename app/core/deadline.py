@@ -0,0 +1,148 @@
+"""
+요청 마감 시각(deadline) 전파.
+
+요청마다 마감 시각을 contextvar에 두고, 엔드포인트 아래의 LLM·임베딩 호출이
+남은 시간만큼만 기다리도록 함 (OpenAI 요청 타임아웃, 업스트림 제한기 대기 상한).
+
+- DeadlineMiddleware: HTTP 요청마다 REQUEST_DEADLINE_SECONDS(또는 더 짧은
+  X-Request-Timeout 헤더 값) 뒤를 마감 시각으로 설정
+- deadline_scope: 코드 일부에 마감 시각 지정 (기본은 바깥 마감과 더 이른 쪽)
+- 마감이 지나면 DeadlineExceededError → API는 504 응답
+
+contextvar라서 asyncio 태스크에는 자동으로 전달되지만, 스레드 풀에서 실행할 때는
+contextvars.copy_context()로 넘겨야 함.
+"""
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Iterator, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+TIMEOUT_HEADER = b"x-request-timeout"
+
+
+class DeadlineExceededError(Exception):
+    """요청 마감 시각이 지나 더 기다릴 수 없음 (HTTP 504로 응답)."""
+
+    def __init__(self, message: str = "요청 처리 시간이 초과되었습니다."):
+        super().__init__(message)
+
+
+def current_deadline() -> Optional[float]:
+    """현재 마감 시각 (time.monotonic 기준, 없으면 None)."""
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """마감까지 남은 시간(초). 마감이 없으면 None, 지났으면 0."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def check_deadline() -> None:
+    """마감이 지났으면 DeadlineExceededError."""
+    if remaining() == 0.0:
+        raise DeadlineExceededError()
+
+
+def raise_if_expired(cause: Optional[BaseException] = None) -> None:
+    """
+    마감이 지났으면 cause를 DeadlineExceededError로 바꿔 던짐.
+
+    타임아웃으로 실패한 호출을 기본값으로 삼키기 전에 호출.
+    """
+    if remaining() == 0.0:
+        raise DeadlineExceededError() from cause
+
+
+def request_timeout() -> Dict[str, float]:
+    """
+    OpenAI SDK 요청 인자로 넘길 타임아웃 ({"timeout": 남은 시간}, 마감이 없으면 빈 dict).
+
+    Raises:
+        DeadlineExceededError: 이미 마감이 지남
+    """
+    left = remaining()
+    if left is None:
+        return {}
+    if left == 0.0:
+        raise DeadlineExceededError()
+    return {"timeout": left}
+
+
+async def wait_within_deadline(awaitable: Awaitable[T]) -> T:
+    """마감 안에 끝나지 않으면 취소하고 DeadlineExceededError."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceededError() from None
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float], inherit: bool = True) -> Iterator[Optional[float]]:
+    """
+    블록 안의 마감 시각을 지금부터 seconds 뒤로 지정.
+
+    Args:
+        seconds: 마감까지 시간(초). None이나 0 이하면 마감 없음 (inherit=True면 바깥 마감 유지)
+        inherit: True면 바깥 마감과 비교해 더 이른 쪽 사용,
+                 False면 바깥 마감을 무시 (배치 항목·백그라운드 작업처럼 요청과 수명이 다른 경우)
+
+    Yields:
+        적용된 마감 시각 (없으면 None)
+    """
+    deadline = time.monotonic() + seconds if seconds and seconds > 0 else None
+    outer = _deadline.get()
+    if inherit and outer is not None:
+        deadline = outer if deadline is None else min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def _header_timeout(scope: dict) -> Optional[float]:
+    """X-Request-Timeout 헤더 값(초). 없거나 잘못된 값이면 None."""
+    for name, value in scope.get("headers", []):
+        if name == TIMEOUT_HEADER:
+            try:
+                seconds = float(value.decode("latin-1"))
+            except ValueError:
+                return None
+            return seconds if seconds > 0 else None
+    return None
+
+
+class DeadlineMiddleware:
+    """
+    HTTP 요청마다 마감 시각을 설정하는 ASGI 미들웨어.
+
+    REQUEST_DEADLINE_SECONDS(0이면 없음)와 X-Request-Timeout 헤더 중 짧은 쪽을 사용.
+    스트리밍 응답 본문도 같은 마감 안에서 생성됨.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        seconds = settings.REQUEST_DEADLINE_SECONDS if settings.REQUEST_DEADLINE_SECONDS > 0 else None
+        header = _header_timeout(scope)
+        if header is not None:
+            seconds = header if seconds is None else min(seconds, header)
+        with deadline_scope(seconds, inherit=False):
+            await self.app(scope, receive, send)
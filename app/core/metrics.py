@@ -0,0 +1,270 @@
+"""
+Prometheus 지표.
+
+GET /metrics로 노출 (prometheus-client는 requirements.txt에 포함). 패키지 없이 실행하거나
+METRICS_ENABLED=False이면 지표 기록은 아무 일도 하지 않고 /metrics는 503.
+
+요청 처리 중 직접 기록하는 지표:
+- navik_http_request_duration_seconds{method, endpoint, role, status}: 엔드포인트별 전체 처리 시간
+  (스트리밍은 본문 끝까지, role은 경로의 직군이며 본문으로 직군을 받는 엔드포인트는 "none")
+- navik_llm_request_duration_seconds{role, mode, outcome}: LLM 호출 시간 (제한기 대기·재시도 포함)
+- navik_llm_parse_duration_seconds{role, outcome}: LLM 응답 JSON 파싱 시간
+- navik_embedding_request_duration_seconds{provider, outcome}: 임베딩 제공자 호출 시간
+- navik_llm_request_tokens{role, type}: 요청당 prompt/completion/cached 토큰 수
+- navik_resume_tokens{role}: 예산 적용 전 이력서 토큰 수
+- navik_upstream_errors_total{upstream, error}: OpenAI 호출 실패 (시도 단위, 예외 클래스별)
+- navik_degraded_scores_total{role, error}: 오류로 기본 점수(degraded)를 반환한 평가 수
+
+기존 통계 함수에서 수집 시점에 읽는 지표 (StatsCollector):
+캐시 적중률(KPI·임베딩), 업스트림 제한기 상태, 헤징 통계, 상태별 작업 수.
+
+uvicorn --workers처럼 여러 프로세스로 실행하면 프로세스마다 값이 따로 집계됨.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Collection, Iterator, Tuple
+
+from app.core.config import settings
+
+try:
+    import prometheus_client
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # 선택 의존성
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+PARSE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+METRICS_PATH = "/metrics"
+
+
+def metrics_available() -> bool:
+    """지표를 기록·노출하는지 (METRICS_ENABLED이고 prometheus_client 설치됨)."""
+    return settings.METRICS_ENABLED and prometheus_client is not None
+
+
+class _NoopMetric:
+    """지표를 쓰지 않을 때 대신 쓰는 빈 지표."""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+
+_NOOP = _NoopMetric()
+
+
+def _histogram(name: str, documentation: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+    if not metrics_available():
+        return _NOOP
+    return prometheus_client.Histogram(name, documentation, labels, buckets=buckets)
+
+
+def _counter(name: str, documentation: str, labels: Tuple[str, ...]):
+    if not metrics_available():
+        return _NOOP
+    return prometheus_client.Counter(name, documentation, labels)
+
+
+REQUEST_LATENCY = _histogram(
+    "navik_http_request_duration_seconds", "HTTP 요청 처리 시간(초)",
+    ("method", "endpoint", "role", "status"), LATENCY_BUCKETS,
+)
+LLM_LATENCY = _histogram(
+    "navik_llm_request_duration_seconds", "LLM KPI 평가 호출 시간(초)",
+    ("role", "mode", "outcome"), LATENCY_BUCKETS,
+)
+LLM_PARSE_LATENCY = _histogram(
+    "navik_llm_parse_duration_seconds", "LLM 응답 JSON 파싱 시간(초)",
+    ("role", "outcome"), PARSE_BUCKETS,
+)
+EMBEDDING_LATENCY = _histogram(
+    "navik_embedding_request_duration_seconds", "임베딩 제공자 호출 시간(초)",
+    ("provider", "outcome"), LATENCY_BUCKETS,
+)
+LLM_TOKENS = _histogram(
+    "navik_llm_request_tokens", "LLM 요청 1건의 토큰 수",
+    ("role", "type"), TOKEN_BUCKETS,
+)
+RESUME_TOKENS = _histogram(
+    "navik_resume_tokens", "입력 예산 적용 전 이력서 토큰 수",
+    ("role",), TOKEN_BUCKETS,
+)
+UPSTREAM_ERRORS = _counter(
+    "navik_upstream_errors", "OpenAI 호출 실패 수 (재시도 포함, 예외 클래스별)",
+    ("upstream", "error"),
+)
+DEGRADED_SCORES = _counter(
+    "navik_degraded_scores", "오류로 기본 점수(degraded)를 반환한 LLM 평가 수",
+    ("role", "error"),
+)
+
+
+@contextmanager
+def timed(metric, **labels) -> Iterator[None]:
+    """블록 실행 시간을 metric에 기록 (outcome: 정상 종료면 "ok", 예외면 "error")."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        metric.labels(outcome=outcome, **labels).observe(time.perf_counter() - start)
+
+
+def record_degraded(role: str, error: str) -> None:
+    """기본 점수(degraded)로 대체한 평가 1건 기록."""
+    DEGRADED_SCORES.labels(role=role or "unknown", error=error or "Error").inc()
+
+
+def _request_role(scope: dict, roles: Collection[str]) -> str:
+    """경로의 직군 ({role} 경로 변수 또는 /analyze/backend 같은 고정 경로의 마지막 부분, roles에 없으면 "none")."""
+    role = str((scope.get("path_params") or {}).get("role", "")).lower()
+    if not role:
+        route = scope.get("route")
+        role = getattr(route, "path", "").rstrip("/").rsplit("/", 1)[-1]
+    return role if role in roles else "none"
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청별 처리 시간을 기록하는 ASGI 미들웨어.
+
+    endpoint 라벨은 실제 경로가 아닌 라우트 경로 템플릿(/api/kpi/jobs/{job_id})이라
+    라벨 종류가 라우트 수로 제한됨. role 라벨도 생성 시 받은 직군 목록(roles)으로만 제한.
+    """
+
+    def __init__(self, app, roles: Collection[str] = ()):
+        self.app = app
+        self.roles = frozenset(roles)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH or not metrics_available():
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                endpoint=getattr(route, "path", None) or "unmatched",
+                role=_request_role(scope, self.roles),
+                status=str(status),
+            ).observe(time.perf_counter() - start)
+
+
+class StatsCollector:
+    """수집 시점에 기존 통계 함수(캐시·제한기·헤징·작업)를 읽어 지표로 변환."""
+
+    def describe(self):
+        # 등록 시 collect를 호출하지 않도록 (통계 모듈은 수집 시점에 import)
+        return []
+
+    def collect(self):
+        for source in (self._cache_metrics, self._upstream_metrics, self._hedge_metrics, self._job_metrics):
+            try:
+                yield from source()
+            except Exception as e:
+                logger.warning("metrics collection failed source=%s: %s", source.__name__, e)
+
+    def _cache_metrics(self):
+        from app.ai.embedding import get_embedding_cache_stats
+        from app.domains.kpi.scorer import get_kpi_cache_stats
+
+        hits = CounterMetricFamily("navik_cache_hits", "캐시 적중 수", labels=["cache"])
+        misses = CounterMetricFamily("navik_cache_misses", "캐시 미스 수", labels=["cache"])
+        coalesced = CounterMetricFamily("navik_cache_coalesced", "병합된 동시 캐시 미스 요청 수", labels=["cache"])
+        ratio = GaugeMetricFamily("navik_cache_hit_ratio", "캐시 적중률 (프로세스 시작 이후)", labels=["cache"])
+        for name, stats in (("kpi", get_kpi_cache_stats()), ("embedding", get_embedding_cache_stats())):
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            coalesced.add_metric([name], stats["coalesced"])
+            ratio.add_metric([name], stats["hit_ratio"])
+        yield from (hits, misses, coalesced, ratio)
+
+    def _upstream_metrics(self):
+        from app.ai.rate_limit import get_rate_limit_stats
+
+        stats = get_rate_limit_stats()
+        counters = {
+            "requests": "제한기를 거친 호출 시도 수",
+            "throttled": "RPM/TPM 버킷 때문에 기다린 호출 수",
+            "rate_limited": "429 응답 수",
+            "retries": "재시도 수",
+            "rejected": "대기 상한 초과로 포기한 호출 수 (503)",
+        }
+        gauges = {
+            "concurrency_limit": "현재 AIMD 동시성 한도",
+            "in_flight": "진행 중인 호출 수",
+            "queued": "동시성 슬롯 대기 중인 호출 수",
+            "blocked_for": "429 쿨다운 남은 시간(초)",
+        }
+        for key, doc in counters.items():
+            family = CounterMetricFamily(f"navik_upstream_{key}", doc, labels=["upstream"])
+            for name, snapshot in stats.items():
+                family.add_metric([name], snapshot[key])
+            yield family
+        for key, doc in gauges.items():
+            family = GaugeMetricFamily(f"navik_upstream_{key}", doc, labels=["upstream"])
+            for name, snapshot in stats.items():
+                family.add_metric([name], snapshot[key])
+            yield family
+
+    def _hedge_metrics(self):
+        from app.ai.hedging import get_hedge_stats
+
+        stats = get_hedge_stats()
+        requests = CounterMetricFamily("navik_hedge_requests", "헤징 대상 LLM 요청 수", labels=["kind"])
+        hedged = CounterMetricFamily("navik_hedge_sent", "보낸 헤지 요청 수", labels=["kind"])
+        wins = CounterMetricFamily("navik_hedge_wins", "헤지 요청이 먼저 끝난 수", labels=["kind"])
+        p95 = GaugeMetricFamily("navik_hedge_p95_seconds", "최근 LLM 지연 시간 p95(초)", labels=["kind"])
+        for kind, data in stats.items():
+            requests.add_metric([kind], data["requests"])
+            hedged.add_metric([kind], data["hedged"])
+            wins.add_metric([kind], data["hedge_wins"])
+            if data["p95_seconds"] is not None:
+                p95.add_metric([kind], data["p95_seconds"])
+        yield from (requests, hedged, wins, p95)
+
+    def _job_metrics(self):
+        # 작업 대기열을 쓰지 않는 프로세스에서 DB 파일을 새로 만들지 않음
+        if not os.path.exists(settings.JOB_STORE_PATH):
+            return
+        from app.models.job import get_job_store
+
+        counts = get_job_store().counts()
+        jobs = GaugeMetricFamily("navik_jobs", "상태별 분석 작업 수", labels=["status"])
+        for status in ("queued", "running", "succeeded", "failed"):
+            jobs.add_metric([status], counts.get(status, 0))
+        yield jobs
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus 텍스트 형식 본문과 Content-Type."""
+    return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
+
+
+if metrics_available():
+    prometheus_client.REGISTRY.register(StatsCollector())
+elif settings.METRICS_ENABLED:
+    logger.warning("prometheus_client가 없어 지표를 기록하지 않습니다 (pip install prometheus-client).")
@@ -4,20 +4,12 @@
 설문 기반으로 KPI 점수를 계산하는 폴백 로직.
 이력서에 근거가 부족한 KPI(basis="none")에 대해 사용.
 """
-from typing import Dict, List
+from typing import Dict
 
+from app.domains.kpi.fallback_engine import CHOICE_TO_SCORE, register_fallback_engine  # noqa: F401
 from app.domains.kpi.kpi_constants import BE_KPI_NAMES
 
 
-# 선택값(1~5) → 점수(0~100) 변환
-CHOICE_TO_SCORE = {
-    1: 0,
-    2: 25,
-    3: 50,
-    4: 75,
-    5: 100
-}
-
 # 질문별 KPI 가중치 매핑
 # Q_B1: 장애/문제 해결 상황
 Q_B1_WEIGHTS = {
@@ -61,6 +53,14 @@ Q_B5_WEIGHTS = {
 }
 
 
+# 질문별 가중치 → 5×10 정규화 가중치 행렬 (import 시 1회 생성)
+ENGINE = register_fallback_engine(
+    "backend",
+    [Q_B1_WEIGHTS, Q_B2_WEIGHTS, Q_B3_WEIGHTS, Q_B4_WEIGHTS, Q_B5_WEIGHTS],
+    BE_KPI_NAMES,
+)
+
+
 def calculate_fallback_scores(
     q_b1: int,
     q_b2: int,
@@ -84,69 +84,4 @@ def calculate_fallback_scores(
             }
         }
     """
-    # 선택값 → 점수 변환
-    scores = {
-        "q_b1": CHOICE_TO_SCORE.get(q_b1, 50),
-        "q_b2": CHOICE_TO_SCORE.get(q_b2, 50),
-        "q_b3": CHOICE_TO_SCORE.get(q_b3, 50),
-        "q_b4": CHOICE_TO_SCORE.get(q_b4, 50),
-        "q_b5": CHOICE_TO_SCORE.get(q_b5, 50),
-    }
-    
-    # KPI별 가중치 합산
-    # { kpi_id: [(점수, 가중치), ...] }
-    kpi_contributions: Dict[int, List[tuple]] = {i: [] for i in range(1, 11)}
-    
-    # Q_B1 기여
-    for kpi_id, weight in Q_B1_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b1"], weight))
-    
-    # Q_B2 기여
-    for kpi_id, weight in Q_B2_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b2"], weight))
-    
-    # Q_B3 기여
-    for kpi_id, weight in Q_B3_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b3"], weight))
-    
-    # Q_B4 기여
-    for kpi_id, weight in Q_B4_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b4"], weight))
-    
-    # Q_B5 기여
-    for kpi_id, weight in Q_B5_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b5"], weight))
-    
-    # KPI별 최종 점수 계산 (가중 평균)
-    results = {}
-    for kpi_id in range(1, 11):
-        contributions = kpi_contributions[kpi_id]
-        
-        if contributions:
-            # 가중 평균 계산
-            total_weight = sum(w for _, w in contributions)
-            weighted_sum = sum(s * w for s, w in contributions)
-            final_score = round(weighted_sum / total_weight) if total_weight > 0 else 50
-        else:
-            # 해당 KPI에 기여하는 질문이 없는 경우 (현재 설계상 없음)
-            final_score = 50
-        
-        # 0~100 범위 제한
-        final_score = max(0, min(100, final_score))
-        
-        # 레벨 결정 (75~100: 상, 50~74: 중, 0~49: 하)
-        if final_score >= 75:
-            level = "high"
-        elif final_score >= 50:
-            level = "mid"
-        else:
-            level = "low"
-        
-        results[kpi_id] = {
-            "score": final_score,
-            "level": level,
-            "kpi_name": BE_KPI_NAMES.get(kpi_id, f"KPI {kpi_id}"),
-            "source": "fallback"
-        }
-    
-    return results
+    return ENGINE.score(q_b1, q_b2, q_b3, q_b4, q_b5)
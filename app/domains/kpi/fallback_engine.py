@@ -0,0 +1,177 @@
+"""
+설문 기반 KPI 폴백 계산 공통 엔진.
+
+직군별 fallback_*.py의 질문별 KPI 가중치(Q_B1~Q_B5_WEIGHTS)를
+5×10 가중치 행렬로 한 번만 변환하고, 각 열(KPI)을 가중치 합으로 나눠 정규화해 둠.
+→ KPI 점수 = 응답 점수 벡터(1×5) · 정규화 행렬(5×10) (가중 평균과 동일)
+응답 N건은 (N×5) · (5×10) 행렬곱 한 번으로 계산.
+
+응답 조합은 5^5 = 3125가지뿐이므로 엔진 생성 시 모든 조합의 점수를
+(3125, 10) uint8 표(약 31KB)로 미리 계산해 두고, 범위 안 응답은 표 조회로 처리함.
+"""
+import importlib
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+QUESTION_COUNT = 5
+KPI_COUNT = 10
+CHOICE_COUNT = 5
+COMBINATION_COUNT = CHOICE_COUNT ** QUESTION_COUNT
+
+# 응답 [q1..q5] → 조회표 행 번호 (5진수, q1이 최상위 자리)
+_PLACE_VALUES = CHOICE_COUNT ** np.arange(QUESTION_COUNT - 1, -1, -1, dtype=np.int64)
+
+# 선택값(1~5) → 점수(0~100) 변환 (범위 밖 응답은 50)
+CHOICE_TO_SCORE = {
+    1: 0,
+    2: 25,
+    3: 50,
+    4: 75,
+    5: 100
+}
+_DEFAULT_SCORE = 50
+
+
+def choice_scores(answers: np.ndarray) -> np.ndarray:
+    """선택값 배열(1~5)을 점수 배열(0~100)로 변환 (범위 밖 값은 50)."""
+    answers = np.asarray(answers)
+    valid = (answers >= 1) & (answers <= 5)
+    return np.where(valid, (answers - 1) * 25, _DEFAULT_SCORE).astype(np.float64)
+
+
+def answer_index(answers: np.ndarray) -> np.ndarray:
+    """(N, 5) 선택값(1~5) 배열의 조회표 행 번호."""
+    return (np.asarray(answers, dtype=np.int64) - 1) @ _PLACE_VALUES
+
+
+def all_answers() -> np.ndarray:
+    """조회표 행 순서의 모든 응답 조합 (3125, 5)."""
+    digits = np.arange(COMBINATION_COUNT, dtype=np.int64)[:, None] // _PLACE_VALUES % CHOICE_COUNT
+    return digits + 1
+
+
+def _weighted_scores(answers: np.ndarray, weights: np.ndarray, covered: np.ndarray) -> np.ndarray:
+    """(N, 5) 응답의 (N, 10) 정수 점수 (가중 평균 반올림, 기여 질문 없는 KPI는 50)."""
+    weighted = choice_scores(answers) @ weights
+    # 부동소수 오차로 x.5 경계가 어긋나지 않도록 정리한 뒤 반올림 (파이썬 round와 같은 half-even)
+    scores = np.rint(np.round(weighted, 9))
+    scores[:, ~covered] = _DEFAULT_SCORE
+    return np.clip(scores, 0, 100).astype(np.int64)
+
+
+def level_of(score: int) -> str:
+    """폴백 점수 레벨 (75~100: 상, 50~74: 중, 0~49: 하)."""
+    if score >= 75:
+        return "high"
+    if score >= 50:
+        return "mid"
+    return "low"
+
+
+@dataclass(frozen=True)
+class FallbackEngine:
+    """
+    직군별 폴백 점수 계산기.
+
+    weights: (5, 10) 열 합이 1이 되도록 정규화한 가중치 행렬
+    covered: (10,) 기여 질문이 하나라도 있는 KPI (없으면 50점)
+    table: (3125, 10) uint8 모든 응답 조합의 점수 (행 번호: answer_index)
+    """
+    role: str
+    weights: np.ndarray
+    covered: np.ndarray
+    table: np.ndarray
+    kpi_names: Dict[int, str]
+
+    @classmethod
+    def from_weights(
+        cls,
+        role: str,
+        question_weights: Sequence[Dict[int, float]],
+        kpi_names: Dict[int, str],
+    ) -> "FallbackEngine":
+        """
+        질문별 {kpi_id: 가중치} 목록(Q_B1~Q_B5 순서)으로 엔진 생성.
+        """
+        matrix = np.zeros((QUESTION_COUNT, KPI_COUNT), dtype=np.float64)
+        for q, weights in enumerate(question_weights):
+            for kpi_id, weight in weights.items():
+                matrix[q, kpi_id - 1] += weight
+        column_sums = matrix.sum(axis=0)
+        covered = column_sums > 0
+        matrix[:, covered] /= column_sums[covered]
+        table = _weighted_scores(all_answers(), matrix, covered).astype(np.uint8)
+        for array in (matrix, covered, table):
+            array.setflags(write=False)
+        return cls(role=role, weights=matrix, covered=covered, table=table, kpi_names=kpi_names)
+
+    def score_matrix(self, answers: np.ndarray) -> np.ndarray:
+        """
+        응답 N건의 KPI 점수 행렬 계산.
+
+        Args:
+            answers: (N, 5) 선택값(1~5) 배열
+
+        Returns:
+            (N, 10) 정수 점수(0~100) 배열 (열 순서: KPI 1~10)
+        """
+        answers = np.asarray(answers, dtype=np.int64)
+        if answers.size and answers.min() >= 1 and answers.max() <= CHOICE_COUNT:
+            return self.table[answer_index(answers)].astype(np.int64)
+        # 범위 밖 응답이 섞이면 (내부 호출 등) 직접 계산
+        return _weighted_scores(answers, self.weights, self.covered)
+
+    def score(self, q_b1: int, q_b2: int, q_b3: int, q_b4: int, q_b5: int) -> Dict[int, Dict[str, any]]:
+        """
+        설문 응답 1건의 KPI 점수 (calculate_fallback_scores 반환 형식).
+
+        Returns:
+            {kpi_id: {"score", "level", "kpi_name", "source": "fallback"}}
+        """
+        row = self.score_row(q_b1, q_b2, q_b3, q_b4, q_b5)
+        return {
+            kpi_id: {
+                "score": score,
+                "level": level_of(score),
+                "kpi_name": self.kpi_names.get(kpi_id, f"KPI {kpi_id}"),
+                "source": "fallback",
+            }
+            for kpi_id, score in enumerate(row, start=1)
+        }
+
+    def score_row(self, q_b1: int, q_b2: int, q_b3: int, q_b4: int, q_b5: int) -> List[int]:
+        """설문 응답 1건의 KPI 1~10 점수 (범위 안 응답은 조회표 한 번 조회)."""
+        answers = (q_b1, q_b2, q_b3, q_b4, q_b5)
+        if all(1 <= q <= CHOICE_COUNT for q in answers):
+            index = (((q_b1 - 1) * 5 + q_b2 - 1) * 5 + q_b3 - 1) * 5 + q_b4 - 1
+            return self.table[index * 5 + q_b5 - 1].tolist()
+        return self.score_matrix(np.array([answers]))[0].tolist()
+
+    def score_batch(self, answers: Sequence[Sequence[int]]) -> List[List[int]]:
+        """응답 N건의 KPI 점수 (행: 응답, 열: KPI 1~10)."""
+        if not len(answers):
+            return []
+        return self.score_matrix(np.asarray(answers, dtype=np.int64)).tolist()
+
+
+_ENGINES: Dict[str, FallbackEngine] = {}
+
+
+def register_fallback_engine(
+    role: str,
+    question_weights: Sequence[Dict[int, float]],
+    kpi_names: Dict[int, str],
+) -> FallbackEngine:
+    """직군 폴백 엔진을 만들어 등록 (fallback_*.py import 시 1회 호출)."""
+    engine = FallbackEngine.from_weights(role, question_weights, kpi_names)
+    _ENGINES[role] = engine
+    return engine
+
+
+def get_fallback_engine(role: str) -> FallbackEngine:
+    """등록된 직군 폴백 엔진 조회 (아직 import되지 않았으면 해당 fallback 모듈을 로드)."""
+    if role not in _ENGINES:
+        importlib.import_module(f"app.domains.kpi.fallback_{role}")
+    return _ENGINES[role]
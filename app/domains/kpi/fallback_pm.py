@@ -4,19 +4,12 @@ PM(Product Manager) KPI 폴백 계산 모듈.
 설문 기반으로 KPI 점수를 계산하는 폴백 로직.
 이력서에 근거가 부족한 KPI(basis="none")에 대해 사용.
 """
-from typing import Dict, List
+from typing import Dict
 
+from app.domains.kpi.fallback_engine import CHOICE_TO_SCORE, register_fallback_engine  # noqa: F401
 from app.domains.kpi.kpi_constants import PM_KPI_NAMES
 
 
-CHOICE_TO_SCORE = {
-    1: 0,
-    2: 25,
-    3: 50,
-    4: 75,
-    5: 100
-}
-
 # Q_PM_B1: 문제 정의 & 가설 수립
 Q_B1_WEIGHTS = {
     1: 0.40,   # 문제 정의·가설 수립
@@ -58,6 +51,14 @@ Q_B5_WEIGHTS = {
 }
 
 
+# 질문별 가중치 → 5×10 정규화 가중치 행렬 (import 시 1회 생성)
+ENGINE = register_fallback_engine(
+    "pm",
+    [Q_B1_WEIGHTS, Q_B2_WEIGHTS, Q_B3_WEIGHTS, Q_B4_WEIGHTS, Q_B5_WEIGHTS],
+    PM_KPI_NAMES,
+)
+
+
 def calculate_fallback_scores(
     q_b1: int,
     q_b2: int,
@@ -74,52 +75,4 @@ def calculate_fallback_scores(
     Returns:
         { kpi_id: { "score", "level", "kpi_name", "source" } }
     """
-    scores = {
-        "q_b1": CHOICE_TO_SCORE.get(q_b1, 50),
-        "q_b2": CHOICE_TO_SCORE.get(q_b2, 50),
-        "q_b3": CHOICE_TO_SCORE.get(q_b3, 50),
-        "q_b4": CHOICE_TO_SCORE.get(q_b4, 50),
-        "q_b5": CHOICE_TO_SCORE.get(q_b5, 50),
-    }
-
-    kpi_contributions: Dict[int, List[tuple]] = {i: [] for i in range(1, 11)}
-
-    for kpi_id, weight in Q_B1_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b1"], weight))
-    for kpi_id, weight in Q_B2_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b2"], weight))
-    for kpi_id, weight in Q_B3_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b3"], weight))
-    for kpi_id, weight in Q_B4_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b4"], weight))
-    for kpi_id, weight in Q_B5_WEIGHTS.items():
-        kpi_contributions[kpi_id].append((scores["q_b5"], weight))
-
-    results = {}
-    for kpi_id in range(1, 11):
-        contributions = kpi_contributions[kpi_id]
-
-        if contributions:
-            total_weight = sum(w for _, w in contributions)
-            weighted_sum = sum(s * w for s, w in contributions)
-            final_score = round(weighted_sum / total_weight) if total_weight > 0 else 50
-        else:
-            final_score = 50
-
-        final_score = max(0, min(100, final_score))
-
-        if final_score >= 75:
-            level = "high"
-        elif final_score >= 50:
-            level = "mid"
-        else:
-            level = "low"
-
-        results[kpi_id] = {
-            "score": final_score,
-            "level": level,
-            "kpi_name": PM_KPI_NAMES.get(kpi_id, f"KPI {kpi_id}"),
-            "source": "fallback"
-        }
-
-    return results
+    return ENGINE.score(q_b1, q_b2, q_b3, q_b4, q_b5)
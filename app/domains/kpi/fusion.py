@@ -3,4 +3,82 @@
 
 이력서 점수와 Q&A 점수를 신뢰도에 따라 가중 평균하여
 KPI별 최종 점수를 산출.
+
+- 이력서 점수(40~90)의 신뢰도는 LLM이 판단한 근거 수준(basis)으로 결정
+  explicit(명시적 언급) > inferred(간접 추론) > none(언급 없음, 설문만 사용)
+- 설문 폴백 점수(0~100)는 이력서 점수 척도(40~90)로 선형 변환한 뒤 합산
+- LLM 평가가 실패해 기본값이 들어간 KPI(degraded)는 설문 점수만 사용
 """
+from typing import Dict
+
+from app.domains.kpi.scorer import score_level
+
+# 근거 수준별 이력서 점수 가중치 (나머지는 설문 점수 가중치)
+RESUME_WEIGHT_BY_BASIS = {
+    "explicit": 0.8,
+    "inferred": 0.5,
+    "none": 0.0,
+}
+
+# 이력서 점수 척도
+RESUME_SCORE_MIN = 40
+RESUME_SCORE_MAX = 90
+
+
+def survey_to_resume_scale(survey_score: int) -> float:
+    """설문 폴백 점수(0~100)를 이력서 점수 척도(40~90)로 변환."""
+    return RESUME_SCORE_MIN + survey_score * (RESUME_SCORE_MAX - RESUME_SCORE_MIN) / 100
+
+
+def resume_weight(data: Dict[str, any]) -> float:
+    """이력서 KPI 결과 1건의 신뢰도 가중치 (degraded면 0)."""
+    if data.get("degraded"):
+        return 0.0
+    return RESUME_WEIGHT_BY_BASIS.get(data.get("basis", "explicit"), RESUME_WEIGHT_BY_BASIS["explicit"])
+
+
+def fuse_kpi_scores(
+    resume_scores: Dict[int, Dict[str, any]],
+    survey_scores: Dict[int, int],
+) -> Dict[int, Dict[str, any]]:
+    """
+    이력서 KPI 점수와 설문 폴백 점수를 신뢰도 가중 평균으로 합침.
+
+    Args:
+        resume_scores: calculate_kpi_scores 결과 {kpi_id: {"score", "basis", "kpi_name", ...}}
+        survey_scores: 설문 폴백 점수 {kpi_id: 점수(0~100)}
+
+    Returns:
+        {
+            kpi_id: {
+                "score": 최종 점수 (40~90),
+                "level": "high/mid/low",
+                "kpi_name": KPI 이름,
+                "basis": 이력서 근거 수준,
+                "resume_score": 이력서 점수 (40~90),
+                "survey_score": 설문 점수 (0~100),
+                "resume_weight": 이력서 점수 가중치 (0~1)
+            }
+        }
+    """
+    results = {}
+    for kpi_id, data in resume_scores.items():
+        survey_score = survey_scores.get(kpi_id)
+        weight = resume_weight(data)
+        if survey_score is None:
+            # 설문 점수가 없으면 이력서 점수 그대로
+            weight = 1.0
+            fused = float(data["score"])
+        else:
+            fused = weight * data["score"] + (1 - weight) * survey_to_resume_scale(survey_score)
+        score = max(RESUME_SCORE_MIN, min(RESUME_SCORE_MAX, round(fused)))
+        results[kpi_id] = {
+            "score": score,
+            "level": score_level(score),
+            "kpi_name": data["kpi_name"],
+            "basis": data.get("basis", "explicit"),
+            "resume_score": data["score"],
+            "survey_score": survey_score,
+            "resume_weight": weight,
+        }
+    return results
@@ -0,0 +1,154 @@
+"""
+증분 재분석 모듈.
+
+같은 분석 ID(analysis_id)로 수정된 이력서를 다시 제출하면
+이전 분석 스냅샷(이력서 텍스트 + KPI별 점수·근거 문장)과 줄 단위로 비교해
+근거가 바뀌었을 수 있는 KPI만 골라냄. 나머지 KPI는 이전 결과를 그대로 사용.
+
+KPI가 영향을 받는 경우:
+- 삭제·수정된 줄이나 새로 들어간 줄이 해당 KPI 근거 문장(reason)과 많이 겹침
+- 새로 들어간 줄에 KPI 이름의 핵심 단어가 등장 (근거 없던 KPI에 새 근거가 생겼을 수 있음)
+- 바뀐 줄이 전체의 INCREMENTAL_MAX_CHANGED_RATIO를 넘으면 전체 재평가
+"""
+import difflib
+import json
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.utils.cache import TieredCache, build_backend
+
+ALL_KPI_IDS = list(range(1, 11))
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+_NAME_SEPARATORS = re.compile(r"[·,/()\s]+")
+
+
+def _encode_snapshot(snapshot: Dict[str, any]) -> bytes:
+    return json.dumps(snapshot, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_snapshot(raw: bytes) -> Dict[str, any]:
+    snapshot = json.loads(raw)
+    snapshot["scores"] = {int(kpi_id): data for kpi_id, data in snapshot["scores"].items()}
+    return snapshot
+
+
+# 분석 ID별 마지막 분석 스냅샷 {"resume_text", "scores"}
+analysis_snapshots = TieredCache(
+    max_entries=settings.INCREMENTAL_SNAPSHOT_MAX_ENTRIES,
+    ttl_seconds=settings.INCREMENTAL_SNAPSHOT_TTL_SECONDS,
+    backend=build_backend("analysis_snapshots"),
+    encode=_encode_snapshot,
+    decode=_decode_snapshot,
+)
+
+
+def snapshot_key(role: str, analysis_id: str) -> str:
+    """스냅샷 키 (같은 분석 ID라도 직군별로 분리)."""
+    return f"{role}:{analysis_id}"
+
+
+async def load_snapshot(role: str, analysis_id: str) -> Optional[Dict[str, any]]:
+    """이전 분석 스냅샷 조회 (없으면 None)."""
+    return await analysis_snapshots.aget(snapshot_key(role, analysis_id))
+
+
+async def save_snapshot(
+    role: str,
+    analysis_id: str,
+    resume_text: str,
+    scores: Dict[int, Dict[str, any]],
+) -> None:
+    """
+    분석 스냅샷 저장.
+
+    Args:
+        resume_text: prepare_resume_text를 거친 이력서 텍스트
+        scores: LLM 평가 형식의 KPI별 결과 {kpi_id: {"score", "basis", "reason"}}
+    """
+    await analysis_snapshots.aset(
+        snapshot_key(role, analysis_id),
+        {"resume_text": resume_text, "scores": scores},
+    )
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """비교 단위(빈 줄을 뺀 각 줄)로 나눔. 이력서는 대부분 한 줄이 항목 하나."""
+    return [line.strip() for line in text.split("\n") if line.strip()]
+
+
+def changed_paragraphs(old_text: str, new_text: str) -> Tuple[List[str], List[str]]:
+    """
+    두 이력서의 줄 단위 차이.
+
+    Returns:
+        (이전 이력서에서 삭제·수정된 줄, 새 이력서에서 추가·수정된 줄)
+    """
+    old, new = split_paragraphs(old_text), split_paragraphs(new_text)
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    removed, added = [], []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            removed.extend(old[i1:i2])
+            added.extend(new[j1:j2])
+    return removed, added
+
+
+def _bigrams(text: str) -> Set[str]:
+    """공백·문장부호를 뺀 글자 bigram (한글은 형태소 분석 없이도 겹침을 잘 잡음)."""
+    s = _NON_WORD.sub("", text.lower())
+    return {s[i:i + 2] for i in range(len(s) - 1)}
+
+
+def evidence_overlap(evidence: str, paragraph: str) -> float:
+    """근거 문장 bigram 중 해당 줄에도 있는 비율 (0~1)."""
+    evidence_grams = _bigrams(evidence)
+    if not evidence_grams:
+        return 0.0
+    return len(evidence_grams & _bigrams(paragraph)) / len(evidence_grams)
+
+
+def _name_terms(kpi_name: str) -> List[str]:
+    """KPI 이름의 핵심 단어 (예: "REST API 설계·구현" → rest, api, 설계, 구현)."""
+    return [t.lower() for t in _NAME_SEPARATORS.split(kpi_name) if len(t) >= 2]
+
+
+def affected_kpis(
+    old_text: str,
+    new_text: str,
+    scores: Dict[int, Dict[str, any]],
+    kpi_names: Dict[int, str],
+) -> List[int]:
+    """
+    이력서 수정으로 다시 평가해야 하는 KPI 목록.
+
+    Args:
+        old_text, new_text: 이전/새 이력서 (prepare_resume_text 결과)
+        scores: 이전 분석의 KPI별 결과 (reason 사용)
+        kpi_names: {kpi_id: KPI 이름}
+
+    Returns:
+        KPI ID 오름차순 목록 (바뀐 줄이 없으면 빈 목록)
+    """
+    removed, added = changed_paragraphs(old_text, new_text)
+    if not removed and not added:
+        return []
+    total = max(len(split_paragraphs(old_text)), len(split_paragraphs(new_text)), 1)
+    if max(len(removed), len(added)) / total > settings.INCREMENTAL_MAX_CHANGED_RATIO:
+        return list(ALL_KPI_IDS)
+
+    threshold = settings.INCREMENTAL_EVIDENCE_OVERLAP
+    changed = removed + added
+    added_lower = [p.lower() for p in added]
+    affected = []
+    for kpi_id in ALL_KPI_IDS:
+        data = scores.get(kpi_id)
+        reason = (data or {}).get("reason") or ""
+        if data is None or data.get("degraded"):
+            affected.append(kpi_id)
+        elif reason and any(evidence_overlap(reason, p) >= threshold for p in changed):
+            affected.append(kpi_id)
+        elif any(term in p for term in _name_terms(kpi_names.get(kpi_id, "")) for p in added_lower):
+            affected.append(kpi_id)
+    return affected
@@ -0,0 +1,231 @@
+"""
+비동기 분석 작업(job) 처리 모듈.
+
+POST /api/kpi/jobs로 받은 abilities 분석을 SQLite 대기열(app.models.job)에 넣고,
+앱 프로세스 안의 비동기 워커(JOB_WORKERS개)가 우선순위 순서로 꺼내 실행.
+클라이언트는 GET /api/kpi/jobs/{job_id}로 조회하거나 webhook_url로 완료 알림을 받음.
+
+- 작업마다 JOB_DEADLINE_SECONDS 마감 (HTTP 요청 마감과 별개)
+- 업스트림 한도 초과·마감 초과·LLM 오류는 JOB_MAX_ATTEMPTS까지 지수 백오프로 재시도
+- 웹훅은 완료(성공·실패) 시 JSON POST, SECRET_KEY가 있으면 HMAC-SHA256 서명 헤더 포함
+- 끝난 작업은 JOB_RESULT_TTL_SECONDS 동안 보관 후 삭제
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional, Set
+
+import httpx
+
+from app.ai.rate_limit import UpstreamBusyError
+from app.core.config import settings
+from app.core.deadline import DeadlineExceededError, deadline_scope
+from app.domains.kpi.service import AnalysisFailedError, analyze_resume_abilities_strict_async
+from app.models.job import AnalysisJob, get_job_store
+
+SIGNATURE_HEADER = "X-NaviK-Signature"
+
+# 정리(보관 기간 만료·멈춘 작업 복구) 주기
+_JANITOR_INTERVAL_SECONDS = 60.0
+
+
+class JobQueueFullError(Exception):
+    """대기 중인 작업이 JOB_MAX_PENDING에 도달함."""
+
+
+def _retry_delay(attempts: int) -> float:
+    return settings.JOB_RETRY_BASE_DELAY_SECONDS * (2 ** (attempts - 1))
+
+
+def webhook_signature(body: bytes) -> Optional[str]:
+    """웹훅 본문 서명 ("sha256=<hex>", SECRET_KEY가 없으면 None)."""
+    if not settings.SECRET_KEY:
+        return None
+    digest = hmac.new(settings.SECRET_KEY.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def webhook_payload(job: AnalysisJob) -> dict:
+    """웹훅 본문 (GET /jobs/{job_id} 응답과 같은 결과 형식)."""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "role": job.role,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+    }
+
+
+class JobWorkerPool:
+    """대기열에서 작업을 꺼내 실행하는 프로세스 내 비동기 워커 묶음."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._wakeup = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+        self._webhooks: Set[asyncio.Task] = set()
+        self._http: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        self._http = httpx.AsyncClient(timeout=settings.JOB_WEBHOOK_TIMEOUT_SECONDS)
+        self._tasks.add(asyncio.create_task(self._janitor()))
+        for _ in range(self.workers):
+            self._tasks.add(asyncio.create_task(self._worker()))
+
+    async def stop(self) -> None:
+        """워커 종료. 실행 중이던 작업은 다음 시작 시 정리 작업이 다시 대기열로 되돌림."""
+        tasks = self._tasks | self._webhooks
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._webhooks.clear()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def notify(self) -> None:
+        """새 작업이 들어왔음을 대기 중인 워커에 알림."""
+        self._wakeup.set()
+
+    async def _worker(self) -> None:
+        store = get_job_store()
+        while True:
+            self._wakeup.clear()
+            job = await asyncio.to_thread(store.claim_next)
+            if job is None:
+                # 새 작업 알림 또는 재시도 대기 작업을 위해 주기적으로 다시 확인
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # 다른 워커도 남은 작업을 가져가도록 깨움
+            self._wakeup.set()
+            await self._run(job)
+
+    async def _run(self, job: AnalysisJob) -> None:
+        store = get_job_store()
+        try:
+            with deadline_scope(settings.JOB_DEADLINE_SECONDS, inherit=False):
+                result = await analyze_resume_abilities_strict_async(job.resume_text, job.role)
+        except asyncio.CancelledError:
+            raise
+        except (UpstreamBusyError, DeadlineExceededError, AnalysisFailedError) as e:
+            error = str(e)
+            if job.attempts < settings.JOB_MAX_ATTEMPTS:
+                delay = _retry_delay(job.attempts)
+                if isinstance(e, UpstreamBusyError):
+                    delay = max(delay, e.retry_after)
+                await asyncio.to_thread(store.retry_later, job.id, delay, error)
+                return
+            await asyncio.to_thread(store.fail, job.id, error)
+        except Exception as e:
+            await asyncio.to_thread(store.fail, job.id, f"분석 중 오류 발생: {str(e)}")
+        else:
+            await asyncio.to_thread(store.complete, job.id, result.model_dump_json())
+
+        if job.webhook_url:
+            self._schedule_webhook(job.id)
+
+    def _schedule_webhook(self, job_id: str) -> None:
+        task = asyncio.create_task(self._deliver_webhook(job_id))
+        self._webhooks.add(task)
+        task.add_done_callback(self._webhooks.discard)
+
+    async def _deliver_webhook(self, job_id: str) -> None:
+        """완료된 작업 결과를 webhook_url로 POST (2xx가 아니면 지수 백오프로 재시도)."""
+        store = get_job_store()
+        job = await asyncio.to_thread(store.get, job_id)
+        if job is None or not job.webhook_url:
+            return
+        body = json.dumps(webhook_payload(job), ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        signature = webhook_signature(body)
+        if signature:
+            headers[SIGNATURE_HEADER] = signature
+
+        status = "failed"
+        for attempt in range(settings.JOB_WEBHOOK_MAX_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(settings.JOB_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+            try:
+                response = await self._http.post(job.webhook_url, content=body, headers=headers)
+            except httpx.HTTPError:
+                continue
+            if response.is_success:
+                status = "delivered"
+                break
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                break  # 받는 쪽이 거부: 재시도해도 같음
+        await asyncio.to_thread(store.set_webhook_status, job_id, status)
+
+    async def _janitor(self) -> None:
+        """보관 기간이 지난 작업 삭제, 멈춘 running 작업을 다시 대기열로 (시도 횟수를 다 썼으면 실패)."""
+        store = get_job_store()
+        while True:
+            now = time.time()
+            # 마감 + 여유 시간이 지나도 running이면 실행하던 프로세스가 종료된 것으로 봄
+            # (JOB_MAX_ATTEMPTS를 다 쓴 작업은 재시도하지 않고 실패 처리)
+            requeued, failed = await asyncio.to_thread(
+                store.requeue_stale, now - 2 * settings.JOB_DEADLINE_SECONDS, settings.JOB_MAX_ATTEMPTS
+            )
+            for job_id in failed:
+                self._schedule_webhook(job_id)
+            await asyncio.to_thread(store.purge_finished, now - settings.JOB_RESULT_TTL_SECONDS)
+            if requeued:
+                self.notify()
+            await asyncio.sleep(_JANITOR_INTERVAL_SECONDS)
+
+
+_pool: Optional[JobWorkerPool] = None
+
+
+async def start_job_workers() -> None:
+    """앱 시작 시 작업 워커 시작 (JOB_WORKERS=0이면 이 프로세스는 작업을 실행하지 않음)."""
+    global _pool
+    if settings.JOB_WORKERS <= 0 or _pool is not None:
+        return
+    _pool = JobWorkerPool(settings.JOB_WORKERS)
+    await _pool.start()
+
+
+async def stop_job_workers() -> None:
+    """앱 종료 시 작업 워커 정리."""
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
+
+
+async def submit_job_async(
+    resume_text: str,
+    role: str,
+    priority: str = "normal",
+    webhook_url: Optional[str] = None,
+) -> AnalysisJob:
+    """
+    분석 작업을 대기열에 추가.
+
+    Raises:
+        JobQueueFullError: 끝나지 않은 작업이 JOB_MAX_PENDING개 이상
+    """
+    store = get_job_store()
+    if await asyncio.to_thread(store.pending_count) >= settings.JOB_MAX_PENDING:
+        raise JobQueueFullError(f"작업 대기열이 가득 찼습니다 (최대 {settings.JOB_MAX_PENDING}건).")
+    job = await asyncio.to_thread(store.submit, role, resume_text, priority, webhook_url)
+    if _pool is not None:
+        _pool.notify()
+    return job
+
+
+async def get_job_async(job_id: str) -> Optional[AnalysisJob]:
+    """작업 조회 (없거나 보관 기간이 지나 삭제됐으면 None)."""
+    return await asyncio.to_thread(get_job_store().get, job_id)
+
+
+async def queue_position_async(job: AnalysisJob) -> int:
+    """대기 중인 작업 앞에 남은 작업 수."""
+    return await asyncio.to_thread(get_job_store().queue_position, job)
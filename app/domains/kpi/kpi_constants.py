@@ -4,6 +4,9 @@ KPI 상수 정의.
 백엔드/프론트엔드/PM/디자이너 KPI ID와 이름 매핑을 하드코딩으로 관리.
 """
 
+# 지원 직무
+ALLOWED_ROLES = {"backend", "frontend", "pm", "designer"}
+
 # 백엔드 KPI ID → 이름 매핑
 BE_KPI_NAMES = {
     1: "백엔드 기술 역량",
@@ -1,17 +1,65 @@
 """
 KPI domain API routes.
 """
-from fastapi import APIRouter, HTTPException
-
-from app.domains.kpi.service import analyze_resume, analyze_resume_abilities
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.ai.embedding import max_dimensions
+from app.ai.rate_limit import UpstreamBusyError
+from app.ai.embedding_codec import (
+    EMBEDDING_FORMATS,
+    EMBEDDING_QUANTIZATIONS,
+    MSGPACK_MEDIA_TYPE,
+    pack_msgpack,
+    wants_msgpack,
+)
+from app.core.config import settings
+from app.core.deadline import DeadlineExceededError
+from app.domains.kpi.jobs import (
+    JobQueueFullError,
+    get_job_async,
+    queue_position_async,
+    submit_job_async,
+)
+from app.domains.kpi.kpi_constants import ALLOWED_ROLES
+from app.domains.kpi.service import (
+    analyze_resume_async,
+    analyze_resume_abilities_async,
+    analyze_resume_abilities_encoded_async,
+    analyze_batch_async,
+    analyze_resume_multi_role_async,
+    analyze_resume_fused_async,
+    analyze_resume_incremental_async,
+    search_abilities_async,
+    store_abilities_async,
+    stream_analysis_events,
+)
 from app.domains.kpi.fallback_backend import calculate_fallback_scores
 from app.domains.kpi.fallback_frontend import calculate_fallback_scores as calculate_frontend_fallback_scores
 from app.domains.kpi.fallback_designer import calculate_fallback_scores as calculate_designer_fallback_scores
 from app.domains.kpi.fallback_pm import calculate_fallback_scores as calculate_pm_fallback_scores
+from app.domains.kpi.fallback_engine import KPI_COUNT, get_fallback_engine, level_of
+from app.models.job import AnalysisJob
 from app.schemas.kpi import (
     ResumeAnalysisRequest,
     ResumeAnalysisResponse,
     AnalyzeAbilitiesResponse,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
+    MultiRoleAnalysisRequest,
+    MultiRoleAnalysisResponse,
+    AbilitySearchRequest,
+    AbilitySearchResponse,
+    FusionAnalysisRequest,
+    FusionAnalysisResponse,
+    IncrementalAnalysisRequest,
+    IncrementalAnalysisResponse,
+    JobSubmitRequest,
+    JobStatusResponse,
     BackendFallbackRequest,
     BackendFallbackResponse,
     FrontendFallbackRequest,
@@ -20,6 +68,8 @@ from app.schemas.kpi import (
     DesignerFallbackResponse,
     PMFallbackRequest,
     PMFallbackResponse,
+    FallbackBatchRequest,
+    FallbackBatchResponse,
     FallbackKPIScore
 )
 
@@ -37,8 +87,10 @@ async def analyze_backend_resume_endpoint(
     강점/약점 KPI를 추출합니다.
     """
     try:
-        result = analyze_resume(request.resume_text, role="backend")
+        result = await analyze_resume_async(request.resume_text, role="backend")
         return result
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
@@ -54,8 +106,10 @@ async def analyze_frontend_resume_endpoint(
     강점/약점 KPI를 추출합니다.
     """
     try:
-        result = analyze_resume(request.resume_text, role="frontend")
+        result = await analyze_resume_async(request.resume_text, role="frontend")
         return result
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
@@ -71,8 +125,10 @@ async def analyze_pm_resume_endpoint(
     강점/약점 KPI를 추출합니다.
     """
     try:
-        result = analyze_resume(request.resume_text, role="pm")
+        result = await analyze_resume_async(request.resume_text, role="pm")
         return result
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
@@ -88,37 +144,410 @@ async def analyze_designer_resume_endpoint(
     강점/약점 KPI를 추출합니다.
     """
     try:
-        result = analyze_resume(request.resume_text, role="designer")
+        result = await analyze_resume_async(request.resume_text, role="designer")
         return result
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
 
-ALLOWED_ROLES = {"backend", "frontend", "pm", "designer"}
-
-
 @router.post("/analyze/abilities/{role}", response_model=AnalyzeAbilitiesResponse)
 async def analyze_abilities_endpoint(
     role: str,
     request: ResumeAnalysisRequest,
+    background_tasks: BackgroundTasks,
+    embedding_format: str = Query(
+        default="float",
+        description="임베딩 형식: float(JSON 숫자 리스트), base64_f32, base64_f16 (리틀엔디언 바이트의 base64)",
+    ),
+    embedding_dimensions: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="임베딩 차원 (예: 256, 512). 미지정 시 EMBEDDING_DIMENSIONS 설정값",
+    ),
+    embedding_quantization: Optional[str] = Query(
+        default=None,
+        description="양자화: none, int8(벡터별 scale 포함), binary(부호 비트). 미지정 시 EMBEDDING_QUANTIZATION 설정값",
+    ),
+    candidate_id: Optional[str] = Query(
+        default=None,
+        description="지정 시 근거 문장·임베딩을 유사 검색 저장소에 이 후보자 ID로 저장",
+    ),
+    accept: Optional[str] = Header(default=None),
 ):
     """
     이력서 분석 + KPI 순서별 abilities(근거 문장·임베딩) 반환.
     
     scores와 abilities가 1:1로 같은 순서입니다.
     직무명: backend, frontend, pm, designer
+
+    ## 압축 임베딩 (선택)
+    - `embedding_format=base64_f32|base64_f16`: 임베딩을 base64 문자열로 반환
+      (응답에 embedding_dtype, embedding_dimensions 추가)
+    - `Accept: application/msgpack`: 전체 응답을 msgpack으로 반환하고 임베딩은 bin(바이트)으로 전송
+      (embedding_format을 지정하지 않으면 f32)
+
+    ## 임베딩 프로필 (선택)
+    - `embedding_dimensions`: 축소 차원 (최대값은 임베딩 모델에 따름, text-embedding-3-small은 1536)
+    - `embedding_quantization=int8`: int8 바이트 + abilities 항목별 `embedding_scale` (복원: q × scale)
+    - `embedding_quantization=binary`: 부호 비트를 8개씩 묶은 바이트 (해밍 거리로 비교)
+    - 양자화 시 임베딩은 항상 바이트(base64 또는 msgpack bin)로 전송
+
+    ## 저장 (선택)
+    - `candidate_id`를 주면 응답 후 근거 문장을 저장해 `/abilities/search`로 검색할 수 있게 합니다.
+    """
+    if role.lower() not in ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    if embedding_format not in EMBEDDING_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"embedding_format must be one of: {', '.join(EMBEDDING_FORMATS)}",
+        )
+    if embedding_dimensions is not None and embedding_dimensions > max_dimensions():
+        raise HTTPException(
+            status_code=400,
+            detail=f"embedding_dimensions must be between 1 and {max_dimensions()}",
+        )
+    quantization = embedding_quantization or settings.EMBEDDING_QUANTIZATION
+    if quantization not in EMBEDDING_QUANTIZATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"embedding_quantization must be one of: {', '.join(EMBEDDING_QUANTIZATIONS)}",
+        )
+    binary = wants_msgpack(accept)
+    dtype = EMBEDDING_QUANTIZATIONS[quantization] or EMBEDDING_FORMATS[embedding_format]
+    try:
+        if dtype is None and not binary:
+            result = await analyze_resume_abilities_async(
+                request.resume_text,
+                role=role.lower(),
+                dimensions=embedding_dimensions,
+            )
+            if candidate_id:
+                entries = [(item.kpi_id, ability.content) for item, ability in zip(result.scores, result.abilities)]
+                background_tasks.add_task(
+                    store_abilities_async, role.lower(), candidate_id, entries, embedding_dimensions
+                )
+            return result
+        # 압축 경로: pydantic 검증 없이 dict를 바로 직렬화
+        payload = await analyze_resume_abilities_encoded_async(
+            request.resume_text,
+            role=role.lower(),
+            dtype=dtype or "f32",
+            binary=binary,
+            dimensions=embedding_dimensions,
+        )
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+    if candidate_id:
+        entries = [
+            (item["kpi_id"], ability["content"])
+            for item, ability in zip(payload["scores"], payload["abilities"])
+        ]
+        background_tasks.add_task(
+            store_abilities_async, role.lower(), candidate_id, entries, embedding_dimensions
+        )
+    if binary:
+        return Response(content=pack_msgpack(payload), media_type=MSGPACK_MEDIA_TYPE)
+    return JSONResponse(content=payload)
+
+
+@router.post("/abilities/search", response_model=AbilitySearchResponse)
+async def search_abilities_endpoint(
+    request: AbilitySearchRequest,
+):
+    """
+    저장된 근거 문장 중 질의 문장과 비슷한 문장(또는 후보자) 검색.
+
+    `/analyze/abilities/{role}?candidate_id=...`로 저장된 문장을 대상으로
+    직무별 IVF 인덱스에서 코사인 유사도 상위 k개를 반환합니다.
+    `group_by_candidate=true`면 후보자별 가장 비슷한 문장 1건씩 상위 k명을 반환합니다
+    (candidate_id 없이 저장된 분석은 각각 후보자 1명으로 취급).
+    """
+    role = request.role.lower()
+    if role not in ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    if request.dimensions is not None and request.dimensions > max_dimensions():
+        raise HTTPException(
+            status_code=400,
+            detail=f"dimensions must be between 1 and {max_dimensions()}",
+        )
+    try:
+        return await search_abilities_async(
+            role,
+            request.query,
+            k=request.k,
+            kpi_id=request.kpi_id,
+            group_by_candidate=request.group_by_candidate,
+            dimensions=request.dimensions,
+        )
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"검색 중 오류 발생: {str(e)}")
+
+
+def _format_sse(event: str, data: Dict[str, any]) -> str:
+    """Server-Sent Events 메시지 1건 직렬화."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _sse_stream(events: AsyncIterator[Tuple[str, Dict[str, any]]]) -> AsyncIterator[str]:
+    """(이벤트명, 데이터) 스트림을 SSE 텍스트로 변환. 도중 오류는 error 이벤트로 전달."""
+    try:
+        async for event, data in events:
+            yield _format_sse(event, data)
+    except UpstreamBusyError as e:
+        yield _format_sse("error", {"detail": str(e), "retry_after": round(e.retry_after)})
+    except Exception as e:
+        yield _format_sse("error", {"detail": f"분석 중 오류 발생: {str(e)}"})
+
+
+def _sse_response(events: AsyncIterator[Tuple[str, Dict[str, any]]]) -> StreamingResponse:
+    return StreamingResponse(
+        _sse_stream(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/analyze/stream/{role}")
+async def analyze_stream_endpoint(
+    role: str,
+    request: ResumeAnalysisRequest,
+):
+    """
+    이력서 KPI 분석 결과를 SSE(text/event-stream)로 스트리밍.
+
+    LLM이 KPI 하나를 완성할 때마다 `score` 이벤트를 보내고,
+    모두 끝나면 `summary`(strengths/weaknesses), 마지막으로 `done`을 보냅니다.
+    직무명: backend, frontend, pm, designer
     """
     if role.lower() not in ALLOWED_ROLES:
         raise HTTPException(
             status_code=400,
             detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
         )
+    return _sse_response(stream_analysis_events(request.resume_text, role=role.lower()))
+
+
+@router.post("/analyze/abilities/stream/{role}")
+async def analyze_abilities_stream_endpoint(
+    role: str,
+    request: ResumeAnalysisRequest,
+):
+    """
+    abilities 분석 결과를 SSE(text/event-stream)로 스트리밍.
+
+    `score` 이벤트(KPI별) → `summary` → `ability` 이벤트(KPI 순서별 근거 문장·임베딩) → `done`
+    순서로 전송합니다.
+    직무명: backend, frontend, pm, designer
+    """
+    if role.lower() not in ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    return _sse_response(
+        stream_analysis_events(request.resume_text, role=role.lower(), include_abilities=True)
+    )
+
+
+@router.post("/analyze/incremental/{role}", response_model=IncrementalAnalysisResponse)
+async def analyze_incremental_endpoint(
+    role: str,
+    request: IncrementalAnalysisRequest,
+):
+    """
+    수정된 이력서 증분 재분석.
+
+    같은 analysis_id로 이전에 분석한 이력서와 줄 단위로 비교해,
+    바뀐 줄과 근거 문장이 겹치거나 새 근거가 생겼을 수 있는 KPI만 LLM으로 다시 평가하고
+    나머지 KPI는 이전 점수·근거 문장을 재사용합니다.
+    처음 보는 analysis_id이거나 많이 바뀐 경우 전체를 평가합니다.
+    직무명: backend, frontend, pm, designer
+    """
+    role = role.lower()
+    if role not in ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    try:
+        return await analyze_resume_incremental_async(
+            request.resume_text,
+            role=role,
+            analysis_id=request.analysis_id,
+            include_abilities=request.include_abilities,
+        )
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+
+
+@router.post("/analyze/fusion/{role}", response_model=FusionAnalysisResponse)
+async def analyze_fusion_endpoint(
+    role: str,
+    request: FusionAnalysisRequest,
+):
+    """
+    이력서 + 설문 융합 분석 (한 번의 요청으로 최종 점수 반환).
+
+    이력서 LLM 평가와 설문 폴백 계산을 함께 진행하고, KPI별로
+    근거 수준(basis)에 따른 신뢰도로 두 점수를 가중 평균합니다.
+
+    ## 이력서 점수 가중치 (나머지는 설문 점수)
+    - explicit: 0.8, inferred: 0.5, none: 0.0 (설문 점수만 사용)
+
+    설문 점수(0~100)는 이력서 점수 척도(40~90)로 변환해 합산합니다.
+    직무명: backend, frontend, pm, designer
+    """
+    role = role.lower()
+    if role not in ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    try:
+        return await analyze_resume_fused_async(
+            request.resume_text,
+            role=role,
+            answers=[request.q_b1, request.q_b2, request.q_b3, request.q_b4, request.q_b5],
+        )
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+
+
+@router.post("/analyze/roles", response_model=MultiRoleAnalysisResponse)
+async def analyze_multi_role_endpoint(
+    request: MultiRoleAnalysisRequest,
+):
+    """
+    이력서 1건을 여러 직무 기준으로 동시에 분석.
+
+    직무별 평가를 병렬로 실행하므로 4개 직무를 요청해도
+    한 직무 분석과 비슷한 시간에 응답합니다.
+    결과는 직무명을 키로 반환됩니다.
+    """
+    roles = [role.lower() for role in request.roles]
+    invalid = [role for role in roles if role not in ALLOWED_ROLES]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    try:
+        return await analyze_resume_multi_role_async(
+            request.resume_text,
+            roles=roles,
+            include_abilities=request.include_abilities,
+        )
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+
+
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch_endpoint(
+    request: BatchAnalysisRequest,
+):
+    """
+    여러 이력서를 한 번에 분석 (직무 혼합 가능).
+
+    항목들은 max_concurrency 이내로 동시에 평가되며, rate limit 발생 시
+    배치 전체가 잠시 쉬었다가 재시도합니다.
+    결과는 요청 순서대로 항목별 성공(result)/실패(error)로 반환됩니다.
+    """
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"items는 최대 {settings.BATCH_MAX_ITEMS}개까지 요청할 수 있습니다.",
+        )
     try:
-        return analyze_resume_abilities(request.resume_text, role=role.lower())
+        return await analyze_batch_async(
+            request.items,
+            include_abilities=request.include_abilities,
+            max_concurrency=request.max_concurrency,
+        )
+    except (UpstreamBusyError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
 
+# ===== 비동기 분석 작업 API =====
+
+def _job_response(job: AnalysisJob, queue_position: int = 0) -> JobStatusResponse:
+    """저장된 작업을 조회 응답으로 변환."""
+    return JobStatusResponse(
+        job_id=job.id,
+        status=job.status,
+        role=job.role,
+        priority=job.priority,
+        attempts=job.attempts,
+        queue_position=queue_position,
+        created_at=datetime.fromtimestamp(job.created_at, timezone.utc),
+        started_at=datetime.fromtimestamp(job.started_at, timezone.utc) if job.started_at else None,
+        finished_at=datetime.fromtimestamp(job.finished_at, timezone.utc) if job.finished_at else None,
+        result=AnalyzeAbilitiesResponse.model_validate_json(job.result) if job.result else None,
+        error=job.error,
+        webhook_status=job.webhook_status,
+    )
+
+
+@router.post("/jobs", response_model=JobStatusResponse, status_code=202)
+async def submit_job_endpoint(
+    request: JobSubmitRequest,
+):
+    """
+    abilities 분석 작업 등록 (결과를 기다리지 않고 바로 job_id 반환).
+
+    작업은 서버 내 워커가 우선순위(high → normal → low) 순서로 처리합니다.
+    `GET /api/kpi/jobs/{job_id}`로 상태·결과를 조회하거나,
+    webhook_url을 주면 완료 시 결과를 POST로 받습니다.
+    """
+    role = request.role.lower()
+    if role not in ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    try:
+        job = await submit_job_async(
+            request.resume_text,
+            role=role,
+            priority=request.priority,
+            webhook_url=request.webhook_url,
+        )
+        return _job_response(job, await queue_position_async(job))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"작업 등록 중 오류 발생: {str(e)}")
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_endpoint(job_id: str):
+    """분석 작업 상태·결과 조회 (끝난 작업은 JOB_RESULT_TTL_SECONDS 동안 보관)."""
+    job = await get_job_async(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _job_response(job, await queue_position_async(job))
+
+
 # ===== 폴백 API =====
 
 @router.post("/fallback/backend", response_model=BackendFallbackResponse)
@@ -335,3 +764,40 @@ async def pm_fallback_endpoint(
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"폴백 계산 중 오류 발생: {str(e)}")
+
+
+@router.post("/fallback/batch", response_model=FallbackBatchResponse)
+async def fallback_batch_endpoint(
+    request: FallbackBatchRequest
+):
+    """
+    설문 폴백 일괄 계산 (한 직군의 응답 여러 건).
+
+    직군별 정규화 가중치 행렬과의 행렬곱 한 번으로 모든 응답의 KPI 점수를 계산합니다.
+    결과는 응답(행) × KPI(열) 행렬로 반환되며, 열 순서는 kpi_ids를 따릅니다.
+    점수는 /fallback/{role} 단건 API와 동일합니다.
+    """
+    role = request.role.lower()
+    if role not in ALLOWED_ROLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+    if len(request.answers) > settings.FALLBACK_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"answers는 최대 {settings.FALLBACK_BATCH_MAX_ITEMS}개까지 요청할 수 있습니다.",
+        )
+    try:
+        engine = get_fallback_engine(role)
+        scores = engine.score_batch(request.answers)
+        kpi_ids = list(range(1, KPI_COUNT + 1))
+        return FallbackBatchResponse(
+            role=role,
+            kpi_ids=kpi_ids,
+            kpi_names=[engine.kpi_names.get(kpi_id, f"KPI {kpi_id}") for kpi_id in kpi_ids],
+            scores=scores,
+            levels=[[level_of(score) for score in row] for row in scores],
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"폴백 계산 중 오류 발생: {str(e)}")
@@ -3,16 +3,135 @@ KPI 점수 산출 모듈.
 
 LLM 직접 평가 방식으로 이력서 텍스트에서 
 백엔드/프론트엔드/PM/디자이너 KPI 10개에 대한 점수를 산출.
-"""
 
-from typing import Dict, List, Tuple
+평가는 temperature=0.0이므로 (직군, 프롬프트 버전, 모델, 정규화된 이력서)가
+같으면 결과도 같다고 보고, 해당 조합의 해시를 키로 LLM 결과를 캐시함.
+이력서는 직군별 입력 토큰 예산에 맞게 압축·자른 뒤 평가함.
+analysis_id를 주는 증분 재분석은 이전 분석과 비교해 바뀐 KPI만 LLM에 다시 물음.
+
+KPI_EVALUATION_STRATEGY="grouped"이면 KPI를 KPI_GROUP_SIZE개씩 묶어 동시에 평가하고
+결과를 합침. 출력 토큰이 그룹별로 나뉘어 생성되므로 전체 지연 시간이 짧아짐.
+
+대량 재채점은 calculate_kpi_scores_batch_async로 캐시에 없는 이력서를
+OpenAI Batch API(app.ai.batch)로 한꺼번에 평가하고 결과를 같은 캐시에 저장.
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
 
 from app.ai.llm_backend import evaluate_resume_kpis as evaluate_backend_kpis
 from app.ai.llm_frontend import evaluate_resume_kpis as evaluate_frontend_kpis
 from app.ai.llm_pm import evaluate_resume_kpis as evaluate_pm_kpis
 from app.ai.llm_designer import evaluate_resume_kpis as evaluate_designer_kpis
-from app.ai.prompts import normalize_reason
+from app.ai.llm_backend import evaluate_resume_kpis_async as evaluate_backend_kpis_async
+from app.ai.llm_frontend import evaluate_resume_kpis_async as evaluate_frontend_kpis_async
+from app.ai.llm_pm import evaluate_resume_kpis_async as evaluate_pm_kpis_async
+from app.ai.llm_designer import evaluate_resume_kpis_async as evaluate_designer_kpis_async
+from app.ai.llm_backend import stream_resume_kpis_async as stream_backend_kpis_async
+from app.ai.llm_frontend import stream_resume_kpis_async as stream_frontend_kpis_async
+from app.ai.llm_pm import stream_resume_kpis_async as stream_pm_kpis_async
+from app.ai.llm_designer import stream_resume_kpis_async as stream_designer_kpis_async
+from app.ai.batch import evaluate_resume_kpis_batch
+from app.ai.llm_common import LLM_MODEL, is_degraded
+from app.ai.prompts import get_prompt, normalize_reason
+from app.ai.tokens import count_tokens, fit_to_budget
+from app.ai.usage import record_resume_tokens
+from app.core.config import settings
+from app.domains.kpi.incremental import ALL_KPI_IDS, affected_kpis, load_snapshot, save_snapshot
 from app.domains.kpi.kpi_constants import get_kpi_name
+from app.utils.cache import TieredCache, build_backend
+from app.utils.singleflight import SingleFlight
+from app.utils.text_processor import compact_resume_text, normalize_resume_text
+
+# 고정 프롬프트를 빼고 이력서에 최소한 남겨 두는 토큰 수 (예산 설정이 너무 작을 때)
+MIN_RESUME_TOKENS = 1000
+
+
+def _encode_scores(scores: Dict[int, Dict[str, any]]) -> bytes:
+    return json.dumps(scores, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_scores(raw: bytes) -> Dict[int, Dict[str, any]]:
+    return {int(kpi_id): data for kpi_id, data in json.loads(raw).items()}
+
+
+# LLM 평가 결과 캐시 (메모리 LRU+TTL → CACHE_BACKEND)
+kpi_score_cache = TieredCache(
+    max_entries=settings.KPI_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.KPI_CACHE_TTL_SECONDS,
+    backend=build_backend("kpi_scores"),
+    encode=_encode_scores,
+    decode=_decode_scores,
+    enabled=settings.KPI_CACHE_ENABLED,
+)
+
+# 캐시 미스인 동일 요청(더블클릭·재시도 등)의 LLM 호출 병합
+kpi_score_flight = SingleFlight()
+
+
+def prompt_version(role: str) -> str:
+    """
+    직군별 프롬프트 버전 (컴파일된 고정 프롬프트의 해시).
+
+    프롬프트가 바뀌면 값이 달라져 이전 캐시가 자동으로 무효화됨.
+    """
+    return get_prompt(role).version
+
+
+def kpi_cache_key(resume_text: str, role: str, strategy: Optional[str] = None) -> str:
+    """
+    (직군, 프롬프트 버전, 모델, 정규화된 이력서)로 만든 캐시 키.
+
+    Args:
+        resume_text: prepare_resume_text를 거친 이력서 텍스트
+        role: 직군
+        strategy: 결과를 만든 평가 방식 (None이면 KPI_EVALUATION_STRATEGY)
+    """
+    parts = [role, prompt_version(role), LLM_MODEL, resume_text]
+    if (strategy or settings.KPI_EVALUATION_STRATEGY) == "grouped":
+        # 나눠 평가한 결과는 한 번에 평가한 결과와 다를 수 있으므로 캐시를 분리
+        parts.append(f"grouped:{settings.KPI_GROUP_SIZE}")
+    payload = "\x1f".join(parts)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def resume_token_budget(role: str) -> int:
+    """
+    이력서에 쓸 수 있는 토큰 수 (직군 입력 예산 - 고정 프롬프트 토큰).
+
+    Returns:
+        토큰 수 (입력 예산이 0 이하이면 0 = 제한 없음)
+    """
+    budget = settings.input_token_budget(role)
+    if budget <= 0:
+        return 0
+    return max(MIN_RESUME_TOKENS, budget - get_prompt(role).prefix_tokens)
+
+
+def prepare_resume_text(resume_text: str, role: str) -> str:
+    """
+    LLM에 보낼 이력서 텍스트 준비.
+
+    정규화 후 예산을 넘으면 중복 줄·상용구 섹션을 제거하고,
+    그래도 넘으면 문장 단위로 자름. 캐시 키도 이 결과로 만듦.
+    """
+    resume_text = normalize_resume_text(resume_text)
+    budget = resume_token_budget(role)
+    original_tokens = count_tokens(resume_text)
+    if budget and original_tokens > budget:
+        resume_text = fit_to_budget(resume_text, budget, compact=compact_resume_text)
+        record_resume_tokens(role, original_tokens, count_tokens(resume_text))
+    else:
+        record_resume_tokens(role, original_tokens, original_tokens)
+    return resume_text
+
+
+def get_kpi_cache_stats() -> Dict[str, any]:
+    """KPI 평가 결과 캐시 적중/미스 통계 (병합된 동시 요청 수 포함)."""
+    return {**kpi_score_cache.stats.as_dict(), "coalesced": kpi_score_flight.stats.shared}
 
 
 def calculate_kpi_scores(
@@ -32,51 +151,351 @@ def calculate_kpi_scores(
                 "score": 점수 (40~90),
                 "level": "high/mid/low",
                 "kpi_name": KPI 이름,
-                "basis": "explicit/inferred/none"
+                "basis": "explicit/inferred/none",
+                "reason": 근거 문장,
+                "degraded": LLM 오류로 기본값이 들어갔는지 여부,
+                "error": degraded일 때 실패 원인 예외 클래스명
             }
         }
     """
+    resume_text = prepare_resume_text(resume_text, role)
+    cache_key = kpi_cache_key(resume_text, role)
+    scores = kpi_score_cache.get(cache_key)
+    if scores is not None:
+        return _build_kpi_results(scores, role)
+
     # LLM으로 직접 평가
+    scores = evaluate_kpis(resume_text, role)
+
+    # 오류로 인한 기본값은 캐시하지 않음
+    if not is_degraded(scores):
+        kpi_score_cache.set(cache_key, scores)
+
+    return _build_kpi_results(scores, role)
+
+
+async def calculate_kpi_scores_async(
+    resume_text: str,
+    role: str = "backend"
+) -> Dict[int, Dict[str, any]]:
+    """
+    calculate_kpi_scores의 비동기 버전 (AsyncOpenAI 기반 평가 사용).
+
+    반환 형식은 calculate_kpi_scores와 동일.
+    """
+    resume_text = prepare_resume_text(resume_text, role)
+    scores = await _cached_scores_async(resume_text, role)
+    return _build_kpi_results(scores, role)
+
+
+async def calculate_kpi_scores_incremental_async(
+    resume_text: str,
+    role: str,
+    analysis_id: str,
+) -> Tuple[Dict[int, Dict[str, any]], List[int]]:
+    """
+    analysis_id의 이전 분석과 비교해 바뀌었을 수 있는 KPI만 다시 평가.
+
+    이전 분석이 없거나 많이 바뀌었으면 전체 평가, 같은 이력서면 LLM 호출 없이 이전 결과.
+    일부만 바뀌면 고정 프롬프트·이력서는 그대로 보내고 해당 KPI만 출력하게 해
+    (prefix 캐싱 유지) 출력 토큰과 지연 시간을 줄임.
+    오류(degraded) 없이 끝난 결과만 새 스냅샷으로 저장.
+
+    Returns:
+        (calculate_kpi_scores와 같은 형식의 결과, 이번에 LLM으로 다시 평가한 KPI ID 목록)
+    """
+    resume_text = prepare_resume_text(resume_text, role)
+    cache_key = kpi_cache_key(resume_text, role)
+    snapshot = await load_snapshot(role, analysis_id)
+    cached = await kpi_score_cache.aget(cache_key)
+
+    if cached is not None:
+        # 이미 평가한 적 있는 이력서 (되돌리기 등)
+        scores, reevaluated = cached, []
+    elif snapshot is None:
+        scores, reevaluated = await _coalesced_evaluate_async(resume_text, role, cache_key), list(ALL_KPI_IDS)
+    else:
+        kpi_names = {kpi_id: get_kpi_name(kpi_id, role=role) for kpi_id in ALL_KPI_IDS}
+        reevaluated = affected_kpis(snapshot["resume_text"], resume_text, snapshot["scores"], kpi_names)
+        if len(reevaluated) == len(ALL_KPI_IDS):
+            scores = await _coalesced_evaluate_async(resume_text, role, cache_key)
+        elif reevaluated:
+            partial = await evaluate_kpis_async(resume_text, role, kpi_ids=reevaluated)
+            scores = {**snapshot["scores"], **partial}
+        else:
+            scores = snapshot["scores"]
+
+    if not is_degraded(scores):
+        await save_snapshot(role, analysis_id, resume_text, scores)
+    return _build_kpi_results(scores, role), reevaluated
+
+
+async def calculate_kpi_scores_batch_async(
+    items: Sequence[Tuple[str, str]],
+    batch_ids: Sequence[str] = (),
+    on_submit: Optional[Callable[[str], None]] = None,
+) -> List[Dict[int, Dict[str, any]]]:
+    """
+    이력서 여러 건을 OpenAI Batch API로 채점 (대량 재채점용, 완료까지 수 분~수 시간).
+
+    캐시에 있는 이력서는 바로 쓰고, 나머지는 10개 KPI를 요청 1건으로 묶어
+    배치로 평가한 뒤 오류 없는 결과를 캐시에 저장.
+    배치 결과는 single 방식 결과이므로 single 방식 캐시 키로 조회·저장.
+
+    Args:
+        items: (이력서 텍스트, 직군) 목록
+        batch_ids, on_submit: 재시작용 이전 배치 ID·제출 콜백 (app.ai.batch.BatchClient.run 참고)
+
+    Returns:
+        입력 순서대로 calculate_kpi_scores와 같은 형식의 결과
+        (배치에서 실패한 요청은 degraded 기본값)
+
+    Raises:
+        BatchError: 배치를 제출·조회하지 못함
+    """
+    prepared = [(prepare_resume_text(text, role), role) for text, role in items]
+    keys = [kpi_cache_key(text, role, strategy="single") for text, role in prepared]
+    cached = await kpi_score_cache.aget_many(keys)
+    missing = {key: (role, text) for key, (text, role) in zip(keys, prepared) if key not in cached}
+    if missing:
+        evaluated = dict(zip(missing, await evaluate_resume_kpis_batch(list(missing.values()), batch_ids, on_submit)))
+        await kpi_score_cache.aset_many(
+            {key: scores for key, scores in evaluated.items() if not is_degraded(scores)}
+        )
+        cached.update(evaluated)
+    return [_build_kpi_results(cached[key], role) for key, (_, role) in zip(keys, prepared)]
+
+
+async def _cached_scores_async(resume_text: str, role: str) -> Dict[int, Dict[str, any]]:
+    """준비된 이력서의 LLM 평가 결과 (캐시 → 동시 요청 병합 → LLM 순서)."""
+    cache_key = kpi_cache_key(resume_text, role)
+    scores = await kpi_score_cache.aget(cache_key)
+    if scores is None:
+        scores = await _coalesced_evaluate_async(resume_text, role, cache_key)
+    return scores
+
+
+async def _coalesced_evaluate_async(resume_text: str, role: str, cache_key: str) -> Dict[int, Dict[str, any]]:
+    """같은 이력서·직군의 동시 요청은 LLM 호출 1회로 병합."""
+    return await kpi_score_flight.do(
+        cache_key, lambda: _evaluate_and_cache_async(resume_text, role, cache_key)
+    )
+
+
+def kpi_groups(
+    kpi_ids: Optional[Sequence[int]] = None,
+    strategy: Optional[str] = None,
+) -> List[Optional[List[int]]]:
+    """
+    평가 방식에 따른 LLM 호출 단위.
+
+    Args:
+        kpi_ids: 평가할 KPI (None이면 10개 전체)
+        strategy: "single" 또는 "grouped" (None이면 KPI_EVALUATION_STRATEGY)
+
+    Returns:
+        호출별 KPI 목록. single이면 [kpi_ids] 한 번, grouped면 KPI_GROUP_SIZE 이하로
+        크기를 고르게 나눈 연속 묶음 (예: 10개, 3개씩 → [1,2,3] [4,5,6] [7,8] [9,10])
+    """
+    strategy = strategy or settings.KPI_EVALUATION_STRATEGY
+    ids = list(kpi_ids) if kpi_ids is not None else list(ALL_KPI_IDS)
+    size = max(1, settings.KPI_GROUP_SIZE)
+    if strategy != "grouped" or len(ids) <= size:
+        return [kpi_ids if kpi_ids is None else ids]
+    count = -(-len(ids) // size)
+    base, extra = divmod(len(ids), count)
+    groups, start = [], 0
+    for i in range(count):
+        end = start + base + (1 if i < extra else 0)
+        groups.append(ids[start:end])
+        start = end
+    return groups
+
+
+def _evaluate_role(resume_text: str, role: str, kpi_ids: Optional[Sequence[int]]) -> Dict[int, Dict[str, any]]:
     if role == "frontend":
-        scores = evaluate_frontend_kpis(resume_text)
+        return evaluate_frontend_kpis(resume_text, kpi_ids)
+    elif role == "pm":
+        return evaluate_pm_kpis(resume_text, kpi_ids)
+    elif role == "designer":
+        return evaluate_designer_kpis(resume_text, kpi_ids)
+    return evaluate_backend_kpis(resume_text, kpi_ids)
+
+
+async def _evaluate_role_async(
+    resume_text: str,
+    role: str,
+    kpi_ids: Optional[Sequence[int]],
+) -> Dict[int, Dict[str, any]]:
+    if role == "frontend":
+        return await evaluate_frontend_kpis_async(resume_text, kpi_ids)
+    elif role == "pm":
+        return await evaluate_pm_kpis_async(resume_text, kpi_ids)
+    elif role == "designer":
+        return await evaluate_designer_kpis_async(resume_text, kpi_ids)
+    return await evaluate_backend_kpis_async(resume_text, kpi_ids)
+
+
+def evaluate_kpis(
+    resume_text: str,
+    role: str,
+    kpi_ids: Optional[Sequence[int]] = None,
+    strategy: Optional[str] = None,
+) -> Dict[int, Dict[str, any]]:
+    """
+    직군별 LLM 평가 (캐시 없이). grouped면 묶음별로 스레드에서 동시에 호출해 합침.
+
+    Returns:
+        {kpi_id: {"score", "basis", "reason"}} (실패한 묶음의 KPI는 degraded 기본값)
+    """
+    groups = kpi_groups(kpi_ids, strategy)
+    if len(groups) == 1:
+        return _evaluate_role(resume_text, role, groups[0])
+    # 요청 마감(contextvar)이 작업 스레드에도 적용되도록 호출자 컨텍스트를 복사해 실행
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        results = pool.map(
+            lambda group: context.copy().run(_evaluate_role, resume_text, role, group), groups
+        )
+        return {kpi_id: data for result in results for kpi_id, data in result.items()}
+
+
+async def evaluate_kpis_async(
+    resume_text: str,
+    role: str,
+    kpi_ids: Optional[Sequence[int]] = None,
+    strategy: Optional[str] = None,
+) -> Dict[int, Dict[str, any]]:
+    """evaluate_kpis의 비동기 버전 (grouped면 묶음별 호출을 동시에 진행)."""
+    groups = kpi_groups(kpi_ids, strategy)
+    if len(groups) == 1:
+        return await _evaluate_role_async(resume_text, role, groups[0])
+    results = await asyncio.gather(*[
+        _evaluate_role_async(resume_text, role, group) for group in groups
+    ])
+    return {kpi_id: data for result in results for kpi_id, data in result.items()}
+
+
+async def _evaluate_and_cache_async(
+    resume_text: str,
+    role: str,
+    cache_key: str
+) -> Dict[int, Dict[str, any]]:
+    """LLM 평가 후 정상 결과만 캐시에 저장 (single-flight 안에서 실행)."""
+    scores = await evaluate_kpis_async(resume_text, role)
+    if not is_degraded(scores):
+        await kpi_score_cache.aset(cache_key, scores)
+    return scores
+
+
+async def stream_kpi_scores_async(
+    resume_text: str,
+    role: str = "backend"
+) -> AsyncIterator[Tuple[int, Dict[str, any]]]:
+    """
+    KPI 점수를 LLM 스트리밍 출력에서 완성되는 순서대로 반환.
+
+    캐시 적중 시 저장된 결과를 KPI ID 순서로 즉시 반환하며,
+    스트림이 끝까지 정상 완료된 경우에만 결과를 캐시에 저장.
+
+    Yields:
+        (kpi_id, calculate_kpi_scores 결과의 항목과 같은 dict)
+    """
+    resume_text = prepare_resume_text(resume_text, role)
+    cache_key = kpi_cache_key(resume_text, role)
+    cached = await kpi_score_cache.aget(cache_key)
+    if cached is not None:
+        for kpi_id in sorted(cached):
+            yield kpi_id, _build_kpi_result(kpi_id, cached[kpi_id], role)
+        return
+
+    if len(kpi_groups()) > 1:
+        stream = _stream_grouped_kpis_async(resume_text, role)
+    elif role == "frontend":
+        stream = stream_frontend_kpis_async(resume_text)
     elif role == "pm":
-        scores = evaluate_pm_kpis(resume_text)
+        stream = stream_pm_kpis_async(resume_text)
     elif role == "designer":
-        scores = evaluate_designer_kpis(resume_text)
+        stream = stream_designer_kpis_async(resume_text)
     else:
-        scores = evaluate_backend_kpis(resume_text)
-    
-    results = {}
-    for kpi_id, data in scores.items():
-        kpi_name = get_kpi_name(kpi_id, role=role)
-        
-        # 새 형식: {"score": 점수, "basis": "근거수준", "reason": "한 줄 근거"}
-        if isinstance(data, dict):
-            score = data.get("score", 45)
-            basis = data.get("basis", "explicit")
-            reason = normalize_reason(data.get("reason"))
-        else:
-            score = data
-            basis = "explicit"
-            reason = None
-
-        # 레벨 결정 (75~90: 상, 55~70: 중, 40~50: 하)
-        if score >= 75:
-            level = "high"
-        elif score >= 55:
-            level = "mid"
-        else:
-            level = "low"  # 54점 이하
-
-        results[kpi_id] = {
-            "score": score,
-            "level": level,
-            "kpi_name": kpi_name,
-            "basis": basis,
-            "reason": reason,
-        }
-    
-    return results
+        stream = stream_backend_kpis_async(resume_text)
+
+    scores: Dict[int, Dict[str, any]] = {}
+    async for kpi_id, data in stream:
+        scores[kpi_id] = data
+        yield kpi_id, _build_kpi_result(kpi_id, data, role)
+
+    if scores and not is_degraded(scores):
+        await kpi_score_cache.aset(cache_key, scores)
+
+
+async def _stream_grouped_kpis_async(
+    resume_text: str,
+    role: str,
+) -> AsyncIterator[Tuple[int, Dict[str, any]]]:
+    """grouped 방식 스트리밍: 묶음별 평가를 동시에 진행하고 끝나는 묶음부터 KPI ID 순서로 반환."""
+    tasks = [
+        asyncio.ensure_future(_evaluate_role_async(resume_text, role, group))
+        for group in kpi_groups()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            for kpi_id in sorted(result):
+                yield kpi_id, result[kpi_id]
+    finally:
+        # 클라이언트 연결이 끊기는 등 중간에 종료되면 남은 호출 취소
+        for task in tasks:
+            task.cancel()
+
+
+def _build_kpi_results(
+    scores: Dict[int, Dict[str, any]],
+    role: str
+) -> Dict[int, Dict[str, any]]:
+    """LLM 평가 결과에 KPI 이름·레벨을 붙이고 근거 문장을 정규화."""
+    return {
+        kpi_id: _build_kpi_result(kpi_id, data, role)
+        for kpi_id, data in scores.items()
+    }
+
+
+def score_level(score: int) -> str:
+    """이력서 점수(40~90) 레벨 (75~90: 상, 55~70: 중, 40~50: 하)."""
+    if score >= 75:
+        return "high"
+    if score >= 55:
+        return "mid"
+    return "low"  # 54점 이하
+
+
+def _build_kpi_result(kpi_id: int, data: any, role: str) -> Dict[str, any]:
+    """KPI 1개 평가 결과를 calculate_kpi_scores 항목 형식으로 변환."""
+    kpi_name = get_kpi_name(kpi_id, role=role)
+
+    # 새 형식: {"score": 점수, "basis": "근거수준", "reason": "한 줄 근거"}
+    if isinstance(data, dict):
+        score = data.get("score", 45)
+        basis = data.get("basis", "explicit")
+        reason = normalize_reason(data.get("reason"))
+        degraded = bool(data.get("degraded"))
+        error = data.get("error")
+    else:
+        score = data
+        basis = "explicit"
+        reason = None
+        degraded = False
+        error = None
+
+    return {
+        "score": score,
+        "level": score_level(score),
+        "kpi_name": kpi_name,
+        "basis": basis,
+        "reason": reason,
+        "degraded": degraded,
+        "error": error,
+    }
 
 
 def get_top_bottom_kpis(
@@ -5,18 +5,56 @@ KPI 평가 서비스.
 1. 사용자가 경력/이력서 텍스트 입력
 2. LLM이 직접 10개 KPI에 대해 점수 평가 (Few-shot Learning)
 3. 상위 3개(강점), 하위 3개(약점) KPI 추출
-4. analyze/abilities API: 모든 직군에서 각 KPI 근거 문장(reason)을 text-embedding-3-small로 임베딩하여 abilities로 반환
+4. analyze/abilities API: 모든 직군에서 각 KPI 근거 문장(reason)을 임베딩(기본 text-embedding-3-small)하여 abilities로 반환
+5. analyze/incremental API: analysis_id의 이전 분석과 비교해 바뀐 KPI만 LLM으로 재평가
+6. analyze/fusion API: LLM 평가와 설문 폴백 점수를 근거 수준(basis)별 신뢰도로 합쳐 최종 점수 반환
+7. jobs API: abilities 분석을 작업 대기열(app.domains.kpi.jobs)에 넣고 나중에 조회·웹훅으로 결과 전달
+
+analyze_*_async 함수는 AsyncOpenAI 기반으로 동작하며 라우터에서 사용.
+동기 버전은 스크립트 등 이벤트 루프 밖에서 사용.
 """
-from typing import List
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from app.domains.kpi.scorer import calculate_kpi_scores, get_top_bottom_kpis
+from app.ai.rate_limit import UpstreamBusyError
+from app.core.config import settings
+from app.core.deadline import DeadlineExceededError, deadline_scope
+from app.domains.kpi.fallback_engine import get_fallback_engine
+from app.domains.kpi.fusion import fuse_kpi_scores
+from app.domains.kpi.kpi_constants import ALLOWED_ROLES, get_kpi_name
+from app.domains.kpi.scorer import (
+    calculate_kpi_scores,
+    calculate_kpi_scores_async,
+    calculate_kpi_scores_incremental_async,
+    get_top_bottom_kpis,
+    stream_kpi_scores_async,
+)
 from app.schemas.kpi import (
     ResumeAnalysisResponse,
     AnalyzeAbilitiesResponse,
     KPIScoreItem,
     AbilityItem,
+    BatchAnalysisItem,
+    BatchAnalysisResult,
+    BatchAnalysisResponse,
+    MultiRoleAnalysisResponse,
+    AbilitySearchResult,
+    AbilitySearchResponse,
+    FusedKPIScore,
+    FusionAnalysisResponse,
+    IncrementalAnalysisResponse,
+)
+from app.ai.embedding import (
+    get_embeddings,
+    get_embeddings_async,
+    get_embeddings_raw_async,
+    validate_dimensions,
 )
-from app.ai.embedding import get_embeddings
+from app.ai.embedding_providers import get_embedding_provider
+from app.ai.embedding_codec import encode_embedding_base64, encode_embedding_bytes
+from app.models.analysis import embedding_space, get_ability_store
+from app.utils.text_processor import normalize_resume_text
 
 
 def analyze_resume(resume_text: str, role: str = "backend") -> ResumeAnalysisResponse:
@@ -24,36 +62,508 @@ def analyze_resume(resume_text: str, role: str = "backend") -> ResumeAnalysisRes
     이력서 분석 및 KPI 점수 계산 (기존 API: reason/embedding 없음).
     """
     kpi_scores = calculate_kpi_scores(resume_text, role=role)
+    return _build_analysis_response(kpi_scores)
+
+
+async def analyze_resume_async(resume_text: str, role: str = "backend") -> ResumeAnalysisResponse:
+    """
+    analyze_resume의 비동기 버전.
+    """
+    kpi_scores = await calculate_kpi_scores_async(resume_text, role=role)
+    return _build_analysis_response(kpi_scores)
+
+
+def analyze_resume_abilities(resume_text: str, role: str) -> AnalyzeAbilitiesResponse:
+    """
+    이력서 분석 + KPI 순서별 abilities(근거 문장·임베딩) 반환.
+    POST /api/kpi/analyze/abilities/{role} 전용.
+    """
+    kpi_scores = calculate_kpi_scores(resume_text, role=role)
+
+    embeddings_by_kpi: Dict[int, List[float]] = {}
+    to_embed = _reasons_to_embed(kpi_scores)
+    if to_embed:
+        try:
+            vectors = get_embeddings([r for _, r in to_embed])
+            for (kid, _), vec in zip(to_embed, vectors):
+                embeddings_by_kpi[kid] = vec
+        except (UpstreamBusyError, DeadlineExceededError):
+            raise
+        except Exception:
+            pass
+
+    return _build_abilities_response(kpi_scores, embeddings_by_kpi)
+
+
+async def analyze_resume_abilities_async(
+    resume_text: str,
+    role: str,
+    dimensions: Optional[int] = None,
+) -> AnalyzeAbilitiesResponse:
+    """
+    analyze_resume_abilities의 비동기 버전.
+
+    dimensions를 주면 해당 차원으로 축소된 임베딩을 반환 (None이면 기본 차원).
+    """
+    kpi_scores = await calculate_kpi_scores_async(resume_text, role=role)
+    return await _abilities_from_scores_async(kpi_scores, dimensions=dimensions)
+
+
+class AnalysisFailedError(Exception):
+    """LLM 평가가 오류로 기본값(degraded)으로 채워짐."""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"LLM 평가 실패 ({reason})")
+
+
+async def analyze_resume_abilities_strict_async(resume_text: str, role: str) -> AnalyzeAbilitiesResponse:
+    """
+    analyze_resume_abilities_async와 같지만 기본값으로 채운 결과를 돌려주지 않음 (작업 대기열용).
+
+    Raises:
+        AnalysisFailedError: LLM 평가 실패로 기본값이 들어감 (reason: 오류 클래스명)
+    """
+    kpi_scores = await calculate_kpi_scores_async(resume_text, role=role)
+    failure = _failure_reason(kpi_scores)
+    if failure is not None:
+        raise AnalysisFailedError(failure)
+    return await _abilities_from_scores_async(kpi_scores)
+
+
+async def analyze_resume_abilities_encoded_async(
+    resume_text: str,
+    role: str,
+    dtype: str,
+    binary: bool = False,
+    dimensions: Optional[int] = None,
+) -> Dict[str, any]:
+    """
+    abilities 응답을 압축 임베딩 형식의 dict로 반환 (pydantic 검증 생략).
+
+    임베딩은 캐시의 float32 바이트에서 바로 변환하므로 float 리스트를 만들지 않음.
+
+    Args:
+        resume_text: 이력서 텍스트
+        role: 직무명
+        dtype: "f32", "f16", "i8"(int8 양자화), "b1"(부호 비트)
+        binary: True면 임베딩을 bytes로 (msgpack 응답), False면 base64 문자열로 (JSON 응답)
+        dimensions: 임베딩 차원 (None이면 기본 차원)
+
+    Returns:
+        AnalyzeAbilitiesResponse와 같은 구조 + embedding_dtype, embedding_dimensions
+        (i8이면 abilities 항목마다 복원용 embedding_scale 포함)
+    """
+    dimensions = validate_dimensions(dimensions)
+    kpi_scores = await calculate_kpi_scores_async(resume_text, role=role)
+
+    encoded_by_kpi: Dict[int, Tuple[any, Optional[float]]] = {}
+    to_embed = _reasons_to_embed(kpi_scores)
+    if to_embed:
+        try:
+            raws = await get_embeddings_raw_async([r for _, r in to_embed], dimensions=dimensions)
+            for (kid, _), raw in zip(to_embed, raws):
+                if binary:
+                    encoded_by_kpi[kid] = encode_embedding_bytes(raw, dtype)
+                else:
+                    encoded_by_kpi[kid] = encode_embedding_base64(raw, dtype)
+        except (UpstreamBusyError, DeadlineExceededError):
+            raise
+        except Exception:
+            pass
+
+    abilities = []
+    for content, encoded in _ability_entries(kpi_scores, encoded_by_kpi):
+        embedding, scale = encoded or (None, None)
+        ability = {"content": content, "embedding": embedding}
+        if dtype == "i8":
+            ability["embedding_scale"] = scale
+        abilities.append(ability)
+
     strengths, weaknesses = get_top_bottom_kpis(kpi_scores)
+    return {
+        "scores": [item.model_dump() for item in _build_score_items(kpi_scores)],
+        "abilities": abilities,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "embedding_dtype": dtype,
+        "embedding_dimensions": dimensions,
+    }
 
-    scores = [
-        KPIScoreItem(
-            kpi_id=kpi_id,
-            kpi_name=kpi_scores[kpi_id]["kpi_name"],
-            score=kpi_scores[kpi_id]["score"],
-            level=kpi_scores[kpi_id]["level"],
-            basis=kpi_scores[kpi_id].get("basis", "explicit"),
+
+async def store_abilities_async(
+    role: str,
+    candidate_id: Optional[str],
+    entries: List[Tuple[int, Optional[str]]],
+    dimensions: Optional[int] = None,
+) -> int:
+    """
+    abilities 근거 문장을 유사 검색 저장소에 저장.
+
+    임베딩은 방금 응답에 쓴 것과 같은 캐시 항목을 재사용하므로 추가 API 호출이 없음.
+
+    Args:
+        role: 직무명
+        candidate_id: 후보자 식별자
+        entries: [(kpi_id, 근거 문장)] (근거가 없는 항목은 건너뜀)
+        dimensions: 임베딩 차원 (None이면 기본 차원)
+
+    Returns:
+        저장한 문장 수
+    """
+    entries = [(kpi_id, content) for kpi_id, content in entries if content]
+    if not entries:
+        return 0
+    dimensions = validate_dimensions(dimensions)
+    raws = await get_embeddings_raw_async([content for _, content in entries], dimensions=dimensions)
+    space = embedding_space(get_embedding_provider().model, dimensions)
+    items = [(kpi_id, content, raw) for (kpi_id, content), raw in zip(entries, raws)]
+    return await asyncio.to_thread(get_ability_store().add, space, dimensions, role, candidate_id, items)
+
+
+async def search_abilities_async(
+    role: str,
+    query: str,
+    k: int = 10,
+    kpi_id: Optional[int] = None,
+    group_by_candidate: bool = False,
+    dimensions: Optional[int] = None,
+) -> AbilitySearchResponse:
+    """
+    저장된 근거 문장 중 질의 문장과 비슷한 문장 검색 (직무별 IVF 인덱스).
+
+    Args:
+        role: 직무명
+        query: 질의 문장
+        k: 반환 개수
+        kpi_id: 지정 시 해당 KPI만
+        group_by_candidate: True면 후보자별 1건씩
+        dimensions: 임베딩 차원 (저장 시와 같아야 함)
+    """
+    dimensions = validate_dimensions(dimensions)
+    [query_vector] = await get_embeddings_raw_async([query], dimensions=dimensions)
+    space = embedding_space(get_embedding_provider().model, dimensions)
+    matches = await asyncio.to_thread(
+        get_ability_store().search,
+        space,
+        dimensions,
+        role,
+        query_vector,
+        k=k,
+        kpi_id=kpi_id,
+        group_by_candidate=group_by_candidate,
+    )
+    return AbilitySearchResponse(results=[
+        AbilitySearchResult(
+            candidate_id=match.candidate_id,
+            kpi_id=match.kpi_id,
+            kpi_name=get_kpi_name(match.kpi_id, role=role),
+            content=match.content,
+            score=round(match.score, 4),
         )
-        for kpi_id in sorted(kpi_scores.keys())
+        for match in matches
+    ])
+
+
+async def stream_analysis_events(
+    resume_text: str,
+    role: str,
+    include_abilities: bool = False,
+) -> AsyncIterator[Tuple[str, Dict[str, any]]]:
+    """
+    분석 결과를 완성되는 순서대로 (이벤트명, 데이터)로 반환 (SSE 엔드포인트용).
+
+    이벤트 순서:
+    1. "score": KPI가 하나 완성될 때마다 KPIScoreItem 필드
+    2. "summary": 모든 KPI 완료 후 strengths/weaknesses
+    3. "ability": include_abilities=True면 KPI 순서대로 근거 문장·임베딩
+    4. "done"
+    """
+    kpi_scores: Dict[int, Dict[str, any]] = {}
+    async for kpi_id, data in stream_kpi_scores_async(resume_text, role=role):
+        kpi_scores[kpi_id] = data
+        yield "score", KPIScoreItem(
+            kpi_id=kpi_id,
+            kpi_name=data["kpi_name"],
+            score=data["score"],
+            level=data["level"],
+            basis=data.get("basis", "explicit"),
+        ).model_dump()
+
+    strengths, weaknesses = get_top_bottom_kpis(kpi_scores)
+    yield "summary", {"strengths": strengths, "weaknesses": weaknesses}
+
+    if include_abilities:
+        response = await _abilities_from_scores_async(kpi_scores)
+        for item, ability in zip(response.scores, response.abilities):
+            yield "ability", {"kpi_id": item.kpi_id, **ability.model_dump()}
+
+    yield "done", {}
+
+
+async def analyze_resume_multi_role_async(
+    resume_text: str,
+    roles: List[str],
+    include_abilities: bool = False,
+) -> MultiRoleAnalysisResponse:
+    """
+    이력서 1건을 여러 직무로 동시에 분석.
+
+    정규화한 이력서를 모든 직무가 공유하고, 직무별 LLM 평가는 병렬로 실행.
+    abilities가 필요하면 모든 직무의 근거 문장을 모아 임베딩을 한 번만 요청.
+
+    Args:
+        resume_text: 이력서 텍스트
+        roles: 분석할 직무 목록 (중복은 한 번만 평가)
+        include_abilities: True면 직무별 abilities 응답, False면 기존 분석 응답
+
+    Returns:
+        {직무명: 분석 응답}
+    """
+    roles = list(dict.fromkeys(roles))
+    normalized = normalize_resume_text(resume_text)
+    role_scores = await asyncio.gather(*[
+        calculate_kpi_scores_async(normalized, role=role) for role in roles
+    ])
+    scores_by_role = dict(zip(roles, role_scores))
+
+    if not include_abilities:
+        return MultiRoleAnalysisResponse(results={
+            role: _build_analysis_response(kpi_scores)
+            for role, kpi_scores in scores_by_role.items()
+        })
+
+    # 전 직무의 근거 문장을 한 번의 임베딩 요청으로 처리
+    to_embed = [
+        (role, kid, reason)
+        for role, kpi_scores in scores_by_role.items()
+        for kid, reason in _reasons_to_embed(kpi_scores)
     ]
+    embeddings: Dict[str, Dict[int, List[float]]] = {role: {} for role in roles}
+    if to_embed:
+        try:
+            vectors = await get_embeddings_async([r for _, _, r in to_embed])
+            for (role, kid, _), vec in zip(to_embed, vectors):
+                embeddings[role][kid] = vec
+        except (UpstreamBusyError, DeadlineExceededError):
+            raise
+        except Exception:
+            pass
 
-    return ResumeAnalysisResponse(
-        scores=scores,
+    return MultiRoleAnalysisResponse(results={
+        role: _build_abilities_response(kpi_scores, embeddings[role])
+        for role, kpi_scores in scores_by_role.items()
+    })
+
+
+async def analyze_resume_incremental_async(
+    resume_text: str,
+    role: str,
+    analysis_id: str,
+    include_abilities: bool = False,
+) -> IncrementalAnalysisResponse:
+    """
+    수정된 이력서를 analysis_id의 이전 분석과 비교해 바뀐 KPI만 재평가.
+
+    근거 문장이 그대로인 KPI는 임베딩 캐시에 적중하므로 abilities도 새 문장만 임베딩함.
+    """
+    kpi_scores, reevaluated = await calculate_kpi_scores_incremental_async(
+        resume_text, role=role, analysis_id=analysis_id
+    )
+    if include_abilities:
+        result = await _abilities_from_scores_async(kpi_scores)
+    else:
+        result = _build_analysis_response(kpi_scores)
+    return IncrementalAnalysisResponse(
+        analysis_id=analysis_id,
+        reevaluated_kpis=reevaluated,
+        result=result,
+    )
+
+
+async def analyze_resume_fused_async(
+    resume_text: str,
+    role: str,
+    answers: List[int],
+) -> FusionAnalysisResponse:
+    """
+    이력서 LLM 평가와 설문 폴백 점수를 합쳐 KPI별 최종 점수 계산.
+
+    LLM 평가를 먼저 시작해 두고, 기다리는 동안 설문 점수(조회표 한 번 조회)를 계산.
+
+    Args:
+        resume_text: 이력서 텍스트
+        role: 직무명
+        answers: 설문 응답 [q_b1, q_b2, q_b3, q_b4, q_b5] (각 1~5)
+
+    Returns:
+        KPI별 최종 점수·강점·약점 (점수마다 이력서/설문 점수와 이력서 가중치 포함)
+    """
+    llm_task = asyncio.ensure_future(calculate_kpi_scores_async(resume_text, role=role))
+    try:
+        survey_row = get_fallback_engine(role).score_row(*answers)
+    except BaseException:
+        llm_task.cancel()
+        raise
+    resume_scores = await llm_task
+
+    survey_scores = {kpi_id: score for kpi_id, score in enumerate(survey_row, start=1)}
+    fused = fuse_kpi_scores(resume_scores, survey_scores)
+    strengths, weaknesses = get_top_bottom_kpis(fused)
+    return FusionAnalysisResponse(
+        scores=[FusedKPIScore(kpi_id=kpi_id, **fused[kpi_id]) for kpi_id in sorted(fused)],
         strengths=strengths,
         weaknesses=weaknesses,
     )
 
 
-def analyze_resume_abilities(resume_text: str, role: str) -> AnalyzeAbilitiesResponse:
+async def _abilities_from_scores_async(
+    kpi_scores: Dict[int, Dict[str, any]],
+    dimensions: Optional[int] = None,
+) -> AnalyzeAbilitiesResponse:
+    """KPI 점수의 근거 문장을 임베딩해 abilities 응답 생성."""
+    embeddings_by_kpi: Dict[int, List[float]] = {}
+    to_embed = _reasons_to_embed(kpi_scores)
+    if to_embed:
+        try:
+            vectors = await get_embeddings_async([r for _, r in to_embed], dimensions=dimensions)
+            for (kid, _), vec in zip(to_embed, vectors):
+                embeddings_by_kpi[kid] = vec
+        except (UpstreamBusyError, DeadlineExceededError):
+            raise
+        except Exception:
+            pass
+
+    return _build_abilities_response(kpi_scores, embeddings_by_kpi)
+
+
+class _BatchBackoff:
     """
-    이력서 분석 + KPI 순서별 abilities(근거 문장·임베딩) 반환.
-    POST /api/kpi/analyze/abilities/{role} 전용.
+    배치 전체가 공유하는 대기 구간.
+
+    한 항목이 rate limit(429)을 받으면 다른 항목들도 같은 시점까지
+    새 호출을 미뤄, 한도 초과 상태에서 요청이 계속 쏟아지지 않게 함.
     """
-    kpi_scores = calculate_kpi_scores(resume_text, role=role)
-    strengths, weaknesses = get_top_bottom_kpis(kpi_scores)
 
-    ordered_ids = sorted(kpi_scores.keys())
-    scores = [
+    def __init__(self):
+        self._resume_at = 0.0
+
+    def extend(self, delay: float) -> None:
+        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    async def wait(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _failure_reason(kpi_scores: Dict[int, Dict[str, any]]) -> Optional[str]:
+    """LLM 오류로 기본값이 들어간 결과면 오류 클래스명(없으면 "Error"), 정상이면 None."""
+    for data in kpi_scores.values():
+        if data.get("degraded"):
+            return data.get("error") or "Error"
+    return None
+
+
+async def _analyze_batch_item(
+    index: int,
+    item: BatchAnalysisItem,
+    include_abilities: bool,
+    semaphore: asyncio.Semaphore,
+    backoff: _BatchBackoff,
+) -> BatchAnalysisResult:
+    """배치 항목 1건 분석. 실패 시 지수 백오프로 재시도하고, 끝내 실패하면 error 결과."""
+    role = item.role.lower()
+    if role not in ALLOWED_ROLES:
+        return BatchAnalysisResult(
+            index=index,
+            id=item.id,
+            role=item.role,
+            status="error",
+            error=f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}",
+        )
+
+    async with semaphore:
+        for attempt in range(settings.BATCH_MAX_RETRIES + 1):
+            await backoff.wait()
+            delay = settings.BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)
+            try:
+                # 항목마다 요청 1건과 같은 마감 (배치 요청 전체의 마감과는 별개)
+                with deadline_scope(settings.REQUEST_DEADLINE_SECONDS, inherit=False):
+                    kpi_scores = await calculate_kpi_scores_async(item.resume_text, role=role)
+                failure = _failure_reason(kpi_scores)
+            except UpstreamBusyError as e:
+                # 업스트림 제한기가 대기 상한을 넘김: 배치 전체가 Retry-After만큼 쉬었다가 재시도
+                failure = type(e).__name__
+                delay = max(delay, e.retry_after)
+            except DeadlineExceededError as e:
+                failure = type(e).__name__
+            if failure is None:
+                break
+            if attempt == settings.BATCH_MAX_RETRIES:
+                return BatchAnalysisResult(
+                    index=index,
+                    id=item.id,
+                    role=role,
+                    status="error",
+                    error=f"LLM 평가 실패 ({failure})",
+                )
+            if failure in ("RateLimitError", "UpstreamBusyError"):
+                backoff.extend(delay)
+            else:
+                await asyncio.sleep(delay)
+
+        if include_abilities:
+            try:
+                with deadline_scope(settings.REQUEST_DEADLINE_SECONDS, inherit=False):
+                    result = await _abilities_from_scores_async(kpi_scores)
+            except (UpstreamBusyError, DeadlineExceededError) as e:
+                return BatchAnalysisResult(
+                    index=index,
+                    id=item.id,
+                    role=role,
+                    status="error",
+                    error=f"임베딩 실패 ({type(e).__name__})",
+                )
+        else:
+            result = _build_analysis_response(kpi_scores)
+
+    return BatchAnalysisResult(index=index, id=item.id, role=role, status="ok", result=result)
+
+
+async def analyze_batch_async(
+    items: List[BatchAnalysisItem],
+    include_abilities: bool = False,
+    max_concurrency: Optional[int] = None,
+) -> BatchAnalysisResponse:
+    """
+    여러 이력서를 동시성 제한 내에서 병렬 분석.
+
+    Args:
+        items: 분석할 (resume_text, role) 목록
+        include_abilities: True면 항목별 abilities 응답, False면 기존 분석 응답
+        max_concurrency: 동시에 진행할 항목 수 (미지정 시 BATCH_MAX_CONCURRENCY)
+
+    Returns:
+        요청 순서대로 정렬된 항목별 결과
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+    backoff = _BatchBackoff()
+    results = await asyncio.gather(*[
+        _analyze_batch_item(index, item, include_abilities, semaphore, backoff)
+        for index, item in enumerate(items)
+    ])
+    succeeded = sum(1 for r in results if r.status == "ok")
+    return BatchAnalysisResponse(
+        results=list(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+    )
+
+
+def _build_score_items(kpi_scores: Dict[int, Dict[str, any]]) -> List[KPIScoreItem]:
+    """KPI ID 순서대로 KPIScoreItem 리스트 생성."""
+    return [
         KPIScoreItem(
             kpi_id=kpi_id,
             kpi_name=kpi_scores[kpi_id]["kpi_name"],
@@ -61,41 +571,62 @@ def analyze_resume_abilities(resume_text: str, role: str) -> AnalyzeAbilitiesRes
             level=kpi_scores[kpi_id]["level"],
             basis=kpi_scores[kpi_id].get("basis", "explicit"),
         )
-        for kpi_id in ordered_ids
+        for kpi_id in sorted(kpi_scores.keys())
     ]
 
-    # abilities: 모든 직군에서 근거 문장·임베딩 (scores와 1:1 동일 순서)
-    embeddings_by_kpi: dict[int, list[float]] = {}
+
+def _build_analysis_response(kpi_scores: Dict[int, Dict[str, any]]) -> ResumeAnalysisResponse:
+    """calculate_kpi_scores 결과로 기존 분석 응답 생성."""
+    strengths, weaknesses = get_top_bottom_kpis(kpi_scores)
+
+    return ResumeAnalysisResponse(
+        scores=_build_score_items(kpi_scores),
+        strengths=strengths,
+        weaknesses=weaknesses,
+    )
+
+
+def _reasons_to_embed(kpi_scores: Dict[int, Dict[str, any]]) -> List[Tuple[int, str]]:
+    """임베딩 대상 (kpi_id, 근거 문장) 목록. basis="none"이거나 근거가 빈 KPI는 제외."""
     reasons_to_embed = [
         (kid, (kpi_scores[kid].get("reason") or "").strip())
-        for kid in ordered_ids
+        for kid in sorted(kpi_scores.keys())
         if (kpi_scores[kid].get("basis") or "").lower() != "none"
     ]
-    to_embed = [(kid, r) for kid, r in reasons_to_embed if r]
-    if to_embed:
-        try:
-            vectors = get_embeddings([r for _, r in to_embed])
-            for (kid, _), vec in zip(to_embed, vectors):
-                embeddings_by_kpi[kid] = vec
-        except Exception:
-            pass
+    return [(kid, r) for kid, r in reasons_to_embed if r]
 
-    abilities: List[AbilityItem] = []
-    for kpi_id in ordered_ids:
-        data = kpi_scores[kpi_id]
-        basis = (data.get("basis") or "").lower()
-        no_basis = basis == "none"
-        if not no_basis:
-            content = (data.get("reason") or "").strip() or None
-            embedding = embeddings_by_kpi.get(kpi_id)
-        else:
-            content = None
-            embedding = None
-        abilities.append(AbilityItem(content=content, embedding=embedding))
+
+def _build_abilities_response(
+    kpi_scores: Dict[int, Dict[str, any]],
+    embeddings_by_kpi: Dict[int, List[float]],
+) -> AnalyzeAbilitiesResponse:
+    """점수와 KPI별 임베딩으로 abilities 응답 생성 (scores와 1:1 동일 순서)."""
+    strengths, weaknesses = get_top_bottom_kpis(kpi_scores)
+
+    abilities = [
+        AbilityItem(content=content, embedding=embedding)
+        for content, embedding in _ability_entries(kpi_scores, embeddings_by_kpi)
+    ]
 
     return AnalyzeAbilitiesResponse(
-        scores=scores,
+        scores=_build_score_items(kpi_scores),
         abilities=abilities,
         strengths=strengths,
         weaknesses=weaknesses,
     )
+
+
+def _ability_entries(
+    kpi_scores: Dict[int, Dict[str, any]],
+    embeddings_by_kpi: Dict[int, any],
+) -> List[Tuple[Optional[str], any]]:
+    """KPI ID 순서의 (근거 문장, 임베딩) 목록. basis="none"인 KPI는 둘 다 None."""
+    entries = []
+    for kpi_id in sorted(kpi_scores.keys()):
+        data = kpi_scores[kpi_id]
+        if (data.get("basis") or "").lower() == "none":
+            entries.append((None, None))
+        else:
+            content = (data.get("reason") or "").strip() or None
+            entries.append((content, embeddings_by_kpi.get(kpi_id)))
+    return entries
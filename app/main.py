@@ -1,16 +1,41 @@
 """
 FastAPI application entry point.
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+import math
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
+from app.ai.clients import close_clients, init_clients
+from app.ai.embedding_providers import init_embedding_provider
+from app.ai.rate_limit import UpstreamBusyError
 from app.core.config import settings
+from app.core.deadline import DeadlineExceededError, DeadlineMiddleware
+from app.core.metrics import METRICS_PATH, MetricsMiddleware, metrics_available, render_metrics
+from app.domains.kpi.jobs import start_job_workers, stop_job_workers
+from app.domains.kpi.kpi_constants import ALLOWED_ROLES
 from app.domains.kpi.router import router as kpi_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 공유 OpenAI 클라이언트·임베딩 제공자·작업 워커 준비, 종료 시 정리."""
+    init_clients()
+    await init_embedding_provider()
+    await start_job_workers()
+    yield
+    await stop_job_workers()
+    await close_clients()
+
+
 app = FastAPI(
     title="NaviK API",
     description="NaviK Backend API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -22,6 +47,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(UpstreamBusyError)
+async def upstream_busy_handler(request: Request, exc: UpstreamBusyError):
+    """업스트림 요청 한도로 처리하지 못한 요청은 기본 점수 대신 503 + Retry-After로 응답."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError):
+    """요청 마감(REQUEST_DEADLINE_SECONDS / X-Request-Timeout) 안에 끝내지 못한 요청은 504."""
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+# 요청별 마감 시각 설정 (LLM·임베딩 호출까지 전파)
+app.add_middleware(DeadlineMiddleware)
+
+# 요청 처리 시간 지표 (가장 바깥에서 측정, role 라벨은 허용 직군으로 제한)
+app.add_middleware(MetricsMiddleware, roles=ALLOWED_ROLES)
+
 # 라우터 등록
 app.include_router(kpi_router, prefix="/api/kpi", tags=["KPI"])
 
@@ -30,3 +78,15 @@ app.include_router(kpi_router, prefix="/api/kpi", tags=["KPI"])
 async def health_check():
     """헬스체크 엔드포인트"""
     return {"status": "healthy"}
+
+
+@app.get(METRICS_PATH, include_in_schema=False)
+async def metrics():
+    """Prometheus 지표 (prometheus_client 필요)"""
+    if not metrics_available():
+        raise HTTPException(
+            status_code=503,
+            detail="지표가 비활성화되어 있습니다 (METRICS_ENABLED, pip install prometheus-client).",
+        )
+    body, content_type = render_metrics()
+    return Response(content=body, headers={"Content-Type": content_type})
@@ -1,3 +1,344 @@
 """
 Analysis model definition.
+
+abilities 분석 결과(KPI별 근거 문장·임베딩) 저장소와 유사 문장 검색.
+
+- 메타데이터(직군, KPI, 후보자, 근거 문장)는 SQLite에 저장
+- 벡터는 임베딩 공간(모델·차원)별 float32 파일에 이어 쓰기 (memmap으로 읽음)
+- 직군별 IVF 인덱스로 근사 검색하고, 인덱스 이후 추가된 벡터(tail)는 전수 비교
+- tail이 커지면 백그라운드 스레드에서 인덱스를 다시 만들어 교체
 """
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.utils.ivf_index import IVFIndex, top_k
+
+
+@dataclass
+class AbilityRecord:
+    """저장된 근거 문장 1건."""
+    role: str
+    kpi_id: int
+    candidate_id: Optional[str]
+    content: str
+
+
+@dataclass
+class AbilityMatch:
+    """유사 문장 검색 결과 1건."""
+    role: str
+    kpi_id: int
+    candidate_id: Optional[str]
+    content: str
+    score: float
+    stored_at: float = 0.0  # 저장 시각 (한 번의 add로 저장한 문장끼리 같은 값)
+
+    @property
+    def group_key(self) -> Tuple[str, object]:
+        """후보자별 묶음 기준 (candidate_id가 없으면 저장한 분석 1건을 후보자 1명으로 봄)."""
+        if self.candidate_id is not None:
+            return ("candidate", self.candidate_id)
+        return ("analysis", self.stored_at)
+
+
+def embedding_space(model: str, dimensions: int) -> str:
+    """임베딩 공간 이름 (모델·차원이 같은 벡터끼리만 비교 가능)."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", model).strip("-").lower()
+    return f"{slug}-{dimensions}"
+
+
+class AbilityStore:
+    """
+    근거 문장 임베딩 저장소.
+
+    벡터 파일의 행 번호(vec_row)가 SQLite 메타데이터와 인덱스를 잇는 키.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        nprobe: int = 16,
+        rebuild_threshold: int = 20000,
+    ):
+        self.directory = directory
+        self.nprobe = nprobe
+        self.rebuild_threshold = rebuild_threshold
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._indexes: Dict[Tuple[str, str], Optional[IVFIndex]] = {}
+        self._tails: Dict[Tuple[str, str], Tuple[List[int], List[int]]] = {}
+        self._rebuilding: set = set()
+        self._last_stored_at = 0.0
+
+    # ----- 저장 -----
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(
+                os.path.join(self.directory, "abilities.sqlite3"), check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS abilities ("
+                "space TEXT NOT NULL, vec_row INTEGER NOT NULL, role TEXT NOT NULL, "
+                "kpi_id INTEGER NOT NULL, candidate_id TEXT, content TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (space, vec_row))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS abilities_role ON abilities (space, role, vec_row)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _vector_path(self, space: str) -> str:
+        return os.path.join(self.directory, f"{space}.f32")
+
+    def _index_prefix(self, space: str, role: str) -> str:
+        return os.path.join(self.directory, f"{space}.{role}.ivf")
+
+    def add(
+        self,
+        space: str,
+        dimensions: int,
+        role: str,
+        candidate_id: Optional[str],
+        items: List[Tuple[int, str, bytes]],
+    ) -> int:
+        """
+        근거 문장·임베딩 저장.
+
+        Args:
+            space: embedding_space 결과
+            dimensions: 벡터 차원
+            role: 직군
+            candidate_id: 후보자 식별자 (없으면 None)
+            items: [(kpi_id, 근거 문장, float32 벡터 바이트)]
+
+        Returns:
+            저장한 건수
+        """
+        if not items:
+            return 0
+        row_bytes = 4 * dimensions
+        with self._lock:
+            conn = self._connect()
+            path = self._vector_path(space)
+            first_row = os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+            with open(path, "ab") as f:
+                for _, _, raw in items:
+                    f.write(raw)
+            # 저장 시각은 분석 1건의 식별자로도 쓰이므로 (group_by_candidate) 같은 값이 나오지 않게 함
+            now = max(time.time(), self._last_stored_at + 1e-6)
+            self._last_stored_at = now
+            rows = [
+                (space, first_row + i, role, kpi_id, candidate_id, content, now)
+                for i, (kpi_id, content, _) in enumerate(items)
+            ]
+            conn.executemany(
+                "INSERT INTO abilities (space, vec_row, role, kpi_id, candidate_id, content, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+            tail = self._tails.get((space, role))
+            if tail is not None:
+                tail[0].extend(r[1] for r in rows)
+                tail[1].extend(r[3] for r in rows)
+        return len(items)
+
+    # ----- 인덱스 -----
+
+    def _vectors(self, space: str, dimensions: int) -> np.ndarray:
+        path = self._vector_path(space)
+        count = os.path.getsize(path) // (4 * dimensions) if os.path.exists(path) else 0
+        if not count:
+            return np.zeros((0, dimensions), dtype=np.float32)
+        return np.memmap(path, dtype=np.float32, mode="r", shape=(count, dimensions))
+
+    def _index(self, space: str, role: str) -> Optional[IVFIndex]:
+        key = (space, role)
+        if key not in self._indexes:
+            self._indexes[key] = IVFIndex.load(self._index_prefix(space, role))
+        return self._indexes[key]
+
+    def _tail(self, space: str, role: str) -> Tuple[List[int], List[int]]:
+        """인덱스 이후 추가된 (vec_row 목록, kpi_id 목록)."""
+        key = (space, role)
+        with self._lock:
+            if key not in self._tails:
+                index = self._index(space, role)
+                max_row = index.max_id if index is not None else -1
+                rows = self._connect().execute(
+                    "SELECT vec_row, kpi_id FROM abilities WHERE space = ? AND role = ? AND vec_row > ? "
+                    "ORDER BY vec_row",
+                    (space, role, max_row),
+                ).fetchall()
+                self._tails[key] = ([r[0] for r in rows], [r[1] for r in rows])
+            tail_rows, tail_kpis = self._tails[key]
+            return list(tail_rows), list(tail_kpis)
+
+    def rebuild_index(self, space: str, dimensions: int, role: str) -> Optional[IVFIndex]:
+        """직군의 전체 벡터로 IVF 인덱스를 다시 만들어 교체."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT vec_row, kpi_id FROM abilities WHERE space = ? AND role = ? ORDER BY vec_row",
+                (space, role),
+            ).fetchall()
+        if not rows:
+            return None
+        vec_rows = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        tags = np.fromiter((r[1] for r in rows), dtype=np.int16, count=len(rows))
+        vectors = self._vectors(space, dimensions)
+        index = IVFIndex.build(vectors, vec_rows, tags, self._index_prefix(space, role))
+        key = (space, role)
+        with self._lock:
+            self._indexes[key] = index
+            tail_rows, tail_kpis = self._tails.get(key, ([], []))
+            keep = [i for i, row in enumerate(tail_rows) if row > index.max_id]
+            self._tails[key] = ([tail_rows[i] for i in keep], [tail_kpis[i] for i in keep])
+        return index
+
+    def _maybe_rebuild(self, space: str, dimensions: int, role: str, tail_size: int) -> None:
+        """tail이 임계값을 넘으면 백그라운드 스레드에서 인덱스 재생성 (직군별 1개만)."""
+        key = (space, role)
+        if tail_size < self.rebuild_threshold:
+            return
+        # search는 asyncio.to_thread로 동시에 불리므로 확인과 등록을 한 번에
+        with self._lock:
+            if key in self._rebuilding:
+                return
+            self._rebuilding.add(key)
+
+        def run():
+            try:
+                self.rebuild_index(space, dimensions, role)
+            finally:
+                with self._lock:
+                    self._rebuilding.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # ----- 검색 -----
+
+    def search(
+        self,
+        space: str,
+        dimensions: int,
+        role: str,
+        query: bytes,
+        k: int = 10,
+        kpi_id: Optional[int] = None,
+        group_by_candidate: bool = False,
+    ) -> List[AbilityMatch]:
+        """
+        질의 벡터와 코사인 유사도가 높은 근거 문장 검색.
+
+        Args:
+            space, dimensions: 질의 벡터의 임베딩 공간
+            role: 직군
+            query: float32 질의 벡터 바이트
+            k: 반환 개수
+            kpi_id: 지정 시 해당 KPI의 문장만 검색
+            group_by_candidate: True면 후보자별 최고 점수 문장 1건씩 (상위 k명,
+                candidate_id 없이 저장한 문장은 저장한 분석 1건을 후보자 1명으로 봄)
+
+        Returns:
+            점수 내림차순 AbilityMatch 목록
+        """
+        q = np.frombuffer(query, dtype=np.float32)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+
+        tail_scores, tail_rows = np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        tail_rows_all, tail_kpis = self._tail(space, role)
+        if tail_rows_all:
+            tail_rows = np.asarray(tail_rows_all, dtype=np.int64)
+            if kpi_id is not None:
+                tail_rows = tail_rows[np.asarray(tail_kpis) == kpi_id]
+            if len(tail_rows):
+                tail_scores = self._vectors(space, dimensions)[tail_rows] @ q
+            self._maybe_rebuild(space, dimensions, role, len(tail_rows_all))
+
+        index = self._index(space, role)
+        fetch = k * 5 if group_by_candidate else k
+        nprobe = self.nprobe
+        while True:
+            scores, rows = tail_scores, tail_rows
+            if index is not None:
+                index_scores, index_rows = index.search(q, fetch, nprobe=nprobe, tag=kpi_id)
+                scores = np.concatenate([index_scores, scores])
+                rows = np.concatenate([index_rows, rows])
+            scores, rows = top_k(scores, rows, fetch)
+            matches = self._matches(space, scores, rows)
+            if not group_by_candidate:
+                return matches[:k]
+            seen, grouped = set(), []
+            for match in matches:
+                if match.group_key in seen:
+                    continue
+                seen.add(match.group_key)
+                grouped.append(match)
+            if len(grouped) >= k:
+                return grouped[:k]
+            # 소수 후보자가 상위 결과를 차지하면 k명이 찰 때까지 더 가져옴
+            # (탐색한 군집이 바닥나면 군집을 넓히고, 전체가 바닥나면 중단)
+            if len(rows) == fetch:
+                fetch *= 4
+            elif index is not None and nprobe < len(index.centroids):
+                nprobe *= 2
+            else:
+                return grouped
+
+    def _matches(self, space: str, scores: np.ndarray, rows: np.ndarray) -> List[AbilityMatch]:
+        if not len(rows):
+            return []
+        placeholders = ",".join("?" * len(rows))
+        with self._lock:
+            found = self._connect().execute(
+                f"SELECT vec_row, role, kpi_id, candidate_id, content, created_at FROM abilities "
+                f"WHERE space = ? AND vec_row IN ({placeholders})",
+                (space, *[int(r) for r in rows]),
+            ).fetchall()
+        records = {r[0]: AbilityRecord(role=r[1], kpi_id=r[2], candidate_id=r[3], content=r[4]) for r in found}
+        stored_at = {r[0]: r[5] for r in found}
+        return [
+            AbilityMatch(
+                role=records[int(row)].role,
+                kpi_id=records[int(row)].kpi_id,
+                candidate_id=records[int(row)].candidate_id,
+                content=records[int(row)].content,
+                score=float(score),
+                stored_at=stored_at[int(row)],
+            )
+            for score, row in zip(scores, rows)
+            if int(row) in records
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store: Optional[AbilityStore] = None
+
+
+def get_ability_store() -> AbilityStore:
+    """설정 기반 공유 저장소 (없으면 생성)."""
+    global _store
+    if _store is None:
+        _store = AbilityStore(
+            settings.ABILITY_STORE_DIR,
+            nprobe=settings.ABILITY_INDEX_NPROBE,
+            rebuild_threshold=settings.ABILITY_INDEX_REBUILD_THRESHOLD,
+        )
+    return _store
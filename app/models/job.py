@@ -0,0 +1,271 @@
+"""
+Analysis job model definition.
+
+비동기 분석 작업(job) 대기열 저장소 (SQLite).
+
+- 작업은 queued → running → succeeded/failed 순서로 진행
+- 대기 중인 작업은 우선순위(high → normal → low), 같은 우선순위는 먼저 들어온 순서로 꺼냄
+- 재시도할 작업은 available_at(다시 꺼낼 수 있는 시각)을 미뤄 queued로 되돌림
+- 끝난 작업은 이력서 원문을 지우고 결과만 보관하다가 보관 기간이 지나면 삭제
+- running 상태로 너무 오래 남은 작업(프로세스 종료 등)은 다시 queued로 되돌림
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+# 우선순위 클래스 → 정렬 값 (작을수록 먼저)
+JOB_PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+PRIORITY_NAMES = {value: name for name, value in JOB_PRIORITIES.items()}
+
+_COLUMNS = (
+    "id, role, resume_text, priority, status, webhook_url, attempts, available_at, "
+    "created_at, started_at, finished_at, result, error, webhook_status"
+)
+
+
+@dataclass
+class AnalysisJob:
+    """분석 작업 1건."""
+    id: str
+    role: str
+    resume_text: Optional[str]
+    priority: str
+    status: str
+    webhook_url: Optional[str]
+    attempts: int
+    available_at: float
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    webhook_status: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "AnalysisJob":
+        values = list(row)
+        values[3] = PRIORITY_NAMES.get(values[3], "normal")
+        return cls(*values)
+
+
+class JobStore:
+    """SQLite 기반 분석 작업 대기열."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, role TEXT NOT NULL, resume_text TEXT, "
+                "priority INTEGER NOT NULL, status TEXT NOT NULL, webhook_url TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+                "result TEXT, error TEXT, webhook_status TEXT)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created_at)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at)")
+            self._conn = conn
+        return self._conn
+
+    def submit(
+        self,
+        role: str,
+        resume_text: str,
+        priority: str = "normal",
+        webhook_url: Optional[str] = None,
+    ) -> AnalysisJob:
+        """작업을 대기열에 추가하고 반환."""
+        now = time.time()
+        job = AnalysisJob(
+            id=uuid.uuid4().hex,
+            role=role,
+            resume_text=resume_text,
+            priority=priority,
+            status="queued",
+            webhook_url=webhook_url,
+            attempts=0,
+            available_at=now,
+            created_at=now,
+        )
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO jobs (id, role, resume_text, priority, status, webhook_url, "
+                "attempts, available_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, role, resume_text, JOB_PRIORITIES[priority], job.status,
+                 webhook_url, 0, now, now),
+            )
+            conn.commit()
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return AnalysisJob.from_row(row) if row else None
+
+    def pending_count(self) -> int:
+        """아직 끝나지 않은(queued·running) 작업 수."""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    def queue_position(self, job: AnalysisJob) -> int:
+        """대기 중인 작업 앞에 있는 queued 작업 수 (대기 중이 아니면 0)."""
+        if job.status != "queued":
+            return 0
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND "
+                "(priority < ? OR (priority = ? AND created_at < ?))",
+                (JOB_PRIORITIES[job.priority], JOB_PRIORITIES[job.priority], job.created_at),
+            ).fetchone()[0]
+
+    def claim_next(self) -> Optional[AnalysisJob]:
+        """
+        지금 실행할 수 있는 가장 우선순위 높은 작업을 running으로 바꿔 반환 (없으면 None).
+
+        상태 조건부 UPDATE라 같은 DB를 쓰는 여러 프로세스가 같은 작업을 가져가지 않음.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            while True:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' AND available_at <= ? "
+                    "ORDER BY priority, created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+                updated = conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ? AND status = 'queued'",
+                    (now, row[0]),
+                ).rowcount
+                conn.commit()
+                if updated:
+                    row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (row[0],)).fetchone()
+                    return AnalysisJob.from_row(row)
+
+    def complete(self, job_id: str, result: str) -> None:
+        """성공 처리 (결과 JSON 저장, 이력서 원문 삭제)."""
+        self._finish(job_id, "succeeded", result=result, error=None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """실패 처리 (이력서 원문 삭제)."""
+        self._finish(job_id, "failed", result=None, error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str], error: Optional[str]) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "resume_text = NULL WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+            conn.commit()
+
+    def retry_later(self, job_id: str, delay: float, error: str) -> None:
+        """delay초 뒤에 다시 꺼낼 수 있도록 queued로 되돌림 (마지막 오류 기록)."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', available_at = ?, error = ? WHERE id = ?",
+                (time.time() + delay, error, job_id),
+            )
+            conn.commit()
+
+    def set_webhook_status(self, job_id: str, webhook_status: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE jobs SET webhook_status = ? WHERE id = ?", (webhook_status, job_id))
+            conn.commit()
+
+    def requeue_stale(self, older_than: float, max_attempts: int) -> Tuple[int, List[str]]:
+        """
+        started_at이 older_than 이전인 running 작업 정리.
+
+        시도 횟수가 max_attempts 미만이면 queued로 되돌리고, 이미 다 썼으면 failed로 끝냄
+        (실행할 때마다 프로세스를 죽이는 작업이 끝없이 재시도되지 않도록).
+
+        Returns:
+            (되돌린 수, failed로 끝낸 작업 ID 목록)
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            exhausted = [row[0] for row in conn.execute(
+                "SELECT id FROM jobs WHERE status = 'running' AND started_at < ? AND attempts >= ?",
+                (older_than, max_attempts),
+            ).fetchall()]
+            failed = []
+            for job_id in exhausted:
+                if conn.execute(
+                    "UPDATE jobs SET status = 'failed', result = NULL, error = ?, finished_at = ?, "
+                    "resume_text = NULL WHERE id = ? AND status = 'running'",
+                    (f"작업을 실행하던 프로세스가 {max_attempts}번 모두 응답 없이 종료됨", now, job_id),
+                ).rowcount:
+                    failed.append(job_id)
+            count = conn.execute(
+                "UPDATE jobs SET status = 'queued', available_at = ? "
+                "WHERE status = 'running' AND started_at < ?",
+                (now, older_than),
+            ).rowcount
+            conn.commit()
+        return count, failed
+
+    def purge_finished(self, older_than: float) -> int:
+        """finished_at이 older_than 이전인 끝난 작업 삭제. 삭제 수 반환."""
+        with self._lock:
+            conn = self._connect()
+            count = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                (older_than,),
+            ).rowcount
+            conn.commit()
+        return count
+
+    def counts(self) -> dict:
+        """상태별 작업 수."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """설정 기반 공유 작업 저장소 (없으면 생성)."""
+    global _store
+    if _store is None:
+        _store = JobStore(settings.JOB_STORE_PATH)
+    return _store
@@ -3,7 +3,8 @@ KPI 평가 관련 Pydantic 스키마.
 
 KPI 평가 요청/응답, 점수 결과 등의 스키마를 정의.
 """
-from typing import Optional, List
+from datetime import datetime
+from typing import Annotated, Dict, Literal, Optional, List, Union
 from pydantic import BaseModel, Field
 
 
@@ -42,7 +43,7 @@ class KPIScoreItem(BaseModel):
 class AbilityItem(BaseModel):
     """KPI별 근거 문장과 임베딩 (scores 순서와 1:1)."""
     content: Optional[str] = Field(default=None, description="해당 KPI 점수 근거 문장")
-    embedding: Optional[List[float]] = Field(default=None, description="content의 임베딩 벡터(1536차원)")
+    embedding: Optional[List[float]] = Field(default=None, description="content의 임베딩 벡터(기본 1536차원)")
 
 
 class ResumeAnalysisRequest(BaseModel):
@@ -65,6 +66,167 @@ class AnalyzeAbilitiesResponse(BaseModel):
     weaknesses: List[int] = Field(default_factory=list, description="약점 KPI ID 리스트 (하위 3개)")
 
 
+class MultiRoleAnalysisRequest(BaseModel):
+    """이력서 1건을 여러 직무로 동시에 분석하는 요청."""
+    resume_text: str = Field(..., description="이력서 텍스트")
+    roles: List[str] = Field(
+        default_factory=lambda: ["backend", "frontend", "pm", "designer"],
+        min_length=1,
+        description="분석할 직무 목록 (backend, frontend, pm, designer)",
+    )
+    include_abilities: bool = Field(default=False, description="True면 abilities(근거 문장·임베딩) 포함")
+
+
+class MultiRoleAnalysisResponse(BaseModel):
+    """직무별 분석 결과 (키: 직무명)."""
+    results: Dict[str, Union[AnalyzeAbilitiesResponse, ResumeAnalysisResponse]]
+
+
+# ===== 증분 재분석용 스키마 =====
+
+class IncrementalAnalysisRequest(BaseModel):
+    """수정된 이력서 재분석 요청 (analysis_id가 같으면 이전 분석과 비교해 바뀐 KPI만 재평가)."""
+    analysis_id: str = Field(
+        ..., min_length=1, max_length=128, description="클라이언트가 정한 분석 식별자 (같은 이력서 수정본끼리 동일)"
+    )
+    resume_text: str = Field(..., description="이력서 텍스트 (수정본)")
+    include_abilities: bool = Field(default=False, description="True면 abilities(근거 문장·임베딩) 포함")
+
+
+class IncrementalAnalysisResponse(BaseModel):
+    """증분 재분석 응답."""
+    analysis_id: str
+    reevaluated_kpis: List[int] = Field(
+        default_factory=list, description="이번 요청에서 LLM으로 다시 평가한 KPI ID (나머지는 이전 결과 재사용)"
+    )
+    result: Union[AnalyzeAbilitiesResponse, ResumeAnalysisResponse]
+
+
+# ===== 비동기 분석 작업용 스키마 =====
+
+class JobSubmitRequest(BaseModel):
+    """abilities 분석 작업 등록 요청."""
+    resume_text: str = Field(..., description="이력서 텍스트")
+    role: str = Field(..., description="직무명: backend, frontend, pm, designer")
+    priority: Literal["high", "normal", "low"] = Field(default="normal", description="우선순위 클래스")
+    webhook_url: Optional[str] = Field(
+        default=None, pattern=r"^https?://", description="완료 시 결과를 POST로 받을 URL"
+    )
+
+
+class JobStatusResponse(BaseModel):
+    """분석 작업 상태 (succeeded면 result, failed면 error)."""
+    job_id: str
+    status: str = Field(..., description="queued/running/succeeded/failed")
+    role: str
+    priority: str = Field(..., description="high/normal/low")
+    attempts: int = Field(..., description="실행 시도 횟수")
+    queue_position: int = Field(default=0, description="queued일 때 앞에 남은 작업 수")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[AnalyzeAbilitiesResponse] = None
+    error: Optional[str] = Field(default=None, description="실패 사유 (재시도 대기 중이면 마지막 오류)")
+    webhook_status: Optional[str] = Field(default=None, description="웹훅 전송 결과: delivered/failed")
+
+
+# ===== 배치 분석용 스키마 =====
+
+class BatchAnalysisItem(BaseModel):
+    """배치 분석 요청 항목 (이력서 1건)."""
+    id: Optional[str] = Field(default=None, description="클라이언트 식별자 (응답에 그대로 반환)")
+    resume_text: str = Field(..., description="이력서 텍스트")
+    role: str = Field(..., description="직무명: backend, frontend, pm, designer")
+
+
+class BatchAnalysisRequest(BaseModel):
+    """배치 분석 요청."""
+    items: List[BatchAnalysisItem] = Field(..., min_length=1, description="분석할 이력서 목록")
+    include_abilities: bool = Field(default=False, description="True면 abilities(근거 문장·임베딩) 포함")
+    max_concurrency: Optional[int] = Field(
+        default=None, ge=1, le=64, description="동시 LLM 호출 수 (미지정 시 BATCH_MAX_CONCURRENCY)"
+    )
+
+
+class BatchAnalysisResult(BaseModel):
+    """배치 분석 항목별 결과 (성공 시 result, 실패 시 error)."""
+    index: int = Field(..., description="요청 items 내 순서")
+    id: Optional[str] = Field(default=None, description="요청 항목의 id")
+    role: str
+    status: str = Field(..., description="ok/error")
+    result: Optional[Union[AnalyzeAbilitiesResponse, ResumeAnalysisResponse]] = None
+    error: Optional[str] = Field(default=None, description="실패 사유")
+
+
+class BatchAnalysisResponse(BaseModel):
+    """배치 분석 응답 (요청 순서 유지)."""
+    results: List[BatchAnalysisResult]
+    succeeded: int
+    failed: int
+
+
+# ===== abilities 유사 검색용 스키마 =====
+
+class AbilitySearchRequest(BaseModel):
+    """저장된 근거 문장 중 질의 문장과 비슷한 문장 검색 요청."""
+    role: str = Field(..., description="직무명: backend, frontend, pm, designer")
+    query: str = Field(..., min_length=1, description="질의 문장")
+    kpi_id: Optional[int] = Field(default=None, ge=1, le=10, description="지정 시 해당 KPI의 근거 문장만 검색")
+    k: int = Field(default=10, ge=1, le=100, description="반환 개수")
+    group_by_candidate: bool = Field(
+        default=False,
+        description="True면 후보자별 가장 비슷한 문장 1건씩 (상위 k명, candidate_id 없이 저장한 분석은 각각 1명으로 취급)",
+    )
+    dimensions: Optional[int] = Field(
+        default=None, ge=1, description="임베딩 차원 (저장 시 사용한 차원과 같아야 함, 미지정 시 기본 차원)"
+    )
+
+
+class AbilitySearchResult(BaseModel):
+    """유사 근거 문장 1건."""
+    candidate_id: Optional[str] = Field(default=None, description="저장 시 지정한 후보자 식별자")
+    kpi_id: int
+    kpi_name: str
+    content: str = Field(..., description="근거 문장")
+    score: float = Field(..., description="코사인 유사도")
+
+
+class AbilitySearchResponse(BaseModel):
+    """유사 근거 문장 검색 응답 (유사도 내림차순)."""
+    results: List[AbilitySearchResult]
+
+
+# ===== 이력서 + 설문 융합 분석용 스키마 =====
+
+class FusionAnalysisRequest(BaseModel):
+    """이력서와 설문 응답을 함께 받아 최종 점수를 계산하는 요청."""
+    resume_text: str = Field(..., description="이력서 텍스트")
+    q_b1: int = Field(..., ge=1, le=5, description="설문 B1 응답 (1~5)")
+    q_b2: int = Field(..., ge=1, le=5, description="설문 B2 응답 (1~5)")
+    q_b3: int = Field(..., ge=1, le=5, description="설문 B3 응답 (1~5)")
+    q_b4: int = Field(..., ge=1, le=5, description="설문 B4 응답 (1~5)")
+    q_b5: int = Field(..., ge=1, le=5, description="설문 B5 응답 (1~5)")
+
+
+class FusedKPIScore(BaseModel):
+    """이력서·설문 점수를 신뢰도 가중 평균한 KPI 최종 점수."""
+    kpi_id: int
+    kpi_name: str
+    score: int = Field(..., description="최종 점수 (40~90)")
+    level: str = Field(..., description="high/mid/low")
+    basis: str = Field(..., description="이력서 근거 수준: explicit/inferred/none")
+    resume_score: int = Field(..., description="이력서(LLM) 점수 (40~90)")
+    survey_score: int = Field(..., description="설문 폴백 점수 (0~100)")
+    resume_weight: float = Field(..., description="최종 점수에서 이력서 점수 가중치 (0~1, 나머지는 설문)")
+
+
+class FusionAnalysisResponse(BaseModel):
+    """이력서 + 설문 융합 분석 응답."""
+    scores: List[FusedKPIScore] = Field(..., description="KPI별 최종 점수")
+    strengths: List[int] = Field(default_factory=list, description="강점 KPI ID 리스트 (상위 3개)")
+    weaknesses: List[int] = Field(default_factory=list, description="약점 KPI ID 리스트 (하위 3개)")
+
+
 # ===== 폴백 로직용 스키마 =====
 
 class BackendFallbackRequest(BaseModel):
@@ -134,3 +296,26 @@ class PMFallbackResponse(BaseModel):
     """PM 폴백 평가 응답."""
     scores: List[FallbackKPIScore] = Field(..., description="폴백으로 계산된 KPI 점수")
     raw_inputs: dict = Field(..., description="원본 입력값 (q_b1~q_b5)")
+
+
+# 설문 응답 1건: [q_b1, q_b2, q_b3, q_b4, q_b5] (각 1~5)
+FallbackAnswers = Annotated[
+    List[Annotated[int, Field(ge=1, le=5)]], Field(min_length=5, max_length=5)
+]
+
+
+class FallbackBatchRequest(BaseModel):
+    """설문 폴백 일괄 계산 요청 (한 직군의 응답 N건)."""
+    role: str = Field(..., description="직무명: backend, frontend, pm, designer")
+    answers: List[FallbackAnswers] = Field(
+        ..., min_length=1, description="응답 목록, 각 항목은 [q_b1, q_b2, q_b3, q_b4, q_b5]"
+    )
+
+
+class FallbackBatchResponse(BaseModel):
+    """설문 폴백 일괄 계산 응답 (행: 요청 answers 순서, 열: kpi_ids 순서)."""
+    role: str
+    kpi_ids: List[int] = Field(..., description="열 순서의 KPI ID (1~10)")
+    kpi_names: List[str] = Field(..., description="열 순서의 KPI 이름")
+    scores: List[List[int]] = Field(..., description="응답별 KPI 점수 (0~100)")
+    levels: List[List[str]] = Field(..., description="응답별 KPI 레벨 (high/mid/low)")
@@ -0,0 +1,273 @@
+"""
+Cache utilities.
+
+- TTLCache: 프로세스 내 LRU + TTL 캐시
+- CacheBackend: 프로세스 외부 캐시 백엔드 인터페이스 (bytes 저장)
+- SQLiteCacheBackend: 로컬 SQLite 파일 기반 백엔드
+- TieredCache: 메모리 → 백엔드 순으로 조회하는 2단 캐시 (적중/미스 카운터 포함)
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+
+@dataclass
+class CacheStats:
+    """캐시 적중/미스 카운터."""
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    backend_hits: int = 0
+    sets: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "backend_hits": self.backend_hits,
+            "sets": self.sets,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class TTLCache:
+    """프로세스 내 LRU + TTL 캐시 (스레드 안전)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend:
+    """
+    프로세스 외부 캐시 백엔드 인터페이스.
+
+    값은 bytes로 저장하며, 직렬화는 TieredCache가 담당.
+    Redis 등 다른 저장소는 이 클래스를 상속해 get/set을 구현하면 됨.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """로컬 SQLite 파일 기반 캐시 백엔드 (만료 시각 컬럼으로 TTL 관리)."""
+
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl_seconds),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _json_decode(raw: bytes) -> Any:
+    return json.loads(raw.decode("utf-8"))
+
+
+class TieredCache:
+    """
+    메모리(TTLCache) → 백엔드(CacheBackend) 2단 캐시.
+
+    백엔드 적중 시 메모리 캐시에도 다시 채움.
+    encode/decode로 백엔드 저장 형식을 지정 (기본 JSON).
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        backend: Optional[CacheBackend] = None,
+        encode: Callable[[Any], bytes] = _json_encode,
+        decode: Callable[[bytes], Any] = _json_decode,
+        enabled: bool = True,
+    ):
+        self.memory = TTLCache(max_entries, ttl_seconds)
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.encode = encode
+        self.decode = decode
+        self.enabled = enabled
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats.hits += 1
+            self.stats.memory_hits += 1
+            return value
+        if self.backend is not None:
+            raw = self.backend.get(key)
+            if raw is not None:
+                value = self.decode(raw)
+                self.memory.set(key, value)
+                self.stats.hits += 1
+                self.stats.backend_hits += 1
+                return value
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        self.memory.set(key, value)
+        if self.backend is not None:
+            self.backend.set(key, self.encode(value), self.ttl_seconds)
+        self.stats.sets += 1
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 조회. 적중한 키만 담은 dict 반환."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        for key, value in items.items():
+            self.set(key, value)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get의 비동기 버전 (백엔드 I/O는 스레드에서 실행)."""
+        if not self.enabled:
+            return None
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats.hits += 1
+            self.stats.memory_hits += 1
+            return value
+        if self.backend is None:
+            self.stats.misses += 1
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """set의 비동기 버전 (백엔드 I/O는 스레드에서 실행)."""
+        if not self.enabled:
+            return
+        if self.backend is None:
+            self.set(key, value)
+            return
+        await asyncio.to_thread(self.set, key, value)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """get_many의 비동기 버전 (백엔드가 있으면 스레드에서 일괄 조회)."""
+        if self.backend is None:
+            return self.get_many(keys)
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aset_many(self, items: Dict[str, Any]) -> None:
+        """set_many의 비동기 버전."""
+        if self.backend is None:
+            self.set_many(items)
+            return
+        await asyncio.to_thread(self.set_many, items)
+
+
+def build_backend(table: str) -> Optional[CacheBackend]:
+    """
+    설정(CACHE_BACKEND)에 맞는 프로세스 외부 백엔드 생성.
+
+    Args:
+        table: 백엔드 내에서 캐시를 구분하는 이름 (SQLite 테이블명)
+
+    Returns:
+        "sqlite"이면 SQLiteCacheBackend, "memory"면 None (메모리 캐시만 사용)
+    """
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(settings.CACHE_SQLITE_PATH, table=table)
+    return None
@@ -0,0 +1,220 @@
+"""
+IVF(Inverted File) 근사 최근접 이웃 인덱스.
+
+정규화된 float32 벡터(코사인 유사도 = 내적)를 구형 k-means로 nlist개 군집에 나누고,
+벡터 파일을 군집 순서로 재배열해 디스크에 저장 (np.memmap으로 읽음).
+검색 시 질의와 가까운 nprobe개 군집의 연속 구간만 내적하므로
+전체 벡터 수와 무관하게 (nprobe / nlist) 비율만큼만 계산함.
+
+파일 구성 (prefix 기준):
+- {prefix}.centroids.npy: (nlist, dims) 군집 중심
+- {prefix}.offsets.npy:   (nlist + 1,) 군집별 시작 위치
+- {prefix}.ids.npy:       (n,) 재배열된 순서의 원본 행 번호
+- {prefix}.tags.npy:      (n,) 필터용 정수 태그 (KPI ID 등)
+- {prefix}.vectors.f32:   (n, dims) 재배열된 벡터 (memmap)
+"""
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+_FILES = ("centroids.npy", "offsets.npy", "ids.npy", "tags.npy", "vectors.f32", "meta.json")
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _assign(
+    vectors: np.ndarray,
+    centroids: np.ndarray,
+    rows: Optional[np.ndarray] = None,
+    chunk: int = 65536,
+) -> np.ndarray:
+    """각 벡터(rows 지정 시 해당 행)의 가장 가까운(내적 최대) 군집 번호."""
+    n = len(rows) if rows is not None else len(vectors)
+    out = np.empty(n, dtype=np.int32)
+    for start in range(0, n, chunk):
+        if rows is not None:
+            block = vectors[rows[start:start + chunk]]
+        else:
+            block = vectors[start:start + chunk]
+        block = np.asarray(block, dtype=np.float32)
+        out[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    rows: np.ndarray,
+    nlist: int,
+    iters: int = 10,
+    sample_size: int = 100_000,
+    seed: int = 0,
+) -> np.ndarray:
+    """rows 중 표본에 대해 구형 k-means를 돌려 (nlist, dims) 정규화 중심을 반환."""
+    rng = np.random.default_rng(seed)
+    sample_rows = np.sort(rng.choice(rows, size=min(len(rows), sample_size), replace=False))
+    sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iters):
+        assign = _assign(sample, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        starts = np.cumsum(counts) - counts
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(sample[order], starts[~empty], axis=0)
+        # 빈 군집은 임의 표본으로 다시 시작
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+
+@dataclass
+class IVFIndex:
+    """디스크에 저장된 IVF 인덱스 (벡터는 memmap)."""
+    centroids: np.ndarray
+    offsets: np.ndarray
+    ids: np.ndarray
+    tags: np.ndarray
+    vectors: np.ndarray
+    max_id: int
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        tags: np.ndarray,
+        prefix: str,
+        nlist: Optional[int] = None,
+        iters: int = 10,
+    ) -> "IVFIndex":
+        """
+        vectors의 ids 행들로 인덱스를 만들어 prefix 경로에 저장하고 로드된 인덱스를 반환.
+
+        전체를 메모리에 올리지 않고 청크 단위로 읽으므로 memmap 원본을 그대로 넘기면 됨.
+
+        Args:
+            vectors: (N, dims) 정규화된 float32 벡터 원본 (memmap 가능)
+            ids: (n,) 인덱스에 넣을 행 번호 (검색 결과로 그대로 반환됨)
+            tags: (n,) 필터용 정수 태그
+            prefix: 저장 경로 접두어 (빌드마다 고유한 임시 파일에 쓴 뒤 교체)
+            nlist: 군집 수 (None이면 약 √n)
+            iters: k-means 반복 수
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        n, dims = len(ids), vectors.shape[1]
+        if nlist is None:
+            nlist = max(1, int(np.sqrt(n)))
+        nlist = max(1, min(nlist, n))
+
+        centroids = train_centroids(vectors, ids, nlist, iters=iters)
+        assign = _assign(vectors, centroids, rows=ids)
+        order = np.argsort(assign, kind="stable")
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=nlist), out=offsets[1:])
+
+        tmp = f"{prefix}.tmp.{os.getpid()}.{uuid.uuid4().hex[:8]}"
+        try:
+            out = np.memmap(f"{tmp}.vectors.f32", dtype=np.float32, mode="w+", shape=(n, dims))
+            chunk = 65536
+            for start in range(0, n, chunk):
+                out[start:start + chunk] = vectors[ids[order[start:start + chunk]]]
+            out.flush()
+            del out
+            np.save(f"{tmp}.centroids.npy", centroids)
+            np.save(f"{tmp}.offsets.npy", offsets)
+            np.save(f"{tmp}.ids.npy", ids[order])
+            np.save(f"{tmp}.tags.npy", np.asarray(tags, dtype=np.int16)[order])
+            with open(f"{tmp}.meta.json", "w") as f:
+                json.dump({"count": int(n), "dims": int(dims), "nlist": int(nlist)}, f)
+            for name in _FILES:
+                os.replace(f"{tmp}.{name}", f"{prefix}.{name}")
+        finally:
+            for name in _FILES:
+                if os.path.exists(f"{tmp}.{name}"):
+                    os.remove(f"{tmp}.{name}")
+        return cls.load(prefix)
+
+    @classmethod
+    def load(cls, prefix: str) -> Optional["IVFIndex"]:
+        """prefix 경로의 인덱스 로드 (없으면 None)."""
+        if not os.path.exists(f"{prefix}.meta.json"):
+            return None
+        with open(f"{prefix}.meta.json") as f:
+            meta = json.load(f)
+        ids = np.load(f"{prefix}.ids.npy")
+        if meta["count"]:
+            vectors = np.memmap(
+                f"{prefix}.vectors.f32", dtype=np.float32, mode="r", shape=(meta["count"], meta["dims"])
+            )
+        else:
+            vectors = np.zeros((0, meta["dims"]), dtype=np.float32)
+        return cls(
+            centroids=np.load(f"{prefix}.centroids.npy"),
+            offsets=np.load(f"{prefix}.offsets.npy"),
+            ids=ids,
+            tags=np.load(f"{prefix}.tags.npy"),
+            vectors=vectors,
+            max_id=int(ids.max()) if len(ids) else -1,
+        )
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: int = 8,
+        tag: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        질의 벡터와 내적이 큰 상위 k개 검색.
+
+        Args:
+            query: (dims,) 정규화된 질의 벡터
+            k: 반환 개수
+            nprobe: 탐색할 군집 수 (클수록 정확, 느림)
+            tag: 지정 시 해당 태그의 벡터만 대상
+
+        Returns:
+            (scores, ids) — 점수 내림차순
+        """
+        if not self.size:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        nprobe = min(nprobe, len(self.centroids))
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        scores, ids = [], []
+        for lst in probe:
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if start == end:
+                continue
+            block_scores = self.vectors[start:end] @ query
+            block_ids = self.ids[start:end]
+            if tag is not None:
+                mask = self.tags[start:end] == tag
+                block_scores, block_ids = block_scores[mask], block_ids[mask]
+            scores.append(block_scores)
+            ids.append(block_ids)
+        if not scores:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        return top_k(np.concatenate(scores), np.concatenate(ids), k)
+
+
+def top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """점수 상위 k개를 내림차순으로."""
+    if len(scores) > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+        scores, ids = scores[part], ids[part]
+    order = np.argsort(-scores)
+    return scores[order], ids[order]
@@ -0,0 +1,82 @@
+"""
+Single-flight (동시 요청 병합) 유틸.
+
+같은 키로 동시에 들어온 비동기 호출은 업스트림 호출을 한 번만 실행하고,
+기다리던 모든 호출자가 같은 결과(또는 같은 예외)를 받음.
+호출이 끝나면 키를 바로 비우므로 결과 자체를 보관하지는 않음 (보관은 캐시 담당).
+
+요청 마감(app.core.deadline)은 호출자마다 따로 적용: 공유 호출은 먼저 호출한 요청의 마감이
+아닌 자체 마감으로 실행하고, 각 호출자는 자기 마감까지만 결과를 기다림.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.deadline import deadline_scope, remaining, wait_within_deadline
+
+
+@dataclass
+class SingleFlightStats:
+    """업스트림 실행 수 / 병합된(실행 없이 결과를 공유한) 호출 수."""
+    executed: int = 0
+    shared: int = 0
+
+    def as_dict(self) -> dict:
+        return {"executed": self.executed, "shared": self.shared}
+
+
+class SingleFlight:
+    """
+    키별로 진행 중인 호출을 하나만 유지하는 병합기.
+
+    업스트림 호출은 별도 Task로 실행하므로, 먼저 호출한 요청이 취소되거나 마감이 지나도
+    (클라이언트 연결 종료, 짧은 X-Request-Timeout 등) 함께 기다리던 다른 요청은 결과를 받음.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn()을 실행.
+
+        Args:
+            key: 병합 기준 키 (같은 결과를 돌려줘도 되는 요청끼리 같은 값)
+            fn: 업스트림 호출 (인자 없는 코루틴 함수)
+        """
+        task = self._calls.get(key)
+        if task is None:
+            with deadline_scope(_flight_deadline_seconds(), inherit=False):
+                task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.stats.executed += 1
+        else:
+            self.stats.shared += 1
+        return await wait_within_deadline(asyncio.shield(task))
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 기다리던 호출자가 모두 취소된 경우에도 예외 미회수 경고가 나지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """현재 진행 중인 키 수."""
+        return len(self._calls)
+
+
+def _flight_deadline_seconds() -> Optional[float]:
+    """
+    공유 호출의 마감까지 시간: 기본 요청 마감과 첫 호출자의 남은 시간 중 긴 쪽.
+
+    짧은 마감의 호출자가 다른 호출자의 결과까지 실패시키지 않도록 하고,
+    작업(job)처럼 더 긴 마감으로 시작한 호출은 그 마감을 유지. 둘 중 하나라도 마감이 없으면 없음.
+    """
+    left = remaining()
+    if left is None or settings.REQUEST_DEADLINE_SECONDS <= 0:
+        return None
+    return max(settings.REQUEST_DEADLINE_SECONDS, left)
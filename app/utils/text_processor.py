@@ -1,3 +1,97 @@
 """
 Text processing utilities.
 """
+import re
+import unicodedata
+
+_HORIZONTAL_SPACE = re.compile(r"[ \t 　]+")
+_EXCESS_NEWLINES = re.compile(r"\n{3,}")
+
+
+def normalize_resume_text(text: str) -> str:
+    """
+    이력서 텍스트 정규화.
+
+    의미는 바꾸지 않고 공백 차이만 제거해, 같은 이력서를
+    다시 제출했을 때 동일한 텍스트(캐시 키)가 되도록 함.
+    - 유니코드 NFC 정규화, 줄바꿈 통일(CRLF → LF)
+    - 연속 공백·탭을 공백 하나로, 각 줄 앞뒤 공백 제거
+    - 3줄 이상 연속 빈 줄은 한 줄로
+    """
+    s = unicodedata.normalize("NFC", text or "")
+    s = s.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_HORIZONTAL_SPACE.sub(" ", line).strip() for line in s.split("\n")]
+    s = "\n".join(lines)
+    s = _EXCESS_NEWLINES.sub("\n\n", s)
+    return s.strip()
+
+
+# 평가와 무관한 상용구 섹션 제목 (해당 섹션은 압축 시 통째로 제거)
+BOILERPLATE_HEADINGS = (
+    "인적사항", "개인정보", "연락처", "주소", "취미", "특기", "병역", "참고사항", "추천인",
+    "contact", "personal information", "hobbies", "interests", "references",
+)
+
+# 평가에 쓰는 섹션 제목 (표시 없이 쓴 제목도 상용구 섹션 제거를 끝내는 기준, 앞부분 일치)
+CONTENT_HEADINGS = (
+    "경력", "프로젝트", "기술", "보유 기술", "보유기술", "스킬", "학력", "교육", "자격", "수상",
+    "활동", "대외활동", "자기소개", "소개", "요약", "성과", "업무", "담당 업무", "포트폴리오",
+    "오픈소스", "논문", "발표", "어학", "연구",
+    "experience", "work", "career", "project", "skill", "tech", "education", "certification",
+    "award", "activit", "summary", "about", "profile", "publication", "open source", "research",
+)
+
+_HEADING_MARK = re.compile(r"^\s*(#{1,6}\s*|[■□●○◆◇▶▷\-*]\s*|\[|【)")
+# 상용구 섹션 제거를 끝내는 제목 표시 (-, * 목록 기호는 섹션 본문에도 쓰이므로 제외)
+_SECTION_MARK = re.compile(r"^\s*(#{1,6}\s*|[■□●○◆◇▶▷]\s*|\[|【)")
+_CONTACT_LABEL = r"(?:e-?mail|이메일|phone|tel|전화|휴대폰|핸드폰|mobile)\s*[:：]?\s*"
+# 숫자만 있는 줄은 "2019 - 2023" 같은 재직 기간일 수 있으므로, 라벨이 없으면
+# 0 또는 +로 시작하고 숫자가 10개 이상인 전화번호 모양일 때만 연락처로 봄
+_CONTACT_LINE = re.compile(
+    r"^\s*(?:"
+    rf"(?:{_CONTACT_LABEL})?[\w.+-]+@[\w-]+\.[\w.]+"
+    rf"|{_CONTACT_LABEL}\+?\d[\d\s().-]{{6,}}\d"
+    r"|(?=(?:\D*\d){10})[+0][\d\s().-]{8,}\d"
+    r")\s*$",
+    re.IGNORECASE,
+)
+
+
+def _heading_title(line: str) -> str | None:
+    """섹션 제목 줄이면 제목 텍스트(소문자), 아니면 None."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 30 or stripped.endswith("."):
+        return None
+    title = _HEADING_MARK.sub("", stripped).strip(" []【】:：").lower()
+    return title or None
+
+
+def compact_resume_text(text: str) -> str:
+    """
+    토큰 예산 초과 시 사용하는 이력서 압축.
+
+    - 같은 내용의 줄이 반복되면 첫 줄만 유지
+    - 연락처(이메일·전화번호)만 있는 줄 제거
+    - 인적사항·취미·추천인 등 상용구 섹션 제거 (다음 섹션 제목 전까지)
+    """
+    kept = []
+    seen = set()
+    skipping = False
+    for line in normalize_resume_text(text).split("\n"):
+        title = _heading_title(line)
+        # 상용구 제목에서 제거 시작. 본문의 짧은 줄("독서", "홍길동")도 제목처럼 보이므로
+        # 제목 표시(#, ■, [ 등)가 있는 줄이나 알려진 평가 섹션 제목에서만 제거 종료
+        if title is not None:
+            if title in BOILERPLATE_HEADINGS:
+                skipping = True
+            elif skipping and (_SECTION_MARK.match(line) or title.startswith(CONTENT_HEADINGS)):
+                skipping = False
+        if skipping or _CONTACT_LINE.match(line):
+            continue
+        key = line.strip()
+        if key and key in seen:
+            continue
+        if key:
+            seen.add(key)
+        kept.append(line)
+    return _EXCESS_NEWLINES.sub("\n\n", "\n".join(kept)).strip()
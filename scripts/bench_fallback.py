@@ -0,0 +1,101 @@
+"""
+설문 폴백 계산 벤치마크.
+
+직군별 폴백 점수 계산 방식을 비교:
+- loop:   질문별 가중치 딕셔너리를 순회하는 가중 평균 (기존 방식, 참고 구현)
+- matmul: 정규화 가중치 행렬과의 행렬곱 (조회표 없이 직접 계산)
+- table:  미리 계산한 조회표 한 행 조회 (현재 calculate_fallback_scores 경로)
+- api:    /api/kpi/fallback/{role} 엔드포인트 전체 (TestClient, --api 지정 시)
+
+실행:
+    python -m scripts.bench_fallback [--role backend] [--n 20000] [--api]
+"""
+import argparse
+import importlib
+import random
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from app.domains.kpi.fallback_engine import CHOICE_TO_SCORE, _weighted_scores, get_fallback_engine
+
+
+def loop_scores(weights: Sequence[Dict[int, float]], answers: Sequence[int]) -> List[int]:
+    """질문별 가중치 딕셔너리를 순회하는 가중 평균 (조회표 도입 전 방식)."""
+    contributions: Dict[int, List[tuple]] = {i: [] for i in range(1, 11)}
+    for q_weights, answer in zip(weights, answers):
+        score = CHOICE_TO_SCORE.get(answer, 50)
+        for kpi_id, weight in q_weights.items():
+            contributions[kpi_id].append((score, weight))
+    results = []
+    for kpi_id in range(1, 11):
+        items = contributions[kpi_id]
+        total = sum(w for _, w in items)
+        final = round(sum(s * w for s, w in items) / total) if total > 0 else 50
+        results.append(max(0, min(100, final)))
+    return results
+
+
+def bench(name: str, fn: Callable[[Sequence[int]], object], samples: List[List[int]]) -> float:
+    start = time.perf_counter()
+    for answers in samples:
+        fn(answers)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>8}: {elapsed / len(samples) * 1e6:8.2f} us/call")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="설문 폴백 계산 벤치마크")
+    parser.add_argument("--role", default="backend", choices=["backend", "frontend", "pm", "designer"])
+    parser.add_argument("--n", type=int, default=20000, help="측정할 응답 수")
+    parser.add_argument("--api", action="store_true", help="엔드포인트 전체 지연도 측정")
+    args = parser.parse_args()
+
+    module = importlib.import_module(f"app.domains.kpi.fallback_{args.role}")
+    weights = [module.Q_B1_WEIGHTS, module.Q_B2_WEIGHTS, module.Q_B3_WEIGHTS,
+               module.Q_B4_WEIGHTS, module.Q_B5_WEIGHTS]
+    engine = get_fallback_engine(args.role)
+
+    rng = random.Random(0)
+    samples = [[rng.randint(1, 5) for _ in range(5)] for _ in range(args.n)]
+    for answers in samples[:1000]:
+        assert loop_scores(weights, answers) == engine.score_row(*answers)
+
+    print(f"role={args.role} n={args.n} table={engine.table.shape} {engine.table.dtype} "
+          f"({engine.table.nbytes} bytes)")
+    print("-- 점수만 계산 (1건씩)")
+    loop = bench("loop", lambda a: loop_scores(weights, a), samples)
+    bench("matmul", lambda a: _weighted_scores(np.array([a]), engine.weights, engine.covered), samples)
+    table = bench("table", lambda a: engine.score_row(*a), samples)
+    print(f"   table vs loop: x{loop / table:.1f}")
+
+    print("-- calculate_fallback_scores (응답 dict 포함)")
+    bench("table", lambda a: module.calculate_fallback_scores(*a), samples)
+
+    print("-- 일괄 계산 (N건 한 번에)")
+    batch = np.asarray(samples)
+    start = time.perf_counter()
+    _weighted_scores(batch, engine.weights, engine.covered)
+    print(f"  matmul: {(time.perf_counter() - start) * 1e3:8.2f} ms")
+    start = time.perf_counter()
+    engine.score_matrix(batch)
+    print(f"   table: {(time.perf_counter() - start) * 1e3:8.2f} ms")
+
+    if args.api:
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        keys = ["q_b1", "q_b2", "q_b3", "q_b4", "q_b5"]
+        api_samples = samples[: min(args.n, 2000)]
+        with TestClient(app) as client:
+            print("-- API (TestClient, 요청 1건씩)")
+            bench("api", lambda a: client.post(
+                f"/api/kpi/fallback/{args.role}", json=dict(zip(keys, a))
+            ).raise_for_status(), api_samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+IVF 인덱스 벤치마크 (abilities 유사 검색).
+
+군집 구조가 있는 정규화 벡터 N개를 memmap 파일로 만들고 IVFIndex를 빌드한 뒤
+질의 지연 시간(p50/p95)과 전수 비교 대비 recall@k를 측정.
+실제 임베딩처럼 벡터가 몇 개 주제 주변에 몰려 있도록 중심 + 잡음으로 생성.
+
+실행:
+    python -m scripts.bench_ivf [--n 1000000] [--dims 256] [--nprobe 8 16 32 64]
+    python -m scripts.bench_ivf --n 100000 --queries 200   # 빠른 확인
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from app.utils.ivf_index import IVFIndex
+
+
+def make_vectors(path: str, n: int, dims: int, topics: int, noise: float, seed: int = 0) -> np.ndarray:
+    """topics개 중심 주변에 모인 정규화 float32 벡터 n개를 path에 memmap으로 생성."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dims)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    out = np.memmap(path, dtype=np.float32, mode="w+", shape=(n, dims))
+    chunk = 65536
+    for start in range(0, n, chunk):
+        size = min(chunk, n - start)
+        block = centers[rng.integers(0, topics, size)] + noise * rng.standard_normal((size, dims)).astype(np.float32)
+        out[start:start + size] = block / np.linalg.norm(block, axis=1, keepdims=True)
+    out.flush()
+    return np.memmap(path, dtype=np.float32, mode="r", shape=(n, dims))
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    """전수 내적으로 질의별 정답 상위 k개 행 번호."""
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_ids = np.empty((len(queries), 0), dtype=np.int64)
+    chunk = 65536
+    for start in range(0, len(vectors), chunk):
+        block = np.asarray(vectors[start:start + chunk]) @ queries.T
+        ids = np.arange(start, start + len(block), dtype=np.int64)
+        best_scores = np.concatenate([best_scores, block.T], axis=1)
+        best_ids = np.concatenate([best_ids, np.broadcast_to(ids, (len(queries), len(ids)))], axis=1)
+        if best_scores.shape[1] > k:
+            part = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(best_scores, part, axis=1)
+            best_ids = np.take_along_axis(best_ids, part, axis=1)
+    return [set(row.tolist()) for row in best_ids]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="IVF 인덱스 빌드·검색 벤치마크")
+    parser.add_argument("--n", type=int, default=1_000_000, help="벡터 수")
+    parser.add_argument("--dims", type=int, default=256)
+    parser.add_argument("--topics", type=int, default=2000, help="벡터가 모이는 중심 수")
+    parser.add_argument("--noise", type=float, default=0.08, help="중심 주변 잡음 크기")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=500, help="측정할 질의 수")
+    parser.add_argument("--recall-queries", type=int, default=100, help="recall 계산에 쓸 질의 수")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--dir", help="작업 디렉토리 (기본: 임시 디렉토리, 끝나면 삭제)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        start = time.perf_counter()
+        vectors = make_vectors(os.path.join(directory, "vectors.f32"), args.n, args.dims, args.topics, args.noise)
+        print(f"n={args.n} dims={args.dims} ({vectors.nbytes / 2**20:.0f} MiB) "
+              f"생성 {time.perf_counter() - start:.1f}s")
+
+        ids = np.arange(args.n, dtype=np.int64)
+        tags = np.zeros(args.n, dtype=np.int16)
+        start = time.perf_counter()
+        index = IVFIndex.build(vectors, ids, tags, os.path.join(directory, "bench.ivf"))
+        print(f"build: {time.perf_counter() - start:.1f}s  nlist={len(index.centroids)}")
+
+        # 질의: 저장된 벡터 근처의 새 문장을 흉내 냄
+        rng = np.random.default_rng(1)
+        queries = np.asarray(vectors[rng.integers(0, args.n, args.queries)])
+        queries = queries + args.noise * rng.standard_normal(queries.shape).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+        start = time.perf_counter()
+        truth = exact_top_k(vectors, queries[:args.recall_queries], args.k)
+        print(f"exact: {(time.perf_counter() - start) / len(truth) * 1e3:8.2f} ms/query (전수 비교)")
+
+        for nprobe in args.nprobe:
+            latencies, hits = [], 0
+            for i, query in enumerate(queries):
+                start = time.perf_counter()
+                _, found = index.search(query, args.k, nprobe=nprobe)
+                latencies.append(time.perf_counter() - start)
+                if i < len(truth):
+                    hits += len(truth[i] & set(found.tolist()))
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f"nprobe={nprobe:>3}: p50 {statistics.median(latencies) * 1e3:6.2f} ms  "
+                  f"p95 {p95 * 1e3:6.2f} ms  recall@{args.k} {hits / (len(truth) * args.k):.3f}")
+        del index, vectors
+
+
+if __name__ == "__main__":
+    main()
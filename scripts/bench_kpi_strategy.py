@@ -0,0 +1,125 @@
+"""
+KPI 평가 방식(single vs grouped) 지연 시간 벤치마크.
+
+같은 이력서를 두 방식으로 반복 평가해 요청 1건의 wall-clock 지연 시간과
+토큰 사용량을 비교 (캐시를 거치지 않는 evaluate_kpis_async 직접 호출).
+
+- 실제 API: OPENAI_API_KEY 필요
+    python -m scripts.bench_kpi_strategy --role backend --resume resume.txt --repeat 5
+- 모의 실행 (--simulate): 첫 토큰 지연 + 출력 토큰당 지연을 흉내 낸 가짜 클라이언트
+    python -m scripts.bench_kpi_strategy --simulate --ttft 0.5 --tpot 0.012
+"""
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+import types
+from typing import Dict, List
+
+import app.ai.clients as clients
+from app.ai.tokens import count_tokens
+from app.ai.usage import get_usage_stats
+from app.core.config import settings
+from app.domains.kpi.scorer import evaluate_kpis_async, kpi_groups, prepare_resume_text
+
+SAMPLE_RESUME = """
+Java/Spring Boot 기반 주문·결제 서비스 백엔드를 3년간 개발·운영했다.
+주문 조회 API 응답 시간이 피크 시간대 1.2초까지 늘어나 슬로우 쿼리를 분석하고 복합 인덱스와 Redis 캐시를 도입해 0.3초로 줄였다.
+결제 실패 재처리를 위해 Kafka 기반 비동기 이벤트 구조로 전환하고 멱등성 키를 설계했다.
+AWS ECS와 GitHub Actions로 배포 파이프라인을 구성하고 Grafana 대시보드와 알림을 구축했다.
+장애 발생 시 포스트모템 문서를 작성해 재발 방지 항목을 팀과 공유했다.
+JWT 기반 인증과 역할별 권한 체크를 구현했고, 주요 도메인 서비스에 JUnit 테스트를 작성했다.
+"""
+
+
+class _SimulatedCompletions:
+    """요청한 KPI 수만큼 JSON을 만들고, 출력 토큰 수에 비례해 기다렸다 응답."""
+
+    def __init__(self, ttft: float, tpot: float):
+        self.ttft = ttft
+        self.tpot = tpot
+
+    async def create(self, messages: List[Dict[str, str]], **kwargs):
+        # 마지막 user 메시지(평가 대상 KPI 지시문)에 적힌 키만 출력
+        kpi_ids = [int(k) for k in re.findall(r'"(\d+)"', messages[-1]["content"])]
+        content = json.dumps({
+            str(kpi_id): {
+                "score": 70,
+                "basis": "explicit",
+                "reason": "운영 중 발생한 문제를 분석하고 구조를 개선해 성능을 높인 경험이 있다.",
+            }
+            for kpi_id in kpi_ids
+        }, ensure_ascii=False)
+        completion_tokens = count_tokens(content)
+        await asyncio.sleep(self.ttft + self.tpot * completion_tokens)
+        prompt_tokens = sum(count_tokens(m["content"]) for m in messages)
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))],
+            usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+        )
+
+
+def _install_simulated_client(ttft: float, tpot: float) -> None:
+    clients._async_client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=_SimulatedCompletions(ttft, tpot)),
+    )
+
+
+async def _run(strategy: str, resume_text: str, role: str, repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await evaluate_kpis_async(resume_text, role, strategy=strategy)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _usage_delta(before: Dict[str, dict], after: Dict[str, dict], role: str) -> Dict[str, int]:
+    b, a = before.get(role, {}), after.get(role, {})
+    keys = ("requests", "prompt_tokens", "completion_tokens", "cached_tokens")
+    return {key: a.get(key, 0) - b.get(key, 0) for key in keys}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="KPI 평가 방식 지연 시간 비교")
+    parser.add_argument("--role", default="backend", choices=["backend", "frontend", "pm", "designer"])
+    parser.add_argument("--resume", help="이력서 텍스트 파일 (기본: 내장 예시)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--group-size", type=int, default=settings.KPI_GROUP_SIZE)
+    parser.add_argument("--simulate", action="store_true", help="API 대신 지연을 흉내 낸 가짜 클라이언트 사용")
+    parser.add_argument("--ttft", type=float, default=0.5, help="(simulate) 첫 토큰까지 지연(초)")
+    parser.add_argument("--tpot", type=float, default=0.012, help="(simulate) 출력 토큰당 지연(초)")
+    args = parser.parse_args()
+
+    settings.KPI_GROUP_SIZE = args.group_size
+    if args.simulate:
+        _install_simulated_client(args.ttft, args.tpot)
+    else:
+        clients.init_clients()
+
+    resume_text = SAMPLE_RESUME
+    if args.resume:
+        with open(args.resume, encoding="utf-8") as f:
+            resume_text = f.read()
+    resume_text = prepare_resume_text(resume_text, args.role)
+
+    print(f"role={args.role} repeat={args.repeat} groups={kpi_groups(strategy='grouped')}")
+    for strategy in ("single", "grouped"):
+        before = get_usage_stats()
+        latencies = await _run(strategy, resume_text, args.role, args.repeat)
+        usage = _usage_delta(before, get_usage_stats(), args.role)
+        print(
+            f"{strategy:>8}: mean {statistics.mean(latencies):6.2f}s  "
+            f"p50 {statistics.median(latencies):6.2f}s  max {max(latencies):6.2f}s  "
+            f"calls {usage['requests']}  prompt {usage['prompt_tokens']}  "
+            f"cached {usage['cached_tokens']}  completion {usage['completion_tokens']}"
+        )
+
+    if not args.simulate:
+        await clients.close_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
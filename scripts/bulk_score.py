@@ -0,0 +1,516 @@
+"""
+이력서 아카이브 일괄 재채점 CLI.
+
+JSONL 입력({"id", "role", "resume_text"} 한 줄에 1건)을 한 줄씩 읽어
+KPI 평가 파이프라인(calculate_kpi_scores_async)으로 동시에 채점하고,
+끝나는 대로 결과를 JSONL 또는 Parquet으로 이어 씀 (입력 전체를 메모리에 올리지 않음).
+
+- 동시성: --concurrency개까지만 평가 진행 (읽기도 그만큼만 앞서 나감)
+- 체크포인트: 끝난 입력 줄 번호와 출력 위치를 <output>.ckpt에 주기적으로 저장
+- 재시작: 같은 명령을 다시 실행하면 체크포인트 이후에 쓴 출력을 잘라 내고 남은 줄만 채점
+  (체크포인트에 없는 결과는 다시 계산하므로 출력에 중복이 생기지 않음).
+  체크포인트 없이 이전 출력이 남아 있으면 --overwrite를 줘야 덮어씀
+- 실패: 업스트림 한도·마감 초과·LLM 오류는 --max-retries까지 재시도, 끝내 실패하면 status="error" 결과
+- --backend batch: 분당 한도 대신 OpenAI Batch API(app.ai.batch)로 --batch-requests건씩 묶어 채점.
+  제출한 배치 ID를 체크포인트에 저장해 재시작 시 다시 제출하지 않고 결과를 이어 받음
+
+출력 형식:
+- JSONL (기본): {"line", "id", "role", "status", "error", "strengths", "weaknesses", "scores": {kpi_id: {...}}}
+- Parquet (--format parquet): 출력 경로를 디렉토리로 보고 --batch-size행마다 part-NNNNN.parquet 파일 작성
+  (KPI별 kpi{N}_score / kpi{N}_basis / kpi{N}_reason 열). `pip install pyarrow` 필요
+
+실행:
+    python -m scripts.bulk_score resumes.jsonl scores.jsonl --concurrency 16
+    python -m scripts.bulk_score resumes.jsonl scores/ --format parquet --batch-size 1000
+    python -m scripts.bulk_score resumes.jsonl scores.jsonl --backend batch --batch-requests 20000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import app.ai.clients as clients
+from app.ai.rate_limit import UpstreamBusyError, get_rate_limit_stats
+from app.core.config import settings
+from app.core.deadline import DeadlineExceededError, deadline_scope
+from app.domains.kpi.kpi_constants import ALLOWED_ROLES
+from app.domains.kpi.scorer import (
+    calculate_kpi_scores_async,
+    calculate_kpi_scores_batch_async,
+    get_top_bottom_kpis,
+)
+
+KPI_IDS = range(1, 11)
+
+
+class Checkpoint:
+    """
+    끝난 입력 줄 기록.
+
+    done_below 미만의 줄은 모두 끝났고, 그 이상은 done에 있는 줄만 끝남.
+    (결과가 순서 없이 끝나도 저장 크기는 동시성 정도로 유지)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done_below = 0
+        self.done: Set[int] = set()
+        self.output_position = 0  # JSONL: 출력 파일 바이트 수, Parquet: 다음 part 번호
+        self.batch_ids: List[str] = []  # --backend batch: 아직 출력에 반영하지 않은 묶음의 배치
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        checkpoint = cls(path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            checkpoint.done_below = data["done_below"]
+            checkpoint.done = set(data["done"])
+            checkpoint.output_position = data["output_position"]
+            checkpoint.batch_ids = data.get("batch_ids", [])
+        return checkpoint
+
+    def is_done(self, line: int) -> bool:
+        return line < self.done_below or line in self.done
+
+    def mark(self, lines: List[int]) -> None:
+        self.done.update(lines)
+        while self.done_below in self.done:
+            self.done.discard(self.done_below)
+            self.done_below += 1
+
+    def save(self) -> None:
+        """임시 파일에 쓰고 교체 (중간에 종료돼도 이전 체크포인트 유지)."""
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "done_below": self.done_below,
+                "done": sorted(self.done),
+                "output_position": self.output_position,
+                "batch_ids": self.batch_ids,
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+class JSONLWriter:
+    """결과를 JSONL로 이어 씀. 재시작 시 체크포인트 위치 이후를 잘라 냄."""
+
+    def __init__(self, path: str, checkpoint: Checkpoint):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.f = open(path, "ab")
+        self.f.truncate(checkpoint.output_position)
+        self.f.seek(checkpoint.output_position)
+        self.pending: List[int] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.pending.append(record["line"])
+
+    def commit(self, checkpoint: Checkpoint) -> None:
+        """쓴 결과를 디스크에 반영한 뒤 체크포인트 저장."""
+        if not self.pending:
+            return
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        checkpoint.output_position = self.f.tell()
+        checkpoint.mark(self.pending)
+        checkpoint.save()
+        self.pending = []
+
+    def should_commit(self, every: int) -> bool:
+        return len(self.pending) >= every
+
+    def close(self) -> None:
+        self.f.close()
+
+
+def _flatten(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Parquet 1행 (KPI별 열로 펼침)."""
+    row = {
+        "line": record["line"],
+        "id": None if record["id"] is None else str(record["id"]),
+        "role": None if record["role"] is None else str(record["role"]),
+        "status": record["status"],
+        "error": record["error"],
+        "strengths": record["strengths"],
+        "weaknesses": record["weaknesses"],
+    }
+    scores = record.get("scores") or {}
+    for kpi_id in KPI_IDS:
+        data = scores.get(str(kpi_id)) or {}
+        row[f"kpi{kpi_id}_score"] = data.get("score")
+        row[f"kpi{kpi_id}_basis"] = data.get("basis")
+        row[f"kpi{kpi_id}_reason"] = data.get("reason")
+    return row
+
+
+def _parquet_schema():
+    """part 파일 공통 스키마 (배치에 값이 모두 비어 있어도 파일마다 열 타입이 같도록 고정)."""
+    import pyarrow as pa
+
+    fields = [
+        ("line", pa.int64()),
+        ("id", pa.string()),
+        ("role", pa.string()),
+        ("status", pa.string()),
+        ("error", pa.string()),
+        ("strengths", pa.list_(pa.int64())),
+        ("weaknesses", pa.list_(pa.int64())),
+    ]
+    for kpi_id in KPI_IDS:
+        fields += [
+            (f"kpi{kpi_id}_score", pa.int64()),
+            (f"kpi{kpi_id}_basis", pa.string()),
+            (f"kpi{kpi_id}_reason", pa.string()),
+        ]
+    return pa.schema(fields)
+
+
+class ParquetWriter:
+    """
+    결과를 batch_size행마다 part-NNNNN.parquet 파일로 씀.
+
+    part 파일은 완성된 뒤에만 체크포인트에 반영하고,
+    재시작 시 체크포인트 이후 번호의 part 파일(중단된 배치)은 지움.
+    """
+
+    def __init__(self, directory: str, checkpoint: Checkpoint):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("--format parquet 사용 시 pyarrow 설치가 필요합니다 (pip install pyarrow).") from e
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        for name in os.listdir(directory):
+            if name.startswith("part-") and name.endswith(".parquet"):
+                if int(name[5:-8]) >= checkpoint.output_position:
+                    os.remove(os.path.join(directory, name))
+        self.rows: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.rows.append(_flatten(record))
+
+    def commit(self, checkpoint: Checkpoint) -> None:
+        if not self.rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        part = checkpoint.output_position
+        path = os.path.join(self.directory, f"part-{part:05d}.parquet")
+        tmp = f"{path}.tmp"
+        pq.write_table(pa.Table.from_pylist(self.rows, schema=_parquet_schema()), tmp)
+        os.replace(tmp, path)
+        checkpoint.output_position = part + 1
+        checkpoint.mark([row["line"] for row in self.rows])
+        checkpoint.save()
+        self.rows = []
+
+    def should_commit(self, every: int) -> bool:
+        return len(self.rows) >= every
+
+    def close(self) -> None:
+        pass
+
+
+def read_records(path: str, checkpoint: Checkpoint) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    입력 JSONL을 한 줄씩 읽어 (줄 번호, 레코드, 파싱 오류) 반환. 이미 끝난 줄과 빈 줄은 건너뜀.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if checkpoint.is_done(line_no) or not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"JSON 파싱 오류: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "JSON 객체가 아닙니다."
+                continue
+            yield line_no, record, None
+
+
+def _error_record(line_no: int, record: Optional[Dict[str, Any]], error: str) -> Dict[str, Any]:
+    record = record or {}
+    return {
+        "line": line_no,
+        "id": record.get("id"),
+        "role": record.get("role"),
+        "status": "error",
+        "error": error,
+        "strengths": None,
+        "weaknesses": None,
+        "scores": None,
+    }
+
+
+def _validate(line_no: int, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """직군·이력서가 잘못된 레코드면 error 결과, 아니면 None."""
+    role = str(record.get("role") or "").lower()
+    resume_text = record.get("resume_text")
+    if role not in ALLOWED_ROLES:
+        return _error_record(line_no, record, f"role must be one of: {', '.join(sorted(ALLOWED_ROLES))}")
+    if not isinstance(resume_text, str) or not resume_text.strip():
+        return _error_record(line_no, record, "resume_text가 비어 있습니다.")
+    return None
+
+
+def _degraded_error(kpi_scores: Dict[int, Dict[str, Any]]) -> Optional[str]:
+    """LLM 오류로 기본값이 들어간 KPI가 있으면 오류 메시지."""
+    degraded = next((data for data in kpi_scores.values() if data.get("degraded")), None)
+    if degraded is None:
+        return None
+    return f"LLM 평가 실패 ({degraded.get('error') or 'Error'})"
+
+
+def _ok_record(line_no: int, record: Dict[str, Any], role: str, kpi_scores: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    strengths, weaknesses = get_top_bottom_kpis(kpi_scores)
+    return {
+        "line": line_no,
+        "id": record.get("id"),
+        "role": role,
+        "status": "ok",
+        "error": None,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "scores": {
+            str(kpi_id): {
+                "score": data["score"],
+                "level": data["level"],
+                "basis": data["basis"],
+                "reason": data["reason"],
+            }
+            for kpi_id, data in sorted(kpi_scores.items())
+        },
+    }
+
+
+async def score_record(
+    line_no: int,
+    record: Dict[str, Any],
+    max_retries: int,
+    deadline_seconds: float,
+) -> Dict[str, Any]:
+    """레코드 1건 채점 (실패 시 지수 백오프로 재시도, 끝내 실패하면 error 결과)."""
+    invalid = _validate(line_no, record)
+    if invalid is not None:
+        return invalid
+    role = str(record["role"]).lower()
+    resume_text = record["resume_text"]
+
+    error = None
+    for attempt in range(max_retries + 1):
+        if attempt:
+            await asyncio.sleep(settings.BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+        try:
+            with deadline_scope(deadline_seconds):
+                kpi_scores = await calculate_kpi_scores_async(resume_text, role=role)
+        except UpstreamBusyError as e:
+            error = str(e)
+            await asyncio.sleep(e.retry_after)
+            continue
+        except DeadlineExceededError as e:
+            error = str(e)
+            continue
+        error = _degraded_error(kpi_scores)
+        if error is not None:
+            continue
+        return _ok_record(line_no, record, role, kpi_scores)
+    return _error_record(line_no, record, error or "Error")
+
+
+async def score_batch(
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    checkpoint: Checkpoint,
+    max_retries: int,
+) -> List[Dict[str, Any]]:
+    """
+    레코드 묶음을 OpenAI Batch API로 채점 (--backend batch).
+
+    제출한 배치 ID는 체크포인트에 바로 저장해, 기다리는 중에 종료돼도
+    재시작 시 같은 배치의 결과를 가져옴 (새로 제출하지 않음).
+    실패한 요청은 --max-retries번까지 새 배치로 다시 제출.
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    todo: List[Tuple[int, Dict[str, Any]]] = []
+    for line_no, record in chunk:
+        invalid = _validate(line_no, record)
+        if invalid is not None:
+            results[line_no] = invalid
+        else:
+            todo.append((line_no, record))
+
+    def remember(batch_id: str) -> None:
+        checkpoint.batch_ids.append(batch_id)
+        checkpoint.save()
+
+    errors: Dict[int, str] = {}
+    for attempt in range(max_retries + 1):
+        if not todo:
+            break
+        scored = await calculate_kpi_scores_batch_async(
+            [(record["resume_text"], str(record["role"]).lower()) for _, record in todo],
+            batch_ids=list(checkpoint.batch_ids),
+            on_submit=remember,
+        )
+        failed = []
+        for (line_no, record), kpi_scores in zip(todo, scored):
+            error = _degraded_error(kpi_scores)
+            if error is None:
+                results[line_no] = _ok_record(line_no, record, str(record["role"]).lower(), kpi_scores)
+            else:
+                errors[line_no] = error
+                failed.append((line_no, record))
+        todo = failed
+    for line_no, record in todo:
+        results[line_no] = _error_record(line_no, record, errors[line_no])
+    return [results[line_no] for line_no, _ in chunk]
+
+
+def _has_previous_output(args: argparse.Namespace) -> bool:
+    if args.format == "parquet":
+        return os.path.isdir(args.output) and any(
+            name.startswith("part-") for name in os.listdir(args.output)
+        )
+    return os.path.exists(args.output) and os.path.getsize(args.output) > 0
+
+
+async def run(args: argparse.Namespace) -> Dict[str, int]:
+    checkpoint_path = args.checkpoint or f"{args.output.rstrip('/')}.ckpt"
+    if not os.path.exists(checkpoint_path) and _has_previous_output(args) and not args.overwrite:
+        raise SystemExit(f"{args.output}에 이전 출력이 있지만 체크포인트가 없습니다. 덮어쓰려면 --overwrite를 지정하세요.")
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint.done_below or checkpoint.done:
+        print(f"체크포인트에서 재개: {checkpoint.done_below + len(checkpoint.done)}건 완료됨", file=sys.stderr)
+    if args.format == "parquet":
+        writer = ParquetWriter(args.output, checkpoint)
+        commit_every = args.batch_size
+    else:
+        writer = JSONLWriter(args.output, checkpoint)
+        commit_every = args.checkpoint_every
+
+    if args.backend == "batch":
+        try:
+            return await run_batches(args, checkpoint, writer)
+        finally:
+            writer.close()
+
+    counts = {"ok": 0, "error": 0}
+    started = time.monotonic()
+    pending: Set[asyncio.Task] = set()
+
+    def collect(done: Set[asyncio.Task]) -> None:
+        for task in done:
+            result = task.result()
+            counts[result["status"]] += 1
+            writer.write(result)
+        if writer.should_commit(commit_every):
+            writer.commit(checkpoint)
+        total = counts["ok"] + counts["error"]
+        if args.progress and total and total % args.progress == 0:
+            rate = total / (time.monotonic() - started)
+            print(f"{total}건 완료 (오류 {counts['error']}건, {rate:.1f}건/초)", file=sys.stderr)
+
+    try:
+        for line_no, record, parse_error in read_records(args.input, checkpoint):
+            if parse_error is not None:
+                counts["error"] += 1
+                writer.write(_error_record(line_no, None, parse_error))
+                continue
+            # 진행 중인 평가가 concurrency개면 하나 끝날 때까지 읽기를 멈춤
+            if len(pending) >= args.concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+            pending.add(asyncio.create_task(
+                score_record(line_no, record, args.max_retries, args.deadline)
+            ))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            collect(done)
+        writer.commit(checkpoint)
+    finally:
+        for task in pending:
+            task.cancel()
+        writer.close()
+    return counts
+
+
+async def run_batches(args: argparse.Namespace, checkpoint: Checkpoint, writer) -> Dict[str, int]:
+    """--backend batch: 입력을 --batch-requests건씩 묶어 배치로 채점하고 묶음마다 체크포인트 저장."""
+    counts = {"ok": 0, "error": 0}
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+
+    async def flush() -> None:
+        for result in await score_batch(chunk, checkpoint, args.max_retries):
+            counts[result["status"]] += 1
+            writer.write(result)
+        # 결과를 출력에 반영하면서 배치 ID도 함께 비움 (같은 체크포인트 저장)
+        checkpoint.batch_ids = []
+        writer.commit(checkpoint)
+        chunk.clear()
+        if args.progress:
+            print(f"{counts['ok'] + counts['error']}건 완료 (오류 {counts['error']}건)", file=sys.stderr)
+
+    for line_no, record, parse_error in read_records(args.input, checkpoint):
+        if parse_error is not None:
+            counts["error"] += 1
+            writer.write(_error_record(line_no, None, parse_error))
+            continue
+        chunk.append((line_no, record))
+        if len(chunk) >= args.batch_requests:
+            await flush()
+    if chunk:
+        await flush()
+    writer.commit(checkpoint)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSONL 이력서 아카이브 일괄 KPI 채점")
+    parser.add_argument("input", help='입력 JSONL ({"id", "role", "resume_text"} 한 줄에 1건)')
+    parser.add_argument("output", help="출력 JSONL 파일 (parquet이면 part 파일을 쓸 디렉토리)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--backend", choices=["realtime", "batch"], default="realtime",
+                        help="realtime: Chat Completions 동시 호출, batch: OpenAI Batch API")
+    parser.add_argument("--batch-requests", type=int, default=5000,
+                        help="(batch) 배치 대기 1회에 묶을 레코드 수")
+    parser.add_argument("--concurrency", type=int, default=settings.BATCH_MAX_CONCURRENCY)
+    parser.add_argument("--max-retries", type=int, default=settings.BATCH_MAX_RETRIES)
+    parser.add_argument("--deadline", type=float, default=settings.JOB_DEADLINE_SECONDS,
+                        help="레코드 1건 평가 마감(초)")
+    parser.add_argument("--checkpoint", help="체크포인트 파일 (기본: <output>.ckpt)")
+    parser.add_argument("--checkpoint-every", type=int, default=100,
+                        help="(jsonl) 몇 건마다 체크포인트를 저장할지")
+    parser.add_argument("--batch-size", type=int, default=1000, help="(parquet) part 파일당 행 수")
+    parser.add_argument("--overwrite", action="store_true", help="체크포인트 없이 남은 이전 출력을 덮어씀")
+    parser.add_argument("--progress", type=int, default=100, help="몇 건마다 진행 상황 출력 (0이면 끔)")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency는 1 이상이어야 합니다.")
+    if args.batch_requests < 1:
+        parser.error("--batch-requests는 1 이상이어야 합니다.")
+
+    async def _main() -> Dict[str, int]:
+        clients.init_clients()
+        try:
+            return await run(args)
+        finally:
+            await clients.close_clients()
+
+    counts = asyncio.run(_main())
+    print(f"완료: 성공 {counts['ok']}건, 실패 {counts['error']}건", file=sys.stderr)
+    print(f"업스트림: {json.dumps(get_rate_limit_stats(), ensure_ascii=False)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
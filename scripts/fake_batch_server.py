@@ -0,0 +1,242 @@
+"""
+OpenAI Files·Batches API 모의 서버 (Batch 백엔드 로컬 시험용).
+
+app.ai.batch가 쓰는 엔드포인트만 흉내 냄:
+POST /v1/files, GET /v1/files/{id}/content, POST /v1/batches,
+GET /v1/batches/{id}, POST /v1/batches/{id}/cancel
+
+- 배치는 조회할 때마다 validating → in_progress → finalizing → completed 순서로 진행
+  (--polls-per-state번 조회해야 다음 상태)
+- /v1/chat/completions: KPI 1~10에 대해 요청 내용 해시로 정한 점수 JSON을 응답
+- /v1/embeddings: 입력 문장 해시로 만든 정규화 벡터 (dimensions 지정 시 그 차원)
+- --fail-rate: (배치 ID, custom_id) 해시로 고른 비율만큼 요청을 500(server_error)으로 실패시킴
+  (다른 배치로 다시 제출하면 성공할 수 있음)
+- 입력 줄의 url이 배치 endpoint와 다르면 배치 자체가 failed
+- --seed: 파일·배치 ID를 재현 가능하게 생성 (실패 요청도 매번 같아짐)
+
+실행:
+    python -m scripts.fake_batch_server --port 8099 --fail-rate 0.05
+    OPENAI_BATCH_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_BATCH_POLL_INTERVAL_SECONDS=1 \\
+        python -m scripts.bulk_score resumes.jsonl scores.jsonl --backend batch
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+STATES = ("validating", "in_progress", "finalizing", "completed")
+ENDPOINTS = ("/v1/chat/completions", "/v1/embeddings")
+
+
+class BatchCreateRequest(BaseModel):
+    input_file_id: str
+    endpoint: str
+    completion_window: str = "24h"
+    metadata: Optional[Dict[str, str]] = None
+
+
+def _digest(*parts: str) -> int:
+    return int.from_bytes(hashlib.sha256("\x1f".join(parts).encode("utf-8")).digest()[:8], "big")
+
+
+def _chat_body(body: Dict[str, Any]) -> Dict[str, Any]:
+    messages = body.get("messages") or []
+    # 점수는 이력서 메시지로 정하고, 출력할 KPI는 마지막 지시문에 적힌 키를 따름
+    text = messages[1]["content"] if len(messages) > 1 else ""
+    kpi_ids = [int(k) for k in re.findall(r'"(\d+)"', messages[-1]["content"])] if messages else []
+    content = json.dumps({
+        str(kpi_id): {
+            "score": 40 + _digest(text, str(kpi_id)) % 51,
+            "basis": ("explicit", "inferred", "none")[_digest(text, str(kpi_id), "basis") % 3],
+            "reason": f"모의 평가 근거 {kpi_id}",
+        }
+        for kpi_id in kpi_ids
+    }, ensure_ascii=False)
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 3
+    completion_tokens = len(content) // 3
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "model": body.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _embedding_body(body: Dict[str, Any]) -> Dict[str, Any]:
+    inputs = body.get("input") or []
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    dimensions = body.get("dimensions") or 1536
+    data = []
+    for index, text in enumerate(inputs):
+        vector = np.random.default_rng(_digest(text)).standard_normal(dimensions)
+        vector /= np.linalg.norm(vector)
+        data.append({"object": "embedding", "index": index, "embedding": vector.astype(np.float32).tolist()})
+    tokens = sum(len(t) for t in inputs) // 3
+    return {
+        "object": "list",
+        "model": body.get("model"),
+        "data": data,
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+def create_app(fail_rate: float = 0.0, polls_per_state: int = 1, seed: Optional[int] = None) -> FastAPI:
+    """모의 서버 앱 (상태는 앱 인스턴스 메모리에만 보관, seed 지정 시 ID 재현 가능)."""
+    app = FastAPI(title="Fake OpenAI Batch API")
+    rng = random.Random(seed)
+    files: Dict[str, Tuple[dict, bytes]] = {}
+    batches: Dict[str, dict] = {}
+    polls: Dict[str, int] = {}
+
+    def store_file(content: bytes, filename: str, purpose: str) -> dict:
+        info = {
+            "id": f"file-{rng.getrandbits(96):024x}",
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+        }
+        files[info["id"]] = (info, content)
+        return info
+
+    def is_failed(batch_id: str, custom_id: str) -> bool:
+        return fail_rate > 0 and _digest(batch_id, custom_id) % 10000 < fail_rate * 10000
+
+    def process(batch: dict) -> None:
+        """입력 파일의 요청을 모두 처리해 출력·오류 파일 작성."""
+        _, content = files[batch["input_file_id"]]
+        outputs: List[str] = []
+        errors: List[str] = []
+        for raw in content.splitlines():
+            if not raw.strip():
+                continue
+            line = json.loads(raw)
+            custom_id = line["custom_id"]
+            request_id = f"req_{uuid.uuid4().hex[:16]}"
+            if is_failed(batch["id"], custom_id):
+                errors.append(json.dumps({
+                    "id": f"batch_req_{uuid.uuid4().hex[:16]}",
+                    "custom_id": custom_id,
+                    "response": {
+                        "status_code": 500,
+                        "request_id": request_id,
+                        "body": {"error": {"message": "injected failure", "type": "server_error", "code": "server_error"}},
+                    },
+                    "error": None,
+                }))
+                continue
+            body = _chat_body(line["body"]) if line["url"] == "/v1/chat/completions" else _embedding_body(line["body"])
+            outputs.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:16]}",
+                "custom_id": custom_id,
+                "response": {"status_code": 200, "request_id": request_id, "body": body},
+                "error": None,
+            }, ensure_ascii=False))
+        batch["request_counts"] = {
+            "total": len(outputs) + len(errors),
+            "completed": len(outputs),
+            "failed": len(errors),
+        }
+        if outputs:
+            batch["output_file_id"] = store_file(("\n".join(outputs) + "\n").encode("utf-8"), "output.jsonl", "batch_output")["id"]
+        if errors:
+            batch["error_file_id"] = store_file(("\n".join(errors) + "\n").encode("utf-8"), "errors.jsonl", "batch_output")["id"]
+
+    @app.post("/v1/files")
+    async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)):
+        return store_file(await file.read(), file.filename or "upload.jsonl", purpose)
+
+    @app.get("/v1/files/{file_id}/content")
+    async def file_content(file_id: str):
+        if file_id not in files:
+            raise HTTPException(404, "No such file")
+        return Response(files[file_id][1], media_type="application/jsonl")
+
+    @app.post("/v1/batches")
+    async def create_batch(request: BatchCreateRequest):
+        if request.input_file_id not in files:
+            raise HTTPException(400, "input_file_id not found")
+        if request.endpoint not in ENDPOINTS:
+            raise HTTPException(400, f"endpoint must be one of: {', '.join(ENDPOINTS)}")
+        batch = {
+            "id": f"batch_{rng.getrandbits(96):024x}",
+            "object": "batch",
+            "endpoint": request.endpoint,
+            "input_file_id": request.input_file_id,
+            "completion_window": request.completion_window,
+            "status": "validating",
+            "output_file_id": None,
+            "error_file_id": None,
+            "errors": None,
+            "created_at": int(time.time()),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            "metadata": request.metadata,
+        }
+        urls = {json.loads(raw)["url"] for raw in files[request.input_file_id][1].splitlines() if raw.strip()}
+        if urls - {request.endpoint}:
+            batch["status"] = "failed"
+            batch["errors"] = {"object": "list", "data": [{
+                "code": "invalid_url",
+                "message": f"url must match endpoint {request.endpoint}",
+            }]}
+        batches[batch["id"]] = batch
+        polls[batch["id"]] = 0
+        return batch
+
+    @app.get("/v1/batches/{batch_id}")
+    async def get_batch(batch_id: str):
+        batch = batches.get(batch_id)
+        if batch is None:
+            raise HTTPException(404, "No such batch")
+        if batch["status"] in STATES[:-1]:
+            polls[batch_id] += 1
+            if polls[batch_id] >= polls_per_state:
+                polls[batch_id] = 0
+                batch["status"] = STATES[STATES.index(batch["status"]) + 1]
+                if batch["status"] == "completed":
+                    process(batch)
+        return batch
+
+    @app.post("/v1/batches/{batch_id}/cancel")
+    async def cancel_batch(batch_id: str):
+        batch = batches.get(batch_id)
+        if batch is None:
+            raise HTTPException(404, "No such batch")
+        if batch["status"] in STATES[:-1]:
+            batch["status"] = "cancelled"
+        return batch
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI Batch API 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="요청별 실패 비율 (0~1)")
+    parser.add_argument("--polls-per-state", type=int, default=1, help="다음 상태로 넘어가기까지 조회 횟수")
+    parser.add_argument("--seed", type=int, help="파일·배치 ID 난수 시드 (재현용)")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.fail_rate, args.polls_per_state, args.seed), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+abilities 저장소 유사 검색 테스트.
+"""
+import numpy as np
+import pytest
+
+from app.models.analysis import AbilityStore
+
+DIMS = 32
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AbilityStore(str(tmp_path), nprobe=2, rebuild_threshold=10**9)
+    yield store
+    store.close()
+
+
+def _vector(rng, base=None, noise=0.01) -> bytes:
+    v = rng.standard_normal(DIMS).astype(np.float32)
+    if base is not None:
+        v = base + noise * v
+    return (v / np.linalg.norm(v)).astype(np.float32).tobytes()
+
+
+def _add(store, candidate_id, vectors):
+    store.add("space", DIMS, "backend", candidate_id, [(1, f"문장 {i}", v) for i, v in enumerate(vectors)])
+
+
+def _query(base) -> bytes:
+    return (base / np.linalg.norm(base)).astype(np.float32).tobytes()
+
+
+def test_grouped_search_fills_k_when_few_candidates_dominate(store):
+    """소수 후보자가 상위 결과를 차지해도 k명을 채울 때까지 더 가져옴 (인덱스·tail 모두)."""
+    rng = np.random.default_rng(0)
+    base = rng.standard_normal(DIMS).astype(np.float32)
+    for candidate in ("a", "b"):
+        _add(store, candidate, [_vector(rng, base) for _ in range(100)])
+    for i in range(20):
+        _add(store, f"c{i}", [_vector(rng)])
+
+    tail = store.search("space", DIMS, "backend", _query(base), k=5, group_by_candidate=True)
+    assert {m.candidate_id for m in tail[:2]} == {"a", "b"}
+    assert len({m.candidate_id for m in tail}) == 5
+
+    store.rebuild_index("space", DIMS, "backend")
+    indexed = store.search("space", DIMS, "backend", _query(base), k=5, group_by_candidate=True)
+    assert len({m.candidate_id for m in indexed}) == 5
+    assert [m.score for m in indexed] == sorted((m.score for m in indexed), reverse=True)
+
+    everyone = store.search("space", DIMS, "backend", _query(base), k=50, group_by_candidate=True)
+    assert len(everyone) == 22  # 전체 후보자 수에서 멈춤
+
+
+def test_grouped_search_keeps_anonymous_analyses_apart(store):
+    """candidate_id 없이 저장한 분석은 하나로 합쳐지지 않고 각각 1명으로 취급."""
+    rng = np.random.default_rng(1)
+    base = rng.standard_normal(DIMS).astype(np.float32)
+    for _ in range(3):
+        _add(store, None, [_vector(rng, base) for _ in range(3)])
+    _add(store, "a", [_vector(rng, base)])
+    _add(store, "b", [_vector(rng, base)])
+
+    results = store.search("space", DIMS, "backend", _query(base), k=10, group_by_candidate=True)
+    assert len(results) == 5
+    assert sorted(m.candidate_id for m in results if m.candidate_id) == ["a", "b"]
+    assert len({m.stored_at for m in results if m.candidate_id is None}) == 3
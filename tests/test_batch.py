@@ -0,0 +1,134 @@
+"""
+Batch API 백엔드 테스트 (scripts/fake_batch_server 앱을 ASGI로 직접 호출).
+"""
+import asyncio
+from array import array
+
+import httpx
+import numpy as np
+import pytest
+
+from app.ai.batch import BatchClient, embed_texts_batch, evaluate_resume_kpis_batch
+from app.core.config import settings
+from scripts.fake_batch_server import create_app
+
+RESUMES = [
+    ("backend", "Spring Boot 주문 API 응답 시간을 1.2초에서 0.3초로 줄였다."),
+    ("pm", "신규 구독 상품 출시를 기획해 전환율을 12% 높였다."),
+    ("backend", "Kafka 기반 결제 재처리 구조를 설계했다."),
+    ("designer", "디자인 시스템을 구축해 화면 제작 시간을 절반으로 줄였다."),
+]
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_BATCH_POLL_INTERVAL_SECONDS", 0.0)
+
+
+def _client(app) -> BatchClient:
+    return BatchClient(http=httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://fake/v1"))
+
+
+async def _run_kpis(app, requests, batch_ids=()):
+    submitted = []
+    client = _client(app)
+    try:
+        scores = await evaluate_resume_kpis_batch(requests, batch_ids, submitted.append, client=client)
+        totals = [(await client.get_batch(batch_id))["request_counts"]["total"] for batch_id in submitted]
+    finally:
+        await client.http.aclose()
+    return scores, submitted, totals
+
+
+def _failed(scores) -> int:
+    return sum(1 for result in scores if any(kpi.get("degraded") for kpi in result.values()))
+
+
+def test_evaluate_resume_kpis_batch(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_BATCH_MAX_REQUESTS", 2)
+    app = create_app(seed=0)
+    requests = RESUMES + [RESUMES[0]]  # 같은 요청은 한 번만 제출
+
+    scores, submitted, totals = asyncio.run(_run_kpis(app, requests))
+
+    assert len(scores) == len(requests)
+    assert totals == [2, 2]  # 고유 요청 4건을 한도 2건씩 나눠 제출
+    for result in scores:
+        assert sorted(result) == list(range(1, 11))
+        for kpi in result.values():
+            assert 40 <= kpi["score"] <= 90
+            assert kpi["basis"] in ("explicit", "inferred", "none")
+            assert not kpi.get("degraded")
+    assert scores[0] == scores[-1]
+
+
+def test_failed_requests_are_resubmitted():
+    app = create_app(fail_rate=0.5, seed=0)
+
+    scores, batch_ids, totals = asyncio.run(_run_kpis(app, RESUMES))
+    failed = _failed(scores)
+    assert totals == [len(RESUMES)]
+    assert failed > 0
+    assert all(
+        kpi["error"] == "server_error"
+        for result in scores if any(kpi.get("degraded") for kpi in result.values())
+        for kpi in result.values()
+    )
+
+    for _ in range(10):
+        if not failed:
+            break
+        scores, submitted, totals = asyncio.run(_run_kpis(app, RESUMES, batch_ids))
+        # 이전 배치의 성공 결과는 재사용하고 실패한 요청만 새 배치로
+        assert totals == [failed]
+        batch_ids = batch_ids + submitted
+        failed = _failed(scores)
+    assert failed == 0
+
+
+def test_resume_from_batch_ids():
+    app = create_app(polls_per_state=3, seed=0)
+    scores, batch_ids, _ = asyncio.run(_run_kpis(app, RESUMES))
+
+    # 재시작: 없는 배치는 건너뛰고, 끝난 배치의 결과를 그대로 가져와 새로 제출하지 않음
+    resumed, submitted, _ = asyncio.run(_run_kpis(app, RESUMES, ["batch_missing", *batch_ids]))
+    assert submitted == []
+    assert resumed == scores
+
+    # 요청이 늘었으면 새 요청만 제출
+    extra = ("frontend", "번들 크기를 40% 줄여 LCP를 개선했다.")
+    grown, submitted, totals = asyncio.run(_run_kpis(app, RESUMES + [extra], batch_ids))
+    assert totals == [1]
+    assert grown[:-1] == scores
+
+
+def test_embed_texts_batch(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_BATCH_EMBEDDING_INPUTS", 2)
+    app = create_app(fail_rate=0.3, seed=0)
+    texts = [f"근거 문장 {i}" for i in range(7)]
+
+    async def run(batch_ids=()):
+        submitted = []
+        client = _client(app)
+        try:
+            vectors = await embed_texts_batch(texts, "text-embedding-3-small", 8, batch_ids, submitted.append, client)
+        finally:
+            await client.http.aclose()
+        return vectors, submitted
+
+    vectors, batch_ids = asyncio.run(run())
+    assert len(vectors) < len(texts)
+    for _ in range(10):
+        if len(vectors) == len(texts):
+            break
+        # 실패한 묶음의 문장은 빠지고, 재시도하면 그 묶음만 다시 제출됨
+        retried, submitted = asyncio.run(run(batch_ids))
+        assert {t: v for t, v in retried.items() if t in vectors} == vectors
+        vectors, batch_ids = retried, batch_ids + submitted
+    assert sorted(vectors) == sorted(texts)
+
+    for raw in vectors.values():
+        vector = np.asarray(array("f", raw))
+        assert vector.shape == (8,)
+        assert abs(float(np.linalg.norm(vector)) - 1.0) < 1e-5
+    assert len(set(vectors.values())) == len(texts)
@@ -0,0 +1,43 @@
+"""
+분석 작업 저장소 테스트.
+"""
+import time
+
+from app.models.job import JobStore
+
+
+def _crash(store: JobStore) -> str:
+    """작업을 꺼낸 뒤 프로세스가 죽은 상황 (running으로 남음)."""
+    job = store.claim_next()
+    assert job is not None
+    return job.id
+
+
+def test_requeue_stale_fails_job_after_max_attempts(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.submit("backend", "이력서", webhook_url="http://example.com/hook")
+
+    for _ in range(2):
+        assert _crash(store) == job.id
+        requeued, failed = store.requeue_stale(time.time() + 1, max_attempts=3)
+        assert (requeued, failed) == (1, [])
+        assert store.get(job.id).status == "queued"
+
+    assert _crash(store) == job.id
+    requeued, failed = store.requeue_stale(time.time() + 1, max_attempts=3)
+    assert (requeued, failed) == (0, [job.id])
+    stored = store.get(job.id)
+    assert stored.status == "failed"
+    assert stored.attempts == 3
+    assert stored.resume_text is None
+    assert store.claim_next() is None
+    store.close()
+
+
+def test_requeue_stale_ignores_recent_jobs(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.submit("backend", "이력서")
+    _crash(store)
+    assert store.requeue_stale(time.time() - 60, max_attempts=3) == (0, [])
+    assert store.counts() == {"running": 1}
+    store.close()
@@ -0,0 +1,26 @@
+"""
+KPI 평가 프롬프트 메시지 구성 테스트.
+"""
+import re
+
+import pytest
+
+from app.ai import llm_backend, llm_designer, llm_frontend, llm_pm  # noqa: F401 (직군 프롬프트 등록)
+from app.ai.prompts import get_prompt
+
+
+def _keys(messages) -> list:
+    return [int(k) for k in re.findall(r'"(\d+)"', messages[-1]["content"])]
+
+
+@pytest.mark.parametrize("role", ["backend", "frontend", "pm", "designer"])
+def test_kpi_scope_is_only_in_trailing_instruction(role):
+    prompt = get_prompt(role)
+    full = prompt.build_messages("이력서")
+    subset = prompt.build_messages("이력서", [4, 5, 6])
+
+    # 고정 prefix는 평가 범위와 무관하게 같고, KPI 개수를 적지 않음
+    assert full[:2] == subset[:2]
+    assert "10개" not in prompt.user_prefix
+    assert _keys(full) == list(range(1, 11))
+    assert _keys(subset) == [4, 5, 6]
@@ -0,0 +1,59 @@
+"""
+업스트림 제한기 동시성 슬롯 테스트.
+"""
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from app.ai.rate_limit import UpstreamBusyError, UpstreamLimiter
+
+
+def _limiter() -> UpstreamLimiter:
+    return UpstreamLimiter("test", initial_concurrency=1, min_concurrency=1, max_concurrency=1)
+
+
+def test_cancelled_waiter_returns_handed_over_slot():
+    """슬롯을 넘겨받은 직후(_hand_over 실행 전) 취소된 대기자는 슬롯을 반납해야 함."""
+    limiter = _limiter()
+
+    async def scenario():
+        await limiter._take_slot_async(time.monotonic() + 1)
+        waiter = asyncio.create_task(limiter._take_slot_async(time.monotonic() + 10))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter._release(success=False)  # 취소가 처리되기 전에 대기자에게 슬롯을 넘기고 _hand_over 예약
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
+    assert limiter.in_flight == 0
+    assert not limiter._granted
+
+
+def test_timed_out_waiter_does_not_leak_slot():
+    """다른 스레드의 반납과 대기자 시간 초과가 겹쳐도 슬롯이 새지 않아야 함."""
+    limiter = _limiter()
+    rng = random.Random(0)
+
+    async def race():
+        await limiter._take_slot_async(time.monotonic() + 1)
+        delay = rng.uniform(0, 0.004)
+        releaser = threading.Thread(target=lambda: (time.sleep(delay), limiter._release(success=False)))
+        releaser.start()
+        try:
+            await limiter._take_slot_async(time.monotonic() + 0.002)
+        except UpstreamBusyError:
+            pass
+        else:
+            limiter._release(success=False)
+        releaser.join()
+        await asyncio.sleep(0)  # 예약된 _hand_over 실행
+
+    for _ in range(200):
+        asyncio.run(race())
+        assert limiter.in_flight == 0
+        assert not limiter._waiters or all(future.done() for _, future in limiter._waiters)
+    assert not limiter._granted
@@ -0,0 +1,57 @@
+"""
+Single-flight 병합과 요청 마감 테스트.
+"""
+import asyncio
+
+import pytest
+
+from app.core.deadline import DeadlineExceededError, current_deadline, deadline_scope
+from app.utils.singleflight import SingleFlight
+
+
+async def _call(flight: SingleFlight, seconds: float, fn):
+    with deadline_scope(seconds, inherit=False):
+        return await flight.do("key", fn)
+
+
+@pytest.mark.parametrize("order", [(0.1, 10), (10, 0.1)])
+def test_short_deadline_does_not_fail_other_callers(order):
+    """마감이 짧은 호출자만 실패하고, 같은 키를 기다리던 다른 호출자는 결과를 받음."""
+    flight = SingleFlight()
+    deadlines = []
+
+    async def upstream():
+        deadlines.append(current_deadline())
+        await asyncio.sleep(0.5)
+        return "result"
+
+    async def scenario():
+        first = asyncio.create_task(_call(flight, order[0], upstream))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_call(flight, order[1], upstream))
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    expected = ["result" if seconds == 10 else DeadlineExceededError for seconds in order]
+    assert [r if isinstance(r, str) else type(r) for r in results] == expected
+    assert flight.stats.as_dict() == {"executed": 1, "shared": 1}
+    assert len(deadlines) == 1
+
+
+def test_flight_keeps_longer_deadline_of_first_caller():
+    """작업처럼 긴 마감으로 시작한 호출은 기본 요청 마감으로 줄어들지 않음."""
+    flight = SingleFlight()
+    seen = []
+
+    async def upstream():
+        seen.append(current_deadline())
+        return "result"
+
+    async def scenario():
+        with deadline_scope(1000, inherit=False) as deadline:
+            assert await flight.do("key", upstream) == "result"
+            return deadline
+
+    deadline = asyncio.run(scenario())
+    assert seen[0] == pytest.approx(deadline, abs=0.1)
@@ -0,0 +1,37 @@
+"""
+이력서 텍스트 압축 테스트.
+"""
+import pytest
+
+from app.utils.text_processor import compact_resume_text
+
+
+@pytest.mark.parametrize("period", ["2019 - 2023", "2020-2023", "2019.03 - 2023.02", "1234567890"])
+def test_employment_period_is_kept(period):
+    text = f"경력\n네이버\n{period}\n백엔드 개발"
+    assert compact_resume_text(text) == text
+
+
+@pytest.mark.parametrize("contact", [
+    "010-1234-5678",
+    "+82 10-1234-5678",
+    "전화: 02-123-4567",
+    "Tel 02 123 4567",
+    "이메일: dev@example.com",
+    "dev@example.com",
+])
+def test_contact_line_is_removed(contact):
+    assert compact_resume_text(f"경력\n{contact}\n백엔드 개발") == "경력\n백엔드 개발"
+
+
+@pytest.mark.parametrize("text, expected", [
+    # 본문의 짧은 줄에서 제거가 끝나지 않음
+    ("## 취미\n독서\n등산\n## 인적사항\n홍길동\n서울시 강남구", ""),
+    ("## 경력\n네이버\n## 취미\n- 독서\n- 등산\n## 프로젝트\n결제 시스템", "## 경력\n네이버\n## 프로젝트\n결제 시스템"),
+    # 표시 없는 제목은 알려진 평가 섹션 제목에서 제거 종료
+    ("경력\n네이버 백엔드\n취미\n독서\n등산\n기술 스택\nJava, Spring", "경력\n네이버 백엔드\n기술 스택\nJava, Spring"),
+    ("인적사항\n홍길동\n1990.01.01\nExperience\nBackend engineer", "Experience\nBackend engineer"),
+    ("[취미]\n독서\n[수상 내역]\n사내 해커톤 1위", "[수상 내역]\n사내 해커톤 1위"),
+])
+def test_boilerplate_section_is_removed(text, expected):
+    assert compact_resume_text(text) == expected